@@ -0,0 +1,151 @@
+import os
+import time
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from classes.export.exporter import Exporter, render_student_workbook
+from utils.periodo import normalize_periodo
+from utils.rut import rut_key
+
+
+def _render_student(args) -> str:
+    """Genera el Excel de un estudiante dentro de un proceso del pool (sin BD)"""
+    student_data, sheet_selection, custom_sheet_selection, file_path = args
+    return render_student_workbook(student_data, sheet_selection, custom_sheet_selection, file_path)
+
+
+class BulkExporter(Exporter):
+    """
+    Exporta un Excel por estudiante para muchos estudiantes a la vez
+    (p. ej. un programa de estudio completo).
+
+    Todos los datos se obtienen con pocas consultas por conjunto de RUTs
+    (ver Exporter._get_students_data) y los libros se generan en un
+    ProcessPoolExecutor. El resultado queda como un archivo por estudiante
+    en la carpeta de salida, o en un único .zip.
+    """
+
+    def __init__(self, db_connection, sheet_selection: dict, custom_sheet_selection: dict, max_workers: int = None):
+        super().__init__(db_connection, sheet_selection, custom_sheet_selection)
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def resolve_ruts(self, ruts: list = None, programa_estudio: str = None, periodo: str = None) -> list:
+        """
+        RUTs a exportar: los indicados y/o los que cumplan los filtros
+        (programa de estudio y/o estudiantes inscritos en el período)
+        """
+        # Un RUT escrito con distintas mayúsculas es el mismo estudiante
+        selected = {}
+        for rut in ruts or []:
+            if rut and rut.strip():
+                selected.setdefault(rut_key(rut), rut.strip())
+        selected = list(selected.values())
+
+        # El período se compara en el formato en que lo guardan los readers
+        # ("OTOÑO 2025" → "2025-otoño")
+        periodo = normalize_periodo(periodo)[0] if periodo and periodo.strip() else None
+
+        if programa_estudio or periodo:
+            conditions = []
+            params = []
+            if programa_estudio:
+                conditions.append("e.programa_estudio = %s")
+                params.append(programa_estudio)
+            if periodo:
+                conditions.append(
+                    "EXISTS (SELECT 1 FROM Estudiante_Semestre es "
+                    "WHERE es.rut_estudiante = e.rut AND es.periodo_semestre = %s)"
+                )
+                params.append(periodo)
+
+            cursor = self.db_connection.cursor()
+            try:
+                cursor.execute(
+                    f"SELECT e.rut FROM Estudiante e WHERE {' AND '.join(conditions)} ORDER BY e.rut",
+                    tuple(params)
+                )
+                filtered = [row[0] for row in cursor.fetchall()]
+            finally:
+                cursor.close()
+
+            # Con RUTs y filtros a la vez se exporta la intersección (la BD
+            # compara los RUTs sin distinguir mayúsculas)
+            if selected:
+                filtered_set = {rut_key(rut) for rut in filtered}
+                selected = [rut for rut in selected if rut_key(rut) in filtered_set]
+            else:
+                selected = filtered
+
+        return selected
+
+    def export_students(self, output_dir: Path, ruts: list = None, programa_estudio: str = None,
+                        periodo: str = None, as_zip: bool = False, progress_callback=None) -> dict:
+        """
+        Exporta los estudiantes seleccionados.
+
+        Returns:
+            dict: {
+                'files': rutas de los Excel (o [ruta del zip]),
+                'exported': estudiantes exportados,
+                'not_found': RUTs que no existen en la BD,
+                'seconds': duración total,
+                'students_per_second': rendimiento
+            }
+        """
+        start = time.perf_counter()
+        output_dir = Path(output_dir)
+
+        ruts = self.resolve_ruts(ruts, programa_estudio, periodo)
+        if not ruts:
+            raise ValueError("No hay estudiantes que cumplan los criterios de exportación")
+
+        students_data = self._get_students_data(ruts)
+        # students_data se indexa por utils.rut.rut_key
+        not_found = [rut for rut in ruts if rut_key(rut) not in students_data]
+        self._attach_custom_rows(students_data)
+
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        target_dir = Path(tempfile.mkdtemp(prefix="export_", dir=output_dir)) if as_zip else output_dir
+
+        try:
+            tasks = [
+                (student_data, self.sheet_selection, self.custom_sheet_selection,
+                 target_dir / f"Estudiante_{student_data['student']['rut']}_{timestamp}.xlsx")
+                for student_data in students_data.values()
+            ]
+
+            files = []
+            with ProcessPoolExecutor(max_workers=max(1, min(self.max_workers, len(tasks)))) as executor:
+                for exported, file_path in enumerate(executor.map(_render_student, tasks, chunksize=4), 1):
+                    files.append(file_path)
+                    if progress_callback:
+                        progress_callback(exported, len(tasks))
+
+            if as_zip:
+                zip_path = output_dir / f"Estudiantes_{timestamp}.zip"
+                # Los .xlsx ya vienen comprimidos: se guardan sin recomprimir
+                with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) as zf:
+                    for file_path in files:
+                        zf.write(file_path, arcname=Path(file_path).name)
+                files = [str(zip_path)]
+        finally:
+            if as_zip:
+                shutil.rmtree(target_dir, ignore_errors=True)
+
+        seconds = time.perf_counter() - start
+        students_per_second = len(tasks) / seconds if seconds > 0 else 0.0
+        print(f"✓ {len(tasks)} estudiante(s) exportados en {seconds:.1f}s ({students_per_second:.1f} estudiantes/s)")
+        if not_found:
+            print(f"→ {len(not_found)} RUT(s) no encontrados en la base de datos")
+
+        return {
+            "files": files,
+            "exported": len(tasks),
+            "not_found": not_found,
+            "seconds": seconds,
+            "students_per_second": students_per_second,
+        }
+
@@ -0,0 +1,116 @@
+from utils.custom_sheet_registry import custom_sheet_registry
+from utils.dynamic_query_builder import bulk_query_template
+from utils.rut import rut_key
+
+
+class CustomSheetPlanner:
+    """
+    Plan de datos de las hojas personalizadas de una exportación.
+
+    Junta las selecciones de todas las hojas por tabla: cada tabla se consulta
+    una sola vez con la unión de sus columnas (una consulta por cada
+    RUTS_PER_QUERY RUTs, con WHERE rut IN (...)), aunque varias hojas o
+    selecciones la usen. Cada selección (tabla, columnas) se obtiene luego
+    proyectando las filas de la unión.
+
+    Las selecciones que no coinciden con el esquema (ver
+    CompiledCustomSheet.validate) no se consultan: quedan con su error.
+
+    Los valores se entregan ya formateados para la hoja ('_' -> ' ' y
+    .title()), formateando una sola vez cada valor distinto.
+    """
+
+    # RUTs por consulta IN (...)
+    RUTS_PER_QUERY = 1000
+
+    def __init__(self, sheets: list):
+        """
+        Args:
+            sheets: definiciones compiladas (CompiledCustomSheet)
+        """
+        # {tabla: [columnas]} (unión en orden de aparición)
+        self.tables = {}
+        # {(tabla, (columnas)): posiciones de esas columnas en la unión}
+        self.selections = {}
+        # {(tabla, (columnas)): excepción} selecciones inválidas
+        self.errors = {}
+
+        for sheet in sheets:
+            for table in sheet.tables:
+                if table.error is not None:
+                    self.errors[table.key] = table.error
+                    continue
+                union = self.tables.setdefault(table.table, [])
+                union.extend(column for column in table.columns if column not in union)
+                self.selections[table.key] = None
+
+        for table_name, columns in self.selections:
+            union = self.tables[table_name]
+            self.selections[(table_name, columns)] = tuple(union.index(column) for column in columns)
+
+    @classmethod
+    def from_selection(cls, custom_sheet_selection: dict, db_connection=None) -> "CustomSheetPlanner":
+        """Plan para las hojas personalizadas marcadas en custom_sheet_selection"""
+        return cls(custom_sheet_registry.get_selected(custom_sheet_selection, db_connection))
+
+    def fetch(self, db_connection, ruts: list) -> dict:
+        """
+        Obtiene las filas de todas las selecciones para los RUTs indicados.
+
+        Returns:
+            dict: {rut: {(tabla, (columnas)): [tuplas de valores formateados]}}
+            con los RUTs tal como se indicaron. Las filas se reparten por
+            utils.rut.rut_key, porque MySQL compara los RUTs sin distinguir
+            mayúsculas. Si la consulta de una tabla falla, sus selecciones
+            quedan con la excepción (la hoja muestra el error, igual que antes)
+        """
+        ruts = list(dict.fromkeys(ruts))
+        result = {rut: dict(self.errors) for rut in ruts}
+        if not ruts or not self.tables:
+            return result
+
+        formatted = {}
+        cursor = db_connection.cursor()
+        try:
+            for table_name, columns in self.tables.items():
+                rows_by_rut = {rut_key(rut): [] for rut in ruts}
+                template = bulk_query_template(table_name, tuple(columns))
+                try:
+                    for start in range(0, len(ruts), self.RUTS_PER_QUERY):
+                        chunk = ruts[start:start + self.RUTS_PER_QUERY]
+                        query = template.replace("{placeholders}", ", ".join(["%s"] * len(chunk)))
+                        cursor.execute(query, tuple(chunk))
+                        for row in cursor.fetchall():
+                            rows = rows_by_rut.get(rut_key(row[0]))
+                            if rows is not None:
+                                rows.append(tuple(self._format(value, formatted) for value in row[1:]))
+                except Exception as e:
+                    error = Exception(str(e))
+                    rows_by_rut = dict.fromkeys(rows_by_rut, error)
+
+                for (selection_table, selection_columns), positions in self.selections.items():
+                    if selection_table != table_name:
+                        continue
+                    key = (table_name, selection_columns)
+                    full = positions == tuple(range(len(columns)))
+                    for rut in ruts:
+                        rows = rows_by_rut[rut_key(rut)]
+                        if isinstance(rows, Exception) or full:
+                            result[rut][key] = rows
+                        else:
+                            result[rut][key] = [tuple(row[i] for i in positions) for row in rows]
+        finally:
+            cursor.close()
+
+        return result
+
+    @staticmethod
+    def _format(value, formatted: dict) -> str:
+        # Solo se memorizan textos: valores iguales de otros tipos pueden
+        # escribirse distinto (1, 1.0 y Decimal('1.00'))
+        if not isinstance(value, str):
+            return str(value).replace("_", " ").title()
+        text = formatted.get(value)
+        if text is None:
+            text = formatted[value] = value.replace("_", " ").title()
+        return text
@@ -1,12 +1,19 @@
 import pandas as pd
 from openpyxl import Workbook
 from factories.sheets_factory import SheetsFactory
+from classes.export.custom_sheet_planner import CustomSheetPlanner
+from utils.rut import rut_key
 import os
 from datetime import datetime
 from pathlib import Path
 
 class Exporter:
 
+    # Columna que separa las columnas de cada tabla en las consultas con JOIN
+    SPLIT_COLUMN = "_split"
+    # RUTs por consulta IN (...) al obtener datos de varios estudiantes
+    STUDENTS_PER_QUERY = 1000
+
     def __init__(self, db_connection, sheet_selection: dict, custom_sheet_selection: dict):
         self.db_connection = db_connection
         self.sheet_factory = SheetsFactory()
@@ -19,81 +26,145 @@ class Exporter:
         if not student_data:
             raise ValueError(f"Estudiante con RUT {rut} no encontrado en la base de datos")
         
+        self._attach_custom_rows({rut_key(rut): student_data})
         file_path = self._create_excel(student_data, output_dir, rut)
         
         return file_path
     
     def _get_student_data(self, rut: str) -> dict:
-        cursor = self.db_connection.cursor(dictionary=True)
+        return self._get_students_data([rut]).get(rut_key(rut))
+
+    def _get_students_data(self, ruts) -> dict:
+        """
+        Obtiene los datos de exportación de varios estudiantes con dos
+        consultas por cada STUDENTS_PER_QUERY RUTs (independiente de la
+        cantidad de semestres):
+          1. Estudiante + Reporte_financiero_estudiante
+          2. Estudiante_Semestre + Estudiante_Asignatura
+        Cada consulta trae las columnas de ambas tablas separadas por una
+        columna marcadora, y se reparten en diccionarios en memoria.
+
+        Returns:
+            dict: {rut_key(rut): {"student", "semesters", "financial_info"}}
+            solo con los RUTs que existen. La clave es la de utils.rut: MySQL
+            compara los RUTs sin distinguir mayúsculas, así que el RUT de la
+            fila puede diferir del ingresado ('12345678-k' / '12345678-K')
+        """
+        ruts = list(dict.fromkeys(ruts))
+        students_data = {}
+        cursor = self.db_connection.cursor()
 
         try:
-            # 1. Datos generales del estudiante
-            query = "SELECT * FROM Estudiante WHERE rut = %s"
-            cursor.execute(query, (rut,))
-            student = cursor.fetchone()
-
-            if not student:
-                return None
-            
-            # 2. Semestres del estudiante
-            query = """
-                SELECT * FROM Estudiante_Semestre
-                WHERE rut_estudiante = %s
-                ORDER BY periodo_semestre DESC
-            """
-            cursor.execute(query, (rut,))
-            semesters = cursor.fetchall()
-
-            # 3. Cursos por semestre
-            semesters_with_subjects = []
-            for semester in semesters:
-                query = """
-                    SELECT * FROM Estudiante_Asignatura
-                    WHERE rut_estudiante = %s AND periodo_semestre = %s
-                    ORDER BY codigo_asignatura
+            for start in range(0, len(ruts), self.STUDENTS_PER_QUERY):
+                chunk = ruts[start:start + self.STUDENTS_PER_QUERY]
+                placeholders = ", ".join(["%s"] * len(chunk))
+
+                # 1. Datos generales + informacion financiera
+                query = f"""
+                    SELECT e.*, NULL AS {self.SPLIT_COLUMN}, r.*
+                    FROM Estudiante e
+                    LEFT JOIN Reporte_financiero_estudiante r ON r.rut_estudiante = e.rut
+                    WHERE e.rut IN ({placeholders})
+                """
+                cursor.execute(query, tuple(chunk))
+                column_names = cursor.column_names
+
+                for row in cursor.fetchall():
+                    student, financial_info = self._split_row(column_names, row)
+
+                    # Sin reporte financiero el LEFT JOIN trae solo NULL
+                    if financial_info.get('rut_estudiante') is None:
+                        financial_info = {}
+
+                    students_data[rut_key(student['rut'])] = {
+                        "student": student,
+                        "semesters": [],
+                        "financial_info": financial_info
+                    }
+
+                # 2. Semestres con sus cursos
+                query = f"""
+                    SELECT es.*, NULL AS {self.SPLIT_COLUMN}, ea.*
+                    FROM Estudiante_Semestre es
+                    LEFT JOIN Estudiante_Asignatura ea
+                        ON ea.rut_estudiante = es.rut_estudiante
+                        AND ea.periodo_semestre = es.periodo_semestre
+                    WHERE es.rut_estudiante IN ({placeholders})
+                    ORDER BY es.rut_estudiante, es.periodo_semestre DESC, ea.codigo_asignatura
                 """
-                cursor.execute(query, (rut, semester['periodo_semestre']))
-                subjects = cursor.fetchall()
-                semesters_with_subjects.append({
-                    'semester': semester,
-                    'subjects': subjects
-                })
-
-            # 4. Informacion financiera
-            query = "SELECT * FROM Reporte_financiero_estudiante WHERE rut_estudiante = %s"
-            cursor.execute(query, (rut,))
-            financial_info = cursor.fetchone()
-
-            if not financial_info:
-                financial_info = {}
-
-            return {
-                "student": student,
-                "semesters": semesters_with_subjects,
-                "financial_info": financial_info
-            }
+                cursor.execute(query, tuple(chunk))
+                column_names = cursor.column_names
+
+                for row in cursor.fetchall():
+                    semester, subject = self._split_row(column_names, row)
+                    student_data = students_data.get(rut_key(semester['rut_estudiante']))
+                    if student_data is None:
+                        continue
+
+                    semesters_with_subjects = student_data['semesters']
+                    if not semesters_with_subjects or semesters_with_subjects[-1]['semester']['periodo_semestre'] != semester['periodo_semestre']:
+                        semesters_with_subjects.append({
+                            'semester': semester,
+                            'subjects': []
+                        })
+
+                    # Semestre sin cursos: el LEFT JOIN trae solo NULL
+                    if subject.get('codigo_asignatura') is not None:
+                        semesters_with_subjects[-1]['subjects'].append(subject)
+
+            return students_data
         
         finally:
             cursor.close()
+
+    def _attach_custom_rows(self, students_data: dict) -> None:
+        """
+        Obtiene las filas de las hojas personalizadas seleccionadas para todos
+        los estudiantes (una consulta por tabla, ver CustomSheetPlanner) y las
+        deja en student_data['custom_rows']
+        """
+        if not students_data or not any(self.custom_sheet_selection.values()):
+            return
+
+        custom_rows = CustomSheetPlanner.from_selection(self.custom_sheet_selection, self.db_connection).fetch(
+            self.db_connection, list(students_data)
+        )
+        for rut, student_data in students_data.items():
+            student_data["custom_rows"] = custom_rows.get(rut, {})
+
+    def _split_row(self, column_names, row) -> tuple:
+        """Separa una fila de un JOIN en dos diccionarios usando la columna marcadora"""
+        split = list(column_names).index(self.SPLIT_COLUMN)
+        left = dict(zip(column_names[:split], row[:split]))
+        right = dict(zip(column_names[split + 1:], row[split + 1:]))
+        return left, right
     
     def _create_excel(self, student_data: dict, output_dir: Path, rut: str) -> str:
-        wb = Workbook()
-        wb.remove(wb.active)
-
-        # Pasar db_connection a la factory
-        sheets = self.sheet_factory.create_sheets(wb, student_data, self.sheet_selection, self.custom_sheet_selection, self.db_connection)
-        
-        for sheet in sheets.values():
-            if sheet:
-                # Pasar db_connection al método add_sheet si es necesario
-                if hasattr(sheet, 'db_connection'):
-                    sheet.add_sheet(wb, student_data, self.db_connection)
-                else:
-                    sheet.add_sheet(wb, student_data)
-        
-        # Guardar archivo
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"Estudiante_{rut}_{timestamp}.xlsx"
-        file_path = output_dir / filename
-        wb.save(file_path)
-        return str(file_path)
\ No newline at end of file
+        file_path = Path(output_dir) / filename
+        render_student_workbook(student_data, self.sheet_selection, self.custom_sheet_selection, file_path, self.db_connection)
+        return str(file_path)
+
+
+def render_student_workbook(student_data: dict, sheet_selection: dict, custom_sheet_selection: dict, file_path, db_connection=None) -> str:
+    """
+    Arma y guarda el Excel de un estudiante. Es una función de módulo para
+    poder ejecutarse en un proceso aparte (exportación masiva).
+    """
+    wb = Workbook()
+    wb.remove(wb.active)
+
+    # Pasar db_connection a la factory
+    sheets = SheetsFactory().create_sheets(wb, student_data, sheet_selection, custom_sheet_selection, db_connection)
+    
+    for sheet in sheets.values():
+        if sheet:
+            # Pasar db_connection al método add_sheet si es necesario
+            if hasattr(sheet, 'db_connection'):
+                sheet.add_sheet(wb, student_data, db_connection)
+            else:
+                sheet.add_sheet(wb, student_data)
+    
+    wb.save(file_path)
+    return str(file_path)
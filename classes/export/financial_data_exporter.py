@@ -1,7 +1,10 @@
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from pathlib import Path
+from contextlib import closing
 from datetime import datetime
+from classes.export.streaming_workbook import close_unbuffered_cursor, create_streaming_workbook, styled_row
+from utils.schema_catalog import schema_catalog, table_key
 
 
 class FinancialDataExporter:
@@ -10,114 +13,193 @@ class FinancialDataExporter:
     Incluye: RUT, Nombre, Programa, Deuda Total, Compromisos, Porcentaje de Morosidad, etc.
     """
 
-    def __init__(self, db_connection):
+    HEADERS = [
+        'RUT',
+        'Nombre',
+        'Programa de Estudio',
+        'Deuda Matrículas',
+        'Deuda Colegiaturas',
+        'Otras Deudas',
+        'Deuda Total',
+        'Compromiso Matrícula',
+        'Compromiso Colegiaturas',
+        'Total Compromisos',
+        '% Morosidad',
+        'Cuotas Pendientes (Matrícula)',
+        'Cuotas Pendientes (Colegiatura)'
+    ]
+
+    COLUMN_WIDTHS = {
+        'A': 15,   # RUT
+        'B': 30,   # Nombre
+        'C': 35,   # Programa
+        'D': 18,   # Deuda Matrículas
+        'E': 18,   # Deuda Colegiaturas
+        'F': 15,   # Otras Deudas
+        'G': 15,   # Deuda Total
+        'H': 20,   # Compromiso Matrícula
+        'I': 22,   # Compromiso Colegiaturas
+        'J': 18,   # Total Compromisos
+        'K': 14,   # % Morosidad
+        'L': 25,   # Cuotas Pendientes Matrícula
+        'M': 25    # Cuotas Pendientes Colegiatura
+    }
+
+    # NamedStyle de cada columna de datos (mismo orden que HEADERS)
+    COLUMN_STYLES = [
+        'fin_texto', 'fin_texto', 'fin_texto',
+        'fin_moneda', 'fin_moneda', 'fin_moneda', 'fin_deuda_total',
+        'fin_moneda', 'fin_moneda', 'fin_moneda',
+        'fin_porcentaje', 'fin_centrado', 'fin_centrado'
+    ]
+
+    # Columnas en el orden de HEADERS; Total Compromisos y % Morosidad se calculan en MySQL
+    QUERY = """
+        SELECT 
+            e.rut,
+            COALESCE(e.nombre, ''),
+            COALESCE(e.programa_estudio, ''),
+            COALESCE(rfe.deuda_matriculas, 0),
+            COALESCE(rfe.deuda_colegiaturas, 0),
+            COALESCE(rfe.otras_deudas, 0),
+            COALESCE(rfe.deuda_total, 0),
+            COALESCE(rfe.monto_compromiso_matricula, 0),
+            COALESCE(rfe.monto_compromiso_colegiaturas, 0),
+            COALESCE(rfe.monto_compromiso_matricula, 0) + COALESCE(rfe.monto_compromiso_colegiaturas, 0),
+            CASE
+                WHEN COALESCE(rfe.monto_compromiso_matricula, 0) + COALESCE(rfe.monto_compromiso_colegiaturas, 0) > 0
+                THEN ROUND(
+                    COALESCE(rfe.deuda_total, 0) * 100
+                    / (COALESCE(rfe.monto_compromiso_matricula, 0) + COALESCE(rfe.monto_compromiso_colegiaturas, 0)),
+                    2
+                )
+                ELSE 0
+            END,
+            COALESCE(rfe.cantidad_cuotas_pendientes_matriculas, 0),
+            COALESCE(rfe.cantidad_cuotas_pendientes_colegiaturas, 0)
+        FROM Reporte_financiero_estudiante rfe
+        INNER JOIN Estudiante e ON e.rut = rfe.rut_estudiante
+        WHERE {conditions}
+        ORDER BY rfe.deuda_total DESC
+        {limit}
+    """
+
+    def __init__(self, db_connection, streaming: bool = False):
         self.db_connection = db_connection
+        # En modo streaming el workbook es write_only y las filas van del
+        # cursor (sin buffer) al Excel sin cargarse en memoria
+        self.streaming = streaming
 
-    def export_financial_data(self, output_dir: Path) -> str:
+    def export_financial_data(self, output_dir: Path, sede: str = None, programa: str = None,
+                              deuda_minima=None, top_n: int = None) -> str:
         """
         Exporta datos financieros de estudiantes con deuda.
         
         Args:
             output_dir: Directorio donde guardar el archivo Excel
+            sede: Solo estudiantes de esta sede (requiere la columna Estudiante.sede)
+            programa: Solo estudiantes de este programa de estudio
+            deuda_minima: Solo estudiantes con deuda total mayor o igual a este monto
+            top_n: Solo los top_n estudiantes con mayor deuda total
             
         Returns:
             str: Ruta del archivo Excel generado
         """
-        # Obtener datos financieros
-        data = self._get_financial_data()
-        
-        if not data:
-            raise ValueError("No hay estudiantes con deuda registrados")
+        query, params = self._build_query(sede, programa, deuda_minima, top_n)
+        
+        if self.streaming:
+            wb = create_streaming_workbook(self._named_styles())
+            ws = wb.create_sheet("Data Financiera")
+        else:
+            wb = Workbook()
+            for style in self._named_styles():
+                wb.add_named_style(style)
+            ws = wb.active
+            ws.title = "Data Financiera"
+        
+        # Anchos y paneles antes de la primera fila (requisito de write_only)
+        for col, width in self.COLUMN_WIDTHS.items():
+            ws.column_dimensions[col].width = width
+        ws.freeze_panes = 'A2'
         
-        # Crear workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Data Financiera"
+        ws.append(styled_row(ws, self.HEADERS, ['fin_encabezado'] * len(self.HEADERS)))
         
-        # Crear hoja con datos
-        self._create_financial_sheet(ws, data)
+        total_rows = 0
+        with closing(self._iter_financial_rows(query, params)) as rows:
+            for values in rows:
+                ws.append(styled_row(ws, values, self.COLUMN_STYLES))
+                total_rows += 1
         
-        # Guardar archivo
-        file_path = self._save_workbook(wb, output_dir)
+        if total_rows == 0:
+            if any(value is not None for value in (sede, programa, deuda_minima, top_n)):
+                raise ValueError("No hay estudiantes con deuda que cumplan los filtros")
+            raise ValueError("No hay estudiantes con deuda registrados")
         
-        return file_path
+        return self._save_workbook(wb, output_dir)
 
-    def _get_financial_data(self) -> list:
+    def _build_query(self, sede: str = None, programa: str = None, deuda_minima=None, top_n: int = None) -> tuple:
         """
-        Obtiene datos financieros de estudiantes con deuda > 0.
+        Arma la consulta con los filtros indicados.
         
         Returns:
-            list: Lista de diccionarios con información financiera
+            tuple: (query, params)
         """
-        cursor = self.db_connection.cursor(dictionary=True)
-        
-        try:
-            query = """
-                SELECT 
-                    e.rut,
-                    COALESCE(e.nombre, '') AS nombre,
-                    COALESCE(e.programa_estudio, '') AS programa_estudio,
-                    COALESCE(rfe.deuda_total, 0) AS deuda_total,
-                    COALESCE(rfe.monto_compromiso_matricula, 0) AS monto_compromiso_matricula,
-                    COALESCE(rfe.monto_compromiso_colegiaturas, 0) AS monto_compromiso_colegiaturas,
-                    COALESCE(rfe.deuda_matriculas, 0) AS deuda_matriculas,
-                    COALESCE(rfe.deuda_colegiaturas, 0) AS deuda_colegiaturas,
-                    COALESCE(rfe.otras_deudas, 0) AS otras_deudas,
-                    COALESCE(rfe.cantidad_cuotas_pendientes_matriculas, 0) AS cuotas_pendientes_matricula,
-                    COALESCE(rfe.cantidad_cuotas_pendientes_colegiaturas, 0) AS cuotas_pendientes_colegiatura
-                FROM Reporte_financiero_estudiante rfe
-                INNER JOIN Estudiante e ON e.rut = rfe.rut_estudiante
-                WHERE rfe.deuda_total > 0
-                ORDER BY rfe.deuda_total DESC
-            """
-            cursor.execute(query)
-            
-            data = []
-            for row in cursor.fetchall():
-                # Calcular porcentaje de morosidad
-                total_compromisos = row['monto_compromiso_matricula'] + row['monto_compromiso_colegiaturas']
-                
-                if total_compromisos > 0:
-                    porcentaje_morosidad = (row['deuda_total'] / total_compromisos) * 100
-                else:
-                    porcentaje_morosidad = 0
-                
-                row['total_compromisos'] = total_compromisos
-                row['porcentaje_morosidad'] = round(porcentaje_morosidad, 2)
-                
-                data.append(row)
-            
-            return data
-            
-        finally:
-            cursor.close()
+        conditions = ["rfe.deuda_total > 0"]
+        params = []
+        
+        if sede:
+            if not self.has_sede_column():
+                raise ValueError(
+                    "El filtro por sede requiere la columna Estudiante.sede, que no existe en la base de datos"
+                )
+            conditions.append("e.sede = %s")
+            params.append(sede)
+        if programa:
+            conditions.append("e.programa_estudio = %s")
+            params.append(programa)
+        if deuda_minima is not None:
+            conditions.append("rfe.deuda_total >= %s")
+            params.append(deuda_minima)
+        
+        limit = ""
+        if top_n is not None:
+            top_n = int(top_n)
+            if top_n <= 0:
+                raise ValueError("La cantidad de estudiantes (top N) debe ser mayor que 0")
+            limit = "LIMIT %s"
+            params.append(top_n)
+        
+        query = self.QUERY.format(conditions=" AND ".join(conditions), limit=limit)
+        return query, tuple(params)
+
+    def has_sede_column(self) -> bool:
+        """True si el esquema tiene Estudiante.sede (necesaria para filtrar por sede)"""
+        tables = schema_catalog.get(self.db_connection) or {}
+        columns = tables.get(table_key("Estudiante"), {})
+        return any(column.lower() == "sede" for column in columns)
 
-    def _create_financial_sheet(self, ws, data: list):
+    def _iter_financial_rows(self, query: str, params: tuple = ()):
         """
-        Crea la hoja con datos financieros.
+        Genera las filas (tuplas en el orden de HEADERS). En modo streaming el
+        cursor no usa buffer: MySQL envía las filas a medida que se consumen.
         """
-        # Configurar encabezados
-        headers = [
-            'RUT',
-            'Nombre',
-            'Programa de Estudio',
-            'Deuda Matrículas',
-            'Deuda Colegiaturas',
-            'Otras Deudas',
-            'Deuda Total',
-            'Compromiso Matrícula',
-            'Compromiso Colegiaturas',
-            'Total Compromisos',
-            '% Morosidad',
-            'Cuotas Pendientes (Matrícula)',
-            'Cuotas Pendientes (Colegiatura)'
-        ]
-        
-        # Estilo para encabezados
-        header_fill = PatternFill(start_color="C4161C", end_color="C4161C", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cursor = self.db_connection.cursor(buffered=not self.streaming)
         
+        try:
+            cursor.execute(query, params)
+            for row in cursor:
+                yield row
+        except BaseException:
+            # También al cerrar el generador antes de tiempo (GeneratorExit)
+            if self.streaming:
+                close_unbuffered_cursor(cursor)
+            else:
+                cursor.close()
+            raise
+        cursor.close()
+
+    def _named_styles(self) -> list:
+        """Estilos con nombre de la hoja: se registran una vez y las celdas solo los referencian"""
         border = Border(
             left=Side(style='thin'),
             right=Side(style='thin'),
@@ -125,125 +207,27 @@ class FinancialDataExporter:
             bottom=Side(style='thin')
         )
         
-        # Escribir encabezados
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-            cell.border = border
+        encabezado = NamedStyle(name='fin_encabezado', border=border)
+        encabezado.fill = PatternFill(start_color="C4161C", end_color="C4161C", fill_type="solid")
+        encabezado.font = Font(bold=True, color="FFFFFF", size=11)
+        encabezado.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
         
-        # Formato para datos
-        data_alignment = Alignment(horizontal="left", vertical="center")
-        currency_format = '$#,##0'
-        percentage_format = '0.00"%"'
+        texto = NamedStyle(name='fin_texto', border=border)
+        texto.alignment = Alignment(horizontal="left", vertical="center")
         
-        # Escribir datos
-        for row_idx, row_data in enumerate(data, start=2):
-            col_idx = 1
-            
-            # RUT
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('rut', ''))
-            cell.alignment = data_alignment
-            cell.border = border
-            col_idx += 1
-            
-            # Nombre
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('nombre', ''))
-            cell.alignment = data_alignment
-            cell.border = border
-            col_idx += 1
-            
-            # Programa
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('programa_estudio', ''))
-            cell.alignment = data_alignment
-            cell.border = border
-            col_idx += 1
-            
-            # Deuda Matrículas
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('deuda_matriculas', 0))
-            cell.number_format = currency_format
-            cell.border = border
-            col_idx += 1
-            
-            # Deuda Colegiaturas
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('deuda_colegiaturas', 0))
-            cell.number_format = currency_format
-            cell.border = border
-            col_idx += 1
-            
-            # Otras Deudas
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('otras_deudas', 0))
-            cell.number_format = currency_format
-            cell.border = border
-            col_idx += 1
-            
-            # Deuda Total
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('deuda_total', 0))
-            cell.number_format = currency_format
-            cell.font = Font(bold=True)
-            cell.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
-            cell.border = border
-            col_idx += 1
-            
-            # Compromiso Matrícula
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('monto_compromiso_matricula', 0))
-            cell.number_format = currency_format
-            cell.border = border
-            col_idx += 1
-            
-            # Compromiso Colegiaturas
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('monto_compromiso_colegiaturas', 0))
-            cell.number_format = currency_format
-            cell.border = border
-            col_idx += 1
-            
-            # Total Compromisos
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('total_compromisos', 0))
-            cell.number_format = currency_format
-            cell.border = border
-            col_idx += 1
-            
-            # % Morosidad
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('porcentaje_morosidad', 0))
-            cell.number_format = percentage_format
-            cell.font = Font(bold=True, color="C4161C")
-            cell.border = border
-            col_idx += 1
-            
-            # Cuotas Pendientes Matrícula
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('cuotas_pendientes_matricula', 0))
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
-            col_idx += 1
-            
-            # Cuotas Pendientes Colegiatura
-            cell = ws.cell(row=row_idx, column=col_idx, value=row_data.get('cuotas_pendientes_colegiatura', 0))
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.border = border
+        moneda = NamedStyle(name='fin_moneda', border=border, number_format='$#,##0')
         
-        # Ajustar ancho de columnas
-        column_widths = {
-            'A': 15,   # RUT
-            'B': 30,   # Nombre
-            'C': 35,   # Programa
-            'D': 18,   # Deuda Matrículas
-            'E': 18,   # Deuda Colegiaturas
-            'F': 15,   # Otras Deudas
-            'G': 15,   # Deuda Total
-            'H': 20,   # Compromiso Matrícula
-            'I': 22,   # Compromiso Colegiaturas
-            'J': 18,   # Total Compromisos
-            'K': 14,   # % Morosidad
-            'L': 25,   # Cuotas Pendientes Matrícula
-            'M': 25    # Cuotas Pendientes Colegiatura
-        }
+        deuda_total = NamedStyle(name='fin_deuda_total', border=border, number_format='$#,##0')
+        deuda_total.font = Font(bold=True)
+        deuda_total.fill = PatternFill(start_color="FFCCCC", end_color="FFCCCC", fill_type="solid")
         
-        for col, width in column_widths.items():
-            ws.column_dimensions[col].width = width
+        porcentaje = NamedStyle(name='fin_porcentaje', border=border, number_format='0.00"%"')
+        porcentaje.font = Font(bold=True, color="C4161C")
         
-        # Congelar primera fila
-        ws.freeze_panes = 'A2'
+        centrado = NamedStyle(name='fin_centrado', border=border)
+        centrado.alignment = Alignment(horizontal="center", vertical="center")
+        
+        return [encabezado, texto, moneda, deuda_total, porcentaje, centrado]
 
     def _save_workbook(self, wb: Workbook, output_dir: Path) -> str:
         """
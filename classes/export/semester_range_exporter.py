@@ -1,8 +1,14 @@
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
 from pathlib import Path
 from datetime import datetime
+from contextlib import closing
+from itertools import groupby
+from classes.export.streaming_workbook import close_unbuffered_cursor, create_streaming_workbook, styled_row
 import re
+from utils.periodo import normalize_periodo
+from utils.schema_catalog import schema_catalog, table_key
 
 
 class SemesterRangeExporter:
@@ -12,8 +18,45 @@ class SemesterRangeExporter:
     - RUT | Programa de Estudio | Ramo | Nota | Docente | Info Asignaturas Reprobadas
     """
 
-    def __init__(self, db_connection):
+    # Filas de todas las hojas: periodo_semestre, rut, nombre, programa_estudio,
+    # ramo, notas_parciales, docente, asignaturas_reprobadas_cuatro_veces,
+    # asignaturas_reprobadas_tres_veces. El rango se resuelve aquí mismo
+    # ({conditions}: BETWEEN sobre la clave del período, {key}) y el orden por
+    # clave deja cada semestre en un tramo contiguo del resultado. Los
+    # semestres sin estudiantes aparecen una vez, con rut NULL.
+    RANGE_QUERY = """
+        SELECT 
+            s.periodo,
+            e.rut,
+            COALESCE(e.nombre, '') AS nombre,
+            COALESCE(e.programa_estudio, '') AS programa_estudio,
+            COALESCE(a.nombre, 'Sin asignaturas registradas') AS ramo,
+            COALESCE(ea.notas_parciales, '') AS notas_parciales,
+            COALESCE(ea.nombre_docente, '') AS docente,
+            COALESCE(es.asignaturas_reprobadas_cuatro_veces, 0) AS asignaturas_reprobadas_cuatro_veces,
+            COALESCE(es.asignaturas_reprobadas_tres_veces, 0) AS asignaturas_reprobadas_tres_veces
+        FROM Semestre s
+        LEFT JOIN Estudiante_Semestre es ON es.periodo_semestre = s.periodo
+        LEFT JOIN Estudiante e ON e.rut = es.rut_estudiante
+        LEFT JOIN Estudiante_Asignatura ea ON ea.rut_estudiante = es.rut_estudiante 
+            AND ea.periodo_semestre = es.periodo_semestre
+        LEFT JOIN Asignatura a ON a.codigo_asignatura = ea.codigo_asignatura
+        WHERE {conditions}
+        ORDER BY {key} IS NULL, {key}, s.periodo, e.rut, a.nombre
+    """
+
+    # Clave del período calculada en SQL igual que utils.periodo.periodo_key,
+    # para bases sin la migración 001 (sin la columna Semestre.periodo_key)
+    PERIODO_KEY_SQL = (
+        "CASE WHEN {alias}.periodo REGEXP '^[0-9]{{4}}-(otoño|primavera)$' "
+        "THEN CAST(SUBSTRING_INDEX({alias}.periodo, '-', 1) AS UNSIGNED) * 2 "
+        "+ (SUBSTRING_INDEX({alias}.periodo, '-', -1) = 'primavera') END"
+    )
+
+    def __init__(self, db_connection, streaming: bool = False):
         self.db_connection = db_connection
+        # En modo streaming se usa un workbook write_only (memoria constante al escribir)
+        self.streaming = streaming
 
     def export_by_semester_range(self, periodo_inicio: str, periodo_fin: str, output_dir: Path) -> str:
         """
@@ -27,100 +70,171 @@ class SemesterRangeExporter:
         Returns:
             str: Ruta del archivo Excel generado
         """
-        # Obtener lista de semestres en el rango
-        semestres = self._get_semestres_in_range(periodo_inicio, periodo_fin)
-        
-        if not semestres:
-            raise ValueError(f"No se encontraron semestres entre {periodo_inicio} y {periodo_fin}")
+        rango = self._key_range(periodo_inicio, periodo_fin)
         
         # Crear workbook
-        wb = Workbook()
-        wb.remove(wb.active)  # Eliminar hoja por defecto
+        if self.streaming:
+            wb = create_streaming_workbook(self._streaming_styles())
+        else:
+            wb = Workbook()
+            wb.remove(wb.active)  # Eliminar hoja por defecto
+        
+        # Crear una hoja por semestre, todas desde una sola consulta ordenada por período
+        semestres = 0
+        if self.streaming:
+            # max_notas sale de un agregado SQL; las filas van del cursor a la hoja
+            max_notas = self._get_max_notas(rango)
+            # closing(): si falla una fila, el cursor se libera en ese momento
+            # (la traza del error mantendría vivo el generador)
+            with closing(self._iter_range_data(rango)) as rows:
+                for semestre, data in self._partition_by_semestre(rows):
+                    self._create_semester_sheet_streaming(wb, semestre, data, max_notas.get(semestre, 3))
+                    semestres += 1
+        else:
+            rows = self._get_range_data(rango)
+            for semestre, data in self._partition_by_semestre(rows):
+                self._create_semester_sheet(wb, semestre, list(data))
+                semestres += 1
         
-        # Crear una hoja por semestre
-        for semestre in semestres:
-            data = self._get_semester_data(semestre)
-            self._create_semester_sheet(wb, semestre, data)
+        if not semestres:
+            raise ValueError(f"No se encontraron semestres entre {periodo_inicio} y {periodo_fin}")
         
         # Guardar archivo
         file_path = self._save_workbook(wb, output_dir, periodo_inicio, periodo_fin)
         
         return file_path
 
-    def _get_semestres_in_range(self, periodo_inicio: str, periodo_fin: str) -> list:
+    def has_periodo_key(self) -> bool:
+        """True si Semestre tiene periodo_key (migración 001 de database/migrations)"""
+        tables = schema_catalog.get(self.db_connection) or {}
+        columns = tables.get(table_key("Semestre"), {})
+        return any(column.lower() == "periodo_key" for column in columns)
+
+    def _periodo_key_sql(self, alias: str = "s") -> str:
         """
-        Obtiene todos los semestres entre dos periodos (inclusive).
+        Expresión SQL de la clave del período: la columna indexada periodo_key
+        (migración 001, que también la completa en los semestres existentes)
+        o, sin la migración, PERIODO_KEY_SQL
+        """
+        if self.has_periodo_key():
+            return f"{alias}.periodo_key"
+        return self.PERIODO_KEY_SQL.format(alias=alias)
+
+    def get_available_semestres(self) -> list:
+        """
+        Obtiene los semestres de la base de datos ordenados por periodo_key;
+        los que no tienen clave reconocible quedan al final, por nombre.
+        
+        Returns:
+            list: [(periodo, periodo_key), ...]
         """
-        cursor = self.db_connection.cursor(dictionary=True)
+        key = self._periodo_key_sql()
+        query = f"SELECT s.periodo, {key} FROM Semestre s ORDER BY {key} IS NULL, {key}, s.periodo"
+        
+        cursor = self.db_connection.cursor()
         
         try:
-            query = """
-                SELECT DISTINCT periodo 
-                FROM Semestre
-                ORDER BY periodo
-            """
             cursor.execute(query)
-            all_semestres = [row['periodo'] for row in cursor.fetchall()]
-            
-            # Filtrar semestres en el rango
-            if periodo_inicio not in all_semestres or periodo_fin not in all_semestres:
-                # Si no existen los periodos exactos, retornar todos
-                return all_semestres
-            
-            idx_inicio = all_semestres.index(periodo_inicio)
-            idx_fin = all_semestres.index(periodo_fin)
-            
-            # Asegurar orden correcto
-            if idx_inicio > idx_fin:
-                idx_inicio, idx_fin = idx_fin, idx_inicio
-            
-            return all_semestres[idx_inicio:idx_fin + 1]
+            return [(periodo, int(key) if key is not None else None) for periodo, key in cursor.fetchall()]
             
         finally:
             cursor.close()
 
-    def _get_semester_data(self, periodo: str) -> list:
+    def _key_range(self, periodo_inicio: str, periodo_fin: str):
+        """
+        (clave menor, clave mayor) de los dos períodos, en cualquier orden y
+        formato (ver utils.periodo). Si alguno no es reconocible, retorna
+        None: se exportan todos los semestres.
+        """
+        _, key_inicio = normalize_periodo(periodo_inicio)
+        _, key_fin = normalize_periodo(periodo_fin)
+        if key_inicio is None or key_fin is None:
+            return None
+        return min(key_inicio, key_fin), max(key_inicio, key_fin)
+
+    def _range_conditions(self, rango) -> tuple:
+        """(condición SQL sobre Semestre s, parámetros) del rango de claves"""
+        if rango is None:
+            return "TRUE", ()
+        return f"{self._periodo_key_sql()} BETWEEN %s AND %s", tuple(rango)
+
+    def _range_query(self, rango) -> tuple:
+        """(RANGE_QUERY, parámetros) para el rango de claves indicado"""
+        conditions, params = self._range_conditions(rango)
+        return self.RANGE_QUERY.format(conditions=conditions, key=self._periodo_key_sql()), params
+
+    def _get_range_data(self, rango) -> list:
         """
-        Obtiene todos los datos de estudiantes para un semestre específico.
+        Obtiene los datos de estudiantes de todos los semestres del rango en
+        una consulta.
         
         Returns:
-            list: Lista de diccionarios con:
-                - rut: RUT del estudiante
-                - nombre: Nombre del estudiante
-                - programa: Programa de estudio
-                - ramo: Nombre del ramo
-                - notas_parciales: Notas separadas por comas
-                - docente: Nombre del docente
-                - asignaturas_reprobadas_cuatro_veces
-                - asignaturas_reprobadas_tres_veces
+            list: Tuplas con las columnas de RANGE_QUERY
         """
-        cursor = self.db_connection.cursor(dictionary=True)
+        cursor = self.db_connection.cursor()
         
         try:
-            query = """
-                SELECT 
-                    e.rut,
-                    COALESCE(e.nombre, '') AS nombre,
-                    COALESCE(e.programa_estudio, '') AS programa_estudio,
-                    COALESCE(a.nombre, 'Sin asignaturas registradas') AS ramo,
-                    COALESCE(ea.notas_parciales, '') AS notas_parciales,
-                    COALESCE(ea.nombre_docente, '') AS docente,
-                    COALESCE(es.asignaturas_reprobadas_cuatro_veces, 0) AS asignaturas_reprobadas_cuatro_veces,
-                    COALESCE(es.asignaturas_reprobadas_tres_veces, 0) AS asignaturas_reprobadas_tres_veces
-                FROM Estudiante_Semestre es
-                INNER JOIN Estudiante e ON e.rut = es.rut_estudiante
-                LEFT JOIN Estudiante_Asignatura ea ON ea.rut_estudiante = es.rut_estudiante 
-                    AND ea.periodo_semestre = es.periodo_semestre
-                LEFT JOIN Asignatura a ON a.codigo_asignatura = ea.codigo_asignatura
-                WHERE es.periodo_semestre = %s
-                ORDER BY e.rut, a.nombre
-            """
-            cursor.execute(query, (periodo,))
+            cursor.execute(*self._range_query(rango))
             return cursor.fetchall()
             
         finally:
             cursor.close()
 
+    def _iter_range_data(self, rango):
+        """
+        Igual que _get_range_data, pero con un cursor sin buffer: las filas
+        se leen desde MySQL a medida que se escriben en las hojas.
+        """
+        cursor = self.db_connection.cursor(buffered=False)
+        
+        try:
+            cursor.execute(*self._range_query(rango))
+            yield from cursor
+        except BaseException:
+            # Error al escribir una fila o generador cerrado antes de tiempo
+            close_unbuffered_cursor(cursor)
+            raise
+        cursor.close()
+
+    def _partition_by_semestre(self, rows):
+        """
+        Recorre las filas (ordenadas por período) una sola vez y genera
+        (semestre, filas sin la columna de período) para cada semestre, en
+        orden. La fila con rut NULL de un semestre sin estudiantes se omite:
+        ese semestre recibe un iterable vacío.
+        """
+        for semestre, grupo in groupby(rows, key=lambda row: row[0]):
+            yield semestre, (row[1:] for row in grupo if row[1] is not None)
+
+    def _get_max_notas(self, rango) -> dict:
+        """
+        Número máximo de notas parciales por semestre, calculado en SQL como
+        separadores (',' o ';') + 1. Puede sobrestimar si hay separadores
+        sobrantes, nunca subestimar. Los semestres sin notas no aparecen.
+        """
+        conditions, params = self._range_conditions(rango)
+        cursor = self.db_connection.cursor()
+        
+        try:
+            query = """
+                SELECT periodo, MAX(
+                    CHAR_LENGTH(notas) - CHAR_LENGTH(REPLACE(REPLACE(notas, ',', ''), ';', '')) + 1
+                )
+                FROM (
+                    SELECT s.periodo, TRIM(BOTH '"' FROM TRIM(ea.notas_parciales)) AS notas
+                    FROM Semestre s
+                    INNER JOIN Estudiante_Asignatura ea ON ea.periodo_semestre = s.periodo
+                    WHERE {conditions}
+                ) notas_semestre
+                WHERE notas <> ''
+                GROUP BY periodo
+            """.format(conditions=conditions)
+            cursor.execute(query, params)
+            return {periodo: int(valor) for periodo, valor in cursor.fetchall() if valor}
+            
+        finally:
+            cursor.close()
+
     def _split_notas(self, notas_str: str) -> list:
         """Divide notas por coma o punto y coma, normalizando espacios y comillas."""
         if not notas_str:
@@ -137,10 +251,70 @@ class SemesterRangeExporter:
         sheet_name = semestre.replace('/', '-')[:31]
         ws = wb.create_sheet(title=sheet_name)
         
-        # Determinar número máximo de notas para crear columnas dinámicas
+        max_notas = self._max_notas(data)
+        headers = self._semester_headers(max_notas)
+        
+        # Estilo para encabezados
+        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        header_font = Font(bold=True, color="FFFFFF", size=11)
+        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        
+        # Escribir encabezados
+        for col_idx, header in enumerate(headers, start=1):
+            cell = ws.cell(row=1, column=col_idx, value=header)
+            cell.fill = header_fill
+            cell.font = header_font
+            cell.alignment = header_alignment
+        
+        # Escribir datos
+        if not data:
+            # Si no hay datos, agregar mensaje informativo
+            total_cols = len(headers)
+            ws.cell(row=2, column=1, value='No hay estudiantes registrados en este semestre')
+            ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=total_cols)
+            cell = ws.cell(row=2, column=1)
+            cell.alignment = Alignment(horizontal="center", vertical="center")
+            cell.font = Font(italic=True, color="808080")
+        else:
+            for values in self._semester_rows(data, max_notas):
+                ws.append(values)
+        
+        self._set_column_widths(ws, max_notas)
+        
+        # Congelar primera fila
+        ws.freeze_panes = 'A2'
+
+    def _create_semester_sheet_streaming(self, wb: Workbook, semestre: str, rows, max_notas: int):
+        """
+        Igual que _create_semester_sheet, pero sobre un workbook write_only:
+        las filas (un iterable, recorrido una sola vez) se escriben a disco a
+        medida que se agregan y los estilos son NamedStyle compartidos.
+        """
+        sheet_name = semestre.replace('/', '-')[:31]
+        ws = wb.create_sheet(title=sheet_name)
+        
+        headers = self._semester_headers(max_notas)
+        
+        # En write_only las dimensiones y paneles se definen antes de las filas
+        self._set_column_widths(ws, max_notas)
+        ws.freeze_panes = 'A2'
+        
+        ws.append(styled_row(ws, headers, ['sem_encabezado'] * len(headers)))
+        
+        empty = True
+        for values in self._semester_rows(rows, max_notas):
+            ws.append(values)
+            empty = False
+        
+        if empty:
+            # write_only no permite combinar celdas: el mensaje queda en la columna A
+            ws.append(styled_row(ws, ['No hay estudiantes registrados en este semestre'], ['sem_sin_datos']))
+
+    def _max_notas(self, data) -> int:
+        """Número máximo de notas parciales (columnas SN-x); al menos 3"""
         max_notas = 0
         for row_data in data:
-            notas_str = row_data.get('notas_parciales', '')
+            notas_str = row_data[4]
             if notas_str:
                 num_notas = len(self._split_notas(notas_str))
                 max_notas = max(max_notas, num_notas)
@@ -148,8 +322,9 @@ class SemesterRangeExporter:
         # Si no hay notas, crear al menos 3 columnas
         if max_notas == 0:
             max_notas = 3
-        
-        # Configurar encabezados dinámicos
+        return max_notas
+
+    def _semester_headers(self, max_notas: int) -> list:
         headers = [
             'RUT',
             'Nombre',
@@ -166,86 +341,36 @@ class SemesterRangeExporter:
             'Asignaturas Reprobadas (4 veces)',
             'Asignaturas Reprobadas (3 veces)'
         ])
-        
-        # Estilo para encabezados
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        header_font = Font(bold=True, color="FFFFFF", size=11)
-        header_alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-        
-        # Escribir encabezados
-        for col_idx, header in enumerate(headers, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.fill = header_fill
-            cell.font = header_font
-            cell.alignment = header_alignment
-        
-        # Escribir datos
-        if not data:
-            # Si no hay datos, agregar mensaje informativo
-            total_cols = len(headers)
-            ws.cell(row=2, column=1, value='No hay estudiantes registrados en este semestre')
-            ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=total_cols)
-            cell = ws.cell(row=2, column=1)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.font = Font(italic=True, color="808080")
-        else:
-            prev_rut = None
-            for row_idx, row_data in enumerate(data, start=2):
-                col_idx = 1
-                
-                current_rut = row_data.get('rut', '')
-                is_repeat = current_rut == prev_rut and current_rut != ''
-                
-                # RUT (solo si cambia)
-                ws.cell(row=row_idx, column=col_idx, value='' if is_repeat else current_rut)
-                col_idx += 1
-                
-                # Nombre (solo si cambia)
-                ws.cell(row=row_idx, column=col_idx, value='' if is_repeat else row_data.get('nombre', ''))
-                col_idx += 1
-                
-                # Programa (solo si cambia)
-                ws.cell(row=row_idx, column=col_idx, value='' if is_repeat else row_data.get('programa_estudio', ''))
-                col_idx += 1
-                
-                # Ramo
-                ws.cell(row=row_idx, column=col_idx, value=row_data.get('ramo', ''))
-                col_idx += 1
-                
-                # Notas parciales - dividir por cada columna
-                notas_str = row_data.get('notas_parciales', '')
-                notas_list = self._split_notas(notas_str)
-                
-                # Escribir cada nota en su columna correspondiente
-                for i in range(max_notas):
-                    if i < len(notas_list):
-                        ws.cell(row=row_idx, column=col_idx, value=notas_list[i])
-                    else:
-                        ws.cell(row=row_idx, column=col_idx, value='')
-                    col_idx += 1
-                
-                # Docente
-                ws.cell(row=row_idx, column=col_idx, value=row_data.get('docente', ''))
-                col_idx += 1
-                
-                # Asignaturas reprobadas 4 veces (solo si cambia)
-                ws.cell(
-                    row=row_idx,
-                    column=col_idx,
-                    value='' if is_repeat else row_data.get('asignaturas_reprobadas_cuatro_veces', '')
-                )
-                col_idx += 1
-                
-                # Asignaturas reprobadas 3 veces (solo si cambia)
-                ws.cell(
-                    row=row_idx,
-                    column=col_idx,
-                    value='' if is_repeat else row_data.get('asignaturas_reprobadas_tres_veces', '')
-                )
-                
-                prev_rut = current_rut
-        
-        # Ajustar ancho de columnas dinámicamente
+        return headers
+
+    def _semester_rows(self, data, max_notas: int):
+        """
+        Genera las filas de la hoja. Las columnas del estudiante (RUT, nombre,
+        programa, reprobadas) solo se escriben en su primera fila.
+        """
+        prev_rut = None
+        for (current_rut, nombre, programa_estudio, ramo, notas_parciales,
+             docente, reprobadas_cuatro_veces, reprobadas_tres_veces) in data:
+            is_repeat = current_rut == prev_rut and current_rut != ''
+            
+            # Notas parciales - una por columna
+            notas_list = self._split_notas(notas_parciales)
+            notas = [notas_list[i] if i < len(notas_list) else '' for i in range(max_notas)]
+            
+            yield [
+                '' if is_repeat else current_rut,
+                '' if is_repeat else nombre,
+                '' if is_repeat else programa_estudio,
+                ramo,
+                *notas,
+                docente,
+                '' if is_repeat else reprobadas_cuatro_veces,
+                '' if is_repeat else reprobadas_tres_veces,
+            ]
+            
+            prev_rut = current_rut
+
+    def _set_column_widths(self, ws, max_notas: int):
         ws.column_dimensions['A'].width = 15  # RUT
         ws.column_dimensions['B'].width = 30  # Nombre
         ws.column_dimensions['C'].width = 40  # Programa
@@ -253,21 +378,25 @@ class SemesterRangeExporter:
         
         # Columnas de notas (SN-1, SN-2, etc.)
         for i in range(max_notas):
-            col_letter = chr(ord('E') + i)  # E, F, G, ...
+            col_letter = get_column_letter(5 + i)  # E, F, G, ...
             ws.column_dimensions[col_letter].width = 10
         
         # Docente y reprobadas
-        docente_col = chr(ord('E') + max_notas)
-        ws.column_dimensions[docente_col].width = 30
-        
-        reprobadas_4_col = chr(ord('E') + max_notas + 1)
-        ws.column_dimensions[reprobadas_4_col].width = 25
+        ws.column_dimensions[get_column_letter(5 + max_notas)].width = 30
+        ws.column_dimensions[get_column_letter(6 + max_notas)].width = 25
+        ws.column_dimensions[get_column_letter(7 + max_notas)].width = 25
+
+    def _streaming_styles(self) -> list:
+        encabezado = NamedStyle(name='sem_encabezado')
+        encabezado.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+        encabezado.font = Font(bold=True, color="FFFFFF", size=11)
+        encabezado.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
         
-        reprobadas_3_col = chr(ord('E') + max_notas + 2)
-        ws.column_dimensions[reprobadas_3_col].width = 25
+        sin_datos = NamedStyle(name='sem_sin_datos')
+        sin_datos.font = Font(italic=True, color="808080")
+        sin_datos.alignment = Alignment(horizontal="center", vertical="center")
         
-        # Congelar primera fila
-        ws.freeze_panes = 'A2'
+        return [encabezado, sin_datos]
 
     def _save_workbook(self, wb: Workbook, output_dir: Path, periodo_inicio: str, periodo_fin: str) -> str:
         """
@@ -0,0 +1,47 @@
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+
+
+def create_streaming_workbook(named_styles=()) -> Workbook:
+    """
+    Workbook en modo write_only: las filas se escriben en disco a medida que
+    se agregan, así la memoria no crece con la cantidad de filas. Los estilos
+    se registran una sola vez como NamedStyle y las celdas solo los referencian.
+    """
+    wb = Workbook(write_only=True)
+    for style in named_styles:
+        wb.add_named_style(style)
+    return wb
+
+
+def styled_row(ws, values, styles) -> list:
+    """
+    Arma una fila para ws.append() asignando a cada valor el NamedStyle de su
+    columna (None = sin estilo, se escribe el valor directo)
+    """
+    row = []
+    for value, style in zip(values, styles):
+        if style is None:
+            row.append(value)
+        else:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            row.append(cell)
+    return row
+
+
+def close_unbuffered_cursor(cursor) -> None:
+    """
+    Cierra un cursor sin buffer después de un error sin ocultarlo: las filas
+    no leídas se consumen antes (si no, close() falla con "Unread result
+    found" y la conexión queda con el resultado pendiente, así que las
+    siguientes consultas también fallan)
+    """
+    try:
+        cursor.fetchall()
+    except Exception:
+        pass
+    try:
+        cursor.close()
+    except Exception:
+        pass
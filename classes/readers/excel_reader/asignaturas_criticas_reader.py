@@ -1,78 +1,65 @@
-from operator import index
 import pandas as pd
-from classes.readers.reader import Reader
+from classes.readers.excel_reader.csv_reader import CSVReader
 
 
-class AsignaturaCriticasReader(Reader):
-    
-    def __init__(self, file_path: str, db_connection):
-        self.file_path = file_path
-        self.db_connection = db_connection
-        self.df = pd.read_csv(self.file_path, delimiter=';', skiprows=5, encoding='utf-8')
+class AsignaturaCriticasReader(CSVReader):
 
-    def get_total_rows(self) -> int:
-        """Retorna el número de filas del DataFrame"""
-        return len(self.df)
+    def _transform(self, df: pd.DataFrame) -> dict:
+        """Convierte el chunk en columnas tipadas, una tabla por clave"""
 
-    def _process_and_upsert(self, progress_callback=None):
-        cursor = self.db_connection.cursor()
-        
+        return {
+            "asignatura_semestre": {
+                "secciones": self._int_column(df["SECCIONES"]),
+                "alumnos": self._int_column(df["ALUMNOS"]),
+                "alumnos_en_riesgo": self._int_column(df["ALUMNOS EN RIESGO"]),
+                "alumnos_ayudantia": self._int_column(df["ALUMNOS AYUDANTIA"]),
+                "porcentaje_reprobacion_N1": self._float_column(df["PORCENTAJE REPROBACION N1"]),
+                "porcentaje_reprobacion_N2": self._float_column(df["PORCENTAJE REPROBACION N2"]),
+                "porcentaje_reprobacion_N3": self._float_column(df["PORCENTAJE REPROBACION N3"]),
+
+                "promedio_nota_uno": self._float_column(df["PROMEDIO NOTA UNO"]),
+                "promedio_nota_dos": self._float_column(df["PROMEDIO NOTA DOS"]),
+                "promedio_nota_tres": self._float_column(df["PROMEDIO NOTA TRES"]),
+
+                "ayudantia_virtual": self._flag_column(df["AYUDANTIA VIRTUAL"], "SI"),
+                "ayudantia_sede": self._flag_column(df["AYUDANTIA SEDE"], "SI"),
+            },
+            "asignatura": {
+                "nombre": df['ASIGNATURA'],
+                "programa": df['PROGRAMA'],
+                "area": df['AREA'],
+                "COD_mencion": df['COD MENCION'],
+                "mencion": df['MENCION'].str.upper(),
+                "plan": df['PLAN'],
+                "modalidad": df['JORNADA'],
+                "nivel": self._int_column(df['NIVEL']),
+                "prerequisito_semestre_siguiente": self._int_column(df['PREREQUISITO SEMESTRE SIGUIENTE']),
+                "ultimo_nivel": self._flag_column(df["ULTIMO NIVEL"], "SI"),
+            },
+        }
+
+    def _upsert_chunk(self, cursor, df: pd.DataFrame, progress_callback=None):
         try:
-            for index, row in self.df.iterrows():
-                if progress_callback:
-                    progress_callback(index + 1)
-                try:
-                    codigo_asignatura = row['CODIGO ASIGNATURA']
-                    periodo = self._normalize_periodo(row['PERIODO'])
-                    
-                    self._insert_semestre(cursor, periodo)
+            columnas = self._transform(df)
+            codigos = self._column_values(df['CODIGO ASIGNATURA'])
+            periodos = self._normalize_periodos(df['PERIODO'])
+        except KeyError as e:
+            raise ValueError(f"Columna requerida no encontrada en el archivo: {str(e)}")
 
-                    datos_asignatura_semestre = {
-                        "codigo_asignatura": codigo_asignatura,
-                        "periodo_semestre": periodo,
-                        "secciones": int(row["SECCIONES"]) if row["SECCIONES"] else None,
-                        "alumnos": int(row["ALUMNOS"]) if row["ALUMNOS"] else None,
-                        "alumnos_en_riesgo": int(row["ALUMNOS EN RIESGO"]) if row["ALUMNOS EN RIESGO"] else None,
-                        "alumnos_ayudantia": int(row["ALUMNOS AYUDANTIA"]) if row["ALUMNOS AYUDANTIA"] else None,
-                        "porcentaje_reprobacion_N1": float(row["PORCENTAJE REPROBACION N1"]) if row["PORCENTAJE REPROBACION N1"] else None,
-                        "porcentaje_reprobacion_N2": float(row["PORCENTAJE REPROBACION N2"]) if row["PORCENTAJE REPROBACION N2"] else None,
-                        "porcentaje_reprobacion_N3": float(row["PORCENTAJE REPROBACION N3"]) if row["PORCENTAJE REPROBACION N3"] else None,
+        # Un INSERT por los semestres distintos del chunk, antes de sus filas
+        self._register_semestres(cursor, periodos)
 
-                        "promedio_nota_uno": float(row["PROMEDIO NOTA UNO"]) if row["PROMEDIO NOTA UNO"] else None,
-                        "promedio_nota_dos": float(row["PROMEDIO NOTA DOS"]) if row["PROMEDIO NOTA DOS"] else None,
-                        "promedio_nota_tres": float(row["PROMEDIO NOTA TRES"]) if row["PROMEDIO NOTA TRES"] else None,
+        total = len(df)
+        filas = zip(
+            codigos,
+            periodos,
+            self._table_rows("Asignatura", columnas["asignatura"], total),
+            self._table_rows("Asignatura_semestre", columnas["asignatura_semestre"], total),
+        )
 
-                        "ayudantia_virtual": True if row["AYUDANTIA VIRTUAL"] == "SI" else False,
-                        "ayudantia_sede": True if row["AYUDANTIA SEDE"] == "SI" else False
-                    }
-                    
-                    datos_asignatura = {
-                        'nombre': row['ASIGNATURA'],
-                        "programa": row['PROGRAMA'],
-                        "area": row['AREA'],
-                        "COD_mencion": row['COD MENCION'],
-                        "mencion": row['MENCION'].upper(),
-                        "plan": row['PLAN'],
-                        "modalidad": row['JORNADA'],
-                        "nivel": int(row['NIVEL']) if row['NIVEL'] else None,
-                        "prerequisito_semestre_siguiente": int(row['PREREQUISITO SEMESTRE SIGUIENTE']) if row['PREREQUISITO SEMESTRE SIGUIENTE'] else None,
-                        "ultimo_nivel": True if row["ULTIMO NIVEL"] == "SI" else False,
-                    }
-                    
-                    if self._asignatura_exists(codigo_asignatura):
-                        self._update_asignatura(cursor, codigo_asignatura, datos_asignatura)
-                    else:
-                        self._insert_asignatura(cursor, codigo_asignatura, datos_asignatura)
+        for index, (codigo_asignatura, periodo, asignatura, asignatura_semestre) in zip(df.index, filas):
+            if progress_callback:
+                progress_callback(index + 1)
 
-                    if self._asignatura_semestre_exists(cursor, codigo_asignatura, periodo):
-                        self._update_asignatura_semestre(cursor, codigo_asignatura, periodo, datos_asignatura_semestre)
-                    else:
-                        self._insert_asignatura_semestre(cursor, codigo_asignatura, periodo, datos_asignatura_semestre)
-                    
-                except (ValueError, KeyError, TypeError) as e:
-                    # Lanzar excepción con información de fila
-                    fila_num = index + 6  # +6 porque skiprows=5
-                    raise ValueError(f"Error en fila {fila_num} (índice {index}): {str(e)}\nDatos de la fila: {dict(row)}")
-                    
-        finally:
-            cursor.close()
\ No newline at end of file
+            self._queue_upsert_values(cursor, "Asignatura", (codigo_asignatura,), asignatura)
+            self._queue_upsert_values(cursor, "Asignatura_semestre", (codigo_asignatura, periodo), asignatura_semestre)
@@ -0,0 +1,88 @@
+from abc import abstractmethod
+import pandas as pd
+from classes.readers.reader import Reader
+
+
+class CSVReader(Reader):
+    """
+    Base de los readers CSV. Lee el archivo por chunks para que la memoria
+    no crezca con el tamaño del archivo. En modo streaming además confirma
+    (commit) la transacción al terminar cada chunk.
+    """
+
+    DELIMITER = ';'
+    SKIPROWS = 5
+    FILA_OFFSET = SKIPROWS + 1
+    CHUNK_SIZE = 5000
+
+    def __init__(self, file_path: str, db_connection, streaming: bool = False):
+        super().__init__(file_path, db_connection)
+        self.streaming = streaming
+        self._total_rows = None
+
+    def get_total_rows(self) -> int:
+        """Cuenta las filas del archivo sin parsearlo (solo cuenta saltos de línea)"""
+        if self._total_rows is None:
+            lineas = 0
+            ultimo_byte = b''
+            with open(self.file_path, 'rb') as f:
+                for bloque in iter(lambda: f.read(1 << 20), b''):
+                    lineas += bloque.count(b'\n')
+                    ultimo_byte = bloque[-1:]
+            if ultimo_byte and ultimo_byte != b'\n':
+                lineas += 1
+            # Descontar filas de preámbulo y encabezado
+            self._total_rows = max(lineas - self.SKIPROWS - 1, 0)
+        return self._total_rows
+
+    def _read_chunks(self):
+        """Itera el archivo en DataFrames de CHUNK_SIZE filas (el índice continúa entre chunks)"""
+        chunks = pd.read_csv(
+            self.file_path,
+            delimiter=self.DELIMITER,
+            skiprows=self.SKIPROWS,
+            encoding='utf-8',
+            chunksize=self.CHUNK_SIZE,
+        )
+        with chunks:
+            while True:
+                with self.report.stage("lectura"):
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        return
+                    chunk = self._prepare_chunk(chunk)
+                self.report.rows += len(chunk)
+                yield chunk
+
+    def _prepare_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Permite a cada reader normalizar el chunk recién leído"""
+        return chunk
+
+    def _process_and_upsert(self, progress_callback=None):
+        cursor = self.db_connection.cursor()
+
+        try:
+            for chunk in self._read_chunks():
+                with self.report.stage("transformacion"):
+                    self._upsert_chunk(cursor, chunk, progress_callback)
+                if self.streaming:
+                    self._flush_batches(cursor)
+                    with self.report.stage("commit"):
+                        self.db_connection.commit()
+
+            self._flush_batches(cursor)
+            with self.report.stage("post_proceso"):
+                self._after_upsert(cursor)
+
+        finally:
+            cursor.close()
+
+    def _stage_rows(self):
+        for chunk in self._read_chunks():
+            with self.report.stage("transformacion"):
+                self._upsert_chunk(None, chunk)
+
+    @abstractmethod
+    def _upsert_chunk(self, cursor, chunk: pd.DataFrame, progress_callback=None):
+        """Transforma un chunk y encola sus filas (cursor es None en modo staging)"""
+        pass
@@ -1,92 +1,143 @@
+import logging
 import pandas as pd
-from classes.readers.reader import Reader
+from classes.readers.excel_reader.csv_reader import CSVReader
 import re
 from datetime import datetime
 
-class ReporteMorosidadReader(Reader):
+logger = logging.getLogger(__name__)
+
+
+class ReporteMorosidadReader(CSVReader):
+
+    DELIMITER = ','
+    SKIPROWS = 0
+    FILA_OFFSET = 1
+    # El resumen y el reseteo de deudas afectan a toda la tabla financiera
+    EXCLUSIVE_WRITE = True
     
-    def __init__(self, file_path: str, db_connection):
-        self.file_path = file_path
-        self.db_connection = db_connection
+    def __init__(self, file_path: str, db_connection, streaming: bool = False):
+        super().__init__(file_path, db_connection, streaming)
         self.patron_año = r'(\d{4})'
-        self.df = pd.read_csv(self.file_path, delimiter=',', skiprows=0, encoding='utf-8')
-        # Limpiar nombres de columnas (eliminar espacios)
-        self.df.columns = self.df.columns.str.strip()
         # Métricas de morosidad
         self.metricas_morosidad = {}
+        # RUTs presentes en el reporte (para resetear la deuda del resto)
+        self.ruts_en_reporte = set()
+        # RUTs de los demás archivos del lote. Si no es None, este archivo
+        # cierra el lote y resetea, en su misma transacción, la deuda de los
+        # estudiantes que no aparecen en ninguno de los archivos
+        self.ruts_del_lote = None
+        # Acumuladores del resumen, actualizados chunk a chunk
+        self._acumulado = {
+            "estudiantes": 0,
+            "con_deuda": 0,
+            "saldo": 0,
+            "compromisos": 0,
+            "cuotas_mayores_cero": 0,
+            "suma_cuotas_mayores_cero": 0,
+        }
+
+    def _prepare_chunk(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        # Limpiar nombres de columnas (eliminar espacios)
+        chunk.columns = chunk.columns.str.strip()
+        return chunk
 
-    def get_total_rows(self) -> int:
-        """Retorna el número de filas del DataFrame"""
-        return len(self.df)
+    def _transform(self, df: pd.DataFrame) -> dict:
+        """Convierte el chunk en columnas tipadas, una tabla por clave"""
+        gratuidad = df['Tiene Gratuidad']
 
-    def _process_and_upsert(self, progress_callback=None):
-        cursor = self.db_connection.cursor()
-        
+        return {
+            "estudiante": {
+                "deuda": self._currency_column(df['Total Saldo']),
+                "programa_estudio": df['Programa de Estudio'],
+                "nombre_apoderado": df['Nombre Apoderado'],
+                "terminal": False,
+                "tiene_gratuidad": gratuidad.isin([1, "Si"]) | gratuidad.astype(str).str.upper().eq('YES'),
+                "tipo_alumno": df['Tipo Alumno'],
+                "estado_matricula": df['Estado Matricula'],
+            },
+            "reporte_financiero": {
+                "cantidad_cuotas_pendientes_matriculas": self._int_column(df['Cantidad Cuotas Pendientes Matricula'], falsy=0),
+                "cantidad_cuotas_pendientes_colegiaturas": self._int_column(df['Cantidad Cuotas Pendientes Colegiaturas'], falsy=0),
+                "deuda_matriculas": self._currency_column(df['Deuda Matriculas']),
+                "deuda_colegiaturas": self._currency_column(df['Deuda Colegiaturas']),
+                "otras_deudas": self._int_column(df['Deuda Total Otras Deudas'], falsy=0),
+                "deuda_total": self._currency_column(df['Deuda Total (Compromisos+Colegiaturas+Otras Deudas)']),
+                "monto_compromiso_matricula": self._currency_column(df['Monto Compromiso Matricula']),
+                "monto_compromiso_colegiaturas": self._currency_column(df['Monto Compromisos Colegiaturas']),
+            },
+        }
+
+    def _upsert_chunk(self, cursor, df: pd.DataFrame, progress_callback=None):
         try:
-            for index, row in self.df.iterrows():
-                if progress_callback:
-                    progress_callback(index + 1)
-                try:
-                    rut_estudiante = row['Rut Alumno']
-                    periodo = self._normalize_periodo(row["Semestre"])
-
-                    self._insert_semestre(cursor, periodo)
-
-                    datos_estudiante = {
-                        "rut": rut_estudiante,
-                        "secciones_curriculares": None,
-                        "secciones_online": None,
-                        "deuda": int(str(row['Total Saldo']).replace('$', '').replace(',', '')) if row['Total Saldo'] and str(row['Total Saldo']) != '$0' else 0,
-                        "asistencia_promedio": None,
-                        "nombre": None,
-                        "programa_estudio": row['Programa de Estudio'],
-                        "nombre_apoderado": row['Nombre Apoderado'],
-                        "terminal": False,
-                        "tiene_gratuidad": True if row['Tiene Gratuidad'] == 1 or row['Tiene Gratuidad'] == "Si" or str(row['Tiene Gratuidad']).upper() == 'YES' else False,
-                        "solicitud_interrupcion_estudios": None,
-                        "solicitud_interrupcion_estudio_pendiente": None,
-                        "interrupcion_estudio_pendiente": None,
-                        "beca_stem": None,
-                        "tipo_alumno": row['Tipo Alumno'],
-                        "estado_matricula": row['Estado Matricula'],
-                        "promedio_media_matematica": None,
-                        "promedio_media_lenguaje": None,
-                        "promedio_media_ingles": None,
-                        "ultima_asistencia": None,
-                    }
-                    
-                    # Convertir compromisos a int
-                    monto_compromiso_matricula = int(str(row['Monto Compromiso Matricula']).replace('$', '').replace(',', '')) if row['Monto Compromiso Matricula'] and str(row['Monto Compromiso Matricula']) != '$0' else 0
-                    monto_compromiso_colegiaturas = int(str(row['Monto Compromisos Colegiaturas']).replace('$', '').replace(',', '')) if row['Monto Compromisos Colegiaturas'] and str(row['Monto Compromisos Colegiaturas']) != '$0' else 0
-                    
-                    datos_reporte_financiero_estudiante = {
-                        "rut_estudiante": rut_estudiante,
-                        "cantidad_cuotas_pendientes_matriculas": int(row['Cantidad Cuotas Pendientes Matricula']) if row['Cantidad Cuotas Pendientes Matricula'] else 0,
-                        "cantidad_cuotas_pendientes_colegiaturas": int(row['Cantidad Cuotas Pendientes Colegiaturas']) if row['Cantidad Cuotas Pendientes Colegiaturas'] else 0,
-                        "deuda_matriculas": int(str(row['Deuda Matriculas']).replace('$', '').replace(',', '')) if row['Deuda Matriculas'] and str(row['Deuda Matriculas']) != '$0' else 0,
-                        "deuda_colegiaturas": int(str(row['Deuda Colegiaturas']).replace('$', '').replace(',', '')) if row['Deuda Colegiaturas'] and str(row['Deuda Colegiaturas']) != '$0' else 0,
-                        "otras_deudas": int(row['Deuda Total Otras Deudas']) if row['Deuda Total Otras Deudas'] else 0,
-                        "deuda_total": int(str(row['Deuda Total (Compromisos+Colegiaturas+Otras Deudas)']).replace('$', '').replace(',', '')) if row['Deuda Total (Compromisos+Colegiaturas+Otras Deudas)'] and str(row['Deuda Total (Compromisos+Colegiaturas+Otras Deudas)']) != '$0' else 0,
-                        "monto_compromiso_matricula": monto_compromiso_matricula,
-                        "monto_compromiso_colegiaturas": monto_compromiso_colegiaturas,
-                    }
-
-                    if self._estudiante_exists(cursor, rut_estudiante):
-                        self._update_estudiante(cursor, rut_estudiante, datos_estudiante)
-                        self._update_reporte_financiero(cursor, rut_estudiante, datos_reporte_financiero_estudiante)
-                    else:
-                        self._insert_estudiante(cursor, rut_estudiante, datos_estudiante)
-                        self._insert_reporte_financiero(cursor, rut_estudiante, datos_reporte_financiero_estudiante)
-                        
-                except (ValueError, KeyError, TypeError) as e:
-                    fila_num = index + 1
-                    raise ValueError(f"Error en fila {fila_num} (índice {index}): {str(e)}\nDatos de la fila: {dict(row)}")
-            
-            # Después de procesar todos los registros, calcular y guardar métricas de morosidad
-            self._calculate_and_insert_morosidad_summary(cursor)
+            columnas = self._transform(df)
+            ruts = self._column_values(df['Rut Alumno'])
+            periodos = self._normalize_periodos(df["Semestre"])
+            self._accumulate_summary(df, columnas)
+        except KeyError as e:
+            raise ValueError(f"Columna requerida no encontrada en el archivo: {str(e)}")
+
+        self.ruts_en_reporte.update(rut for rut in ruts if rut is not None)
+
+        # Un INSERT por los semestres distintos del chunk, antes de sus filas
+        self._register_semestres(cursor, periodos)
+
+        total = len(df)
+        filas = zip(
+            ruts,
+            periodos,
+            self._table_rows("Estudiante", columnas["estudiante"], total),
+            self._table_rows("Reporte_financiero_estudiante", columnas["reporte_financiero"], total),
+        )
+
+        for index, (rut_estudiante, periodo, estudiante, reporte_financiero) in zip(df.index, filas):
+            if progress_callback:
+                progress_callback(index + 1)
 
-        finally:
-            cursor.close()
+            self._queue_upsert_values(cursor, "Estudiante", (rut_estudiante,), estudiante)
+            self._queue_upsert_values(cursor, "Reporte_financiero_estudiante", (rut_estudiante,), reporte_financiero)
+
+    def _after_upsert(self, cursor):
+        if self.ruts_del_lote is not None:
+            self._reset_debt_for_missing_students(cursor, self.ruts_del_lote | self.ruts_en_reporte)
+        # Después de procesar todos los registros, calcular y guardar métricas de morosidad
+        self._calculate_and_insert_morosidad_summary(cursor)
+
+    def _reset_debt_for_missing_students(self, cursor, ruts_in_report: set):
+        """Resetea la deuda a 0 para estudiantes que NO estén en el lote de reportes (sin commit)"""
+        if not ruts_in_report:
+            return
+
+        # Crear lista de placeholders para SQL
+        placeholders = ','.join(['%s'] * len(ruts_in_report))
+
+        # Actualizar deuda a 0 para estudiantes NO en el reporte
+        query = f"""
+            UPDATE Reporte_financiero_estudiante 
+            SET deuda_total = 0,
+                deuda_matriculas = 0,
+                deuda_colegiaturas = 0,
+                otras_deudas = 0,
+                cantidad_cuotas_pendientes_matriculas = 0,
+                cantidad_cuotas_pendientes_colegiaturas = 0
+            WHERE rut_estudiante NOT IN ({placeholders})
+        """
+
+        cursor.execute(query, tuple(sorted(ruts_in_report)))
+        logger.info("✓ Deuda reseteada a 0 para %d estudiante(s) no en el reporte", cursor.rowcount)
+
+    def _accumulate_summary(self, df: pd.DataFrame, columnas: dict):
+        """Suma al resumen de morosidad los montos del chunk"""
+        saldo = columnas["estudiante"]["deuda"]
+        reporte = columnas["reporte_financiero"]
+        cuotas = pd.to_numeric(df['Cantidad Cuotas Pendientes Colegiaturas'], errors='coerce').fillna(0).astype(int)
+        cuotas_mayores_cero = cuotas[cuotas > 0]
+
+        self._acumulado["estudiantes"] += len(df)
+        self._acumulado["con_deuda"] += int((saldo > 0).sum())
+        self._acumulado["saldo"] += int(saldo.sum())
+        self._acumulado["compromisos"] += int(reporte["monto_compromiso_matricula"].sum() + reporte["monto_compromiso_colegiaturas"].sum())
+        self._acumulado["cuotas_mayores_cero"] += len(cuotas_mayores_cero)
+        self._acumulado["suma_cuotas_mayores_cero"] += int(cuotas_mayores_cero.sum())
 
     def _convert_periodo(self, periodo_str: str) -> str:
         periodo = re.search(self.patron_año, periodo_str)
@@ -102,34 +153,17 @@ class ReporteMorosidadReader(Reader):
         Calcula métricas resumidas de morosidad y las inserta en la tabla Resumen_reporte_morosidad
         """
         try:
-            # Convertir Total Saldo a numérico para cálculos
-            self.df['Total_Saldo_num'] = self.df['Total Saldo'].apply(
-                lambda x: int(str(x).replace('$', '').replace(',', '')) if x and str(x) != '$0' else 0
-            )
-            
-            # Convertir compromisos a numéricos
-            self.df['Monto_Compromiso_Matricula_num'] = self.df['Monto Compromiso Matricula'].apply(
-                lambda x: int(str(x).replace('$', '').replace(',', '')) if x and str(x) != '$0' else 0
-            )
-            
-            self.df['Monto_Compromiso_Colegiaturas_num'] = self.df['Monto Compromisos Colegiaturas'].apply(
-                lambda x: int(str(x).replace('$', '').replace(',', '')) if x and str(x) != '$0' else 0
-            )
-            
-            # Convertir cuotas Colegiaturas a numérico para promedio
-            self.df['Cuotas_Colegiaturas_num'] = pd.to_numeric(self.df['Cantidad Cuotas Pendientes Colegiaturas'], errors='coerce').fillna(0).astype(int)
-            
-            # Calcular métricas
-            numero_estudiantes_total = int(len(self.df))
-            numero_estudiantes_con_deuda = int((self.df['Total_Saldo_num'] > 0).sum())
+            # Calcular métricas a partir de los acumulados por chunk
+            numero_estudiantes_total = self._acumulado["estudiantes"]
+            numero_estudiantes_con_deuda = self._acumulado["con_deuda"]
             porcentaje_con_deuda = float((numero_estudiantes_con_deuda / numero_estudiantes_total * 100) if numero_estudiantes_total > 0 else 0)
             
-            monto_total_adeudado = int(self.df['Total_Saldo_num'].sum())
-            monto_total_compromisos = int(self.df['Monto_Compromiso_Matricula_num'].sum() + self.df['Monto_Compromiso_Colegiaturas_num'].sum())
+            monto_total_adeudado = self._acumulado["saldo"]
+            monto_total_compromisos = self._acumulado["compromisos"]
             
             # Promedio de cuotas pendientes (solo mayores que 0)
-            cuotas_mayores_cero = self.df[self.df['Cuotas_Colegiaturas_num'] > 0]['Cuotas_Colegiaturas_num']
-            promedio_cuotas = float(cuotas_mayores_cero.mean()) if len(cuotas_mayores_cero) > 0 else 0.0
+            cuotas_mayores_cero = self._acumulado["cuotas_mayores_cero"]
+            promedio_cuotas = float(self._acumulado["suma_cuotas_mayores_cero"] / cuotas_mayores_cero) if cuotas_mayores_cero > 0 else 0.0
             
             # Porcentaje de morosidad
             porcentaje_morosidad = float((monto_total_adeudado / monto_total_compromisos * 100) if monto_total_compromisos > 0 else 0)
@@ -166,7 +200,7 @@ class ReporteMorosidadReader(Reader):
                 round(porcentaje_morosidad, 2)
             ))
             
-            self.db_connection.connection.commit()
+            self.db_connection.commit()
             
             # Guardar métricas para acceso posterior
             self.metricas_morosidad = {
@@ -181,5 +215,5 @@ class ReporteMorosidadReader(Reader):
             }
             
         except Exception as e:
-            print(f"✗ Error al calcular resumen de morosidad: {str(e)}")
+            logger.error("✗ Error al calcular resumen de morosidad: %s", e)
             raise
@@ -1,96 +1,67 @@
 import pandas as pd
-from classes.readers.reader import Reader
-from datetime import datetime
+from classes.readers.excel_reader.csv_reader import CSVReader
 
 
-class SituacionAcademicaReader(Reader):
-    
-    def __init__(self, file_path: str, db_connection):
-        self.file_path = file_path
-        self.db_connection = db_connection
-        self.df = pd.read_csv(self.file_path, delimiter=';', skiprows=5, encoding='utf-8')
+class SituacionAcademicaReader(CSVReader):
 
-    def get_total_rows(self) -> int:
-        """Retorna el número de filas del DataFrame"""
-        return len(self.df)
+    def _transform(self, df: pd.DataFrame) -> dict:
+        """Convierte el chunk en columnas tipadas, una tabla por clave"""
+        interrupcion_pendiente = df['SOLICITUD INTERRUPCION PENDIENTE']
+        tutor = df['TUTOR']
 
-    def _process_and_upsert(self, progress_callback=None):
-        cursor = self.db_connection.cursor()
-        
-        # Función auxiliar para convertir a int de forma segura
-        def safe_int(value):
-            if not value or str(value).strip() == '' or str(value).lower() == 'nan':
-                return 0
-            try:
-                return int(float(str(value).strip()))
-            except (ValueError, TypeError):
-                return 0
-        
-        # Función auxiliar para convertir fechas de DD-MM-YYYY a YYYY-MM-DD
-        def convert_date(date_str):
-            if not date_str or str(date_str).strip() == '' or str(date_str).lower() == 'nan':
-                return None
-            try:
-                # Intenta convertir desde DD-MM-YYYY a YYYY-MM-DD
-                date_obj = datetime.strptime(str(date_str).strip(), '%d-%m-%Y')
-                return date_obj.strftime('%Y-%m-%d')
-            except (ValueError, TypeError):
-                return None
-        
+        return {
+            "estudiante": {
+                "secciones_curriculares": self._int_column(df['SECCIONES CURRICULARES']),
+                "secciones_online": self._int_column(df['SECCIONES ONLINE']),
+                "asistencia_promedio": self._int_column(df['ASISTENCIA PROMEDIO']),
+                "nombre": df['NOMBRE'],
+                "programa_estudio": df['PROGRAMA'],
+                "nombre_apoderado": tutor.where(tutor.astype(str).str.strip().ne('')),
+                "terminal": self._flag_column(df['ALUMNO TERMINAL'], "SI"),
+                "tiene_gratuidad": self._flag_column(df['TIENE GRATUIDAD'], "SI"),
+                "solicitud_interrupcion_estudios": self._flag_column(interrupcion_pendiente, "NO"),
+                "solicitud_interrupcion_estudio_pendiente": self._flag_column(interrupcion_pendiente, "SI"),
+                "interrupcion_estudio_pendiente": self._flag_column(df['INTERRUPCION ESTUDIO ANTERIOR'], "SI"),
+                "beca_stem": self._flag_column(df['BECA STEM'], "SI"),
+                "tipo_alumno": df['TIPO ALUMNO SIES'],
+                "estado_matricula": df['ESTADO MATRICULA'],
+                "ultima_asistencia": self._date_column(df['ULTIMA ASISTENCIA']),
+            },
+            "estudiante_semestre": {
+                "asignaturas_PE": self._int_column(df['ASIGNATURAS PE'], strict=False),
+                "asignaturas_reprobadas_cuatro_veces": self._int_column(df['ASIGNATURAS REPROBADAS CUARTA'], strict=False),
+                "asignaturas_reprobadas_tres_veces": self._int_column(df['ASIGNATURAS REPROBADAS TERCERA'], strict=False),
+                "solicitud_reingreso": self._flag_column(df['SOLICITUD REINTEGRO'], "SI"),
+            },
+        }
+
+    def _upsert_chunk(self, cursor, df: pd.DataFrame, progress_callback=None):
         try:
-            for index, row in self.df.iterrows():
-                try:
-                    if progress_callback:
-                        progress_callback(index + 1)
-                    
-                    # Convertir RUT y DV a string para concatenación
-                    rut_estudiante = str(row['RUT']).replace('.', '').strip() + '-' + str(row['DV']).strip()
-                    periodo = self._normalize_periodo(row['PERIODO'])
+            columnas = self._transform(df)
+            # Convertir RUT y DV a string para concatenación
+            ruts = (
+                df['RUT'].astype(str).str.replace('.', '', regex=False).str.strip()
+                + '-' + df['DV'].astype(str).str.strip()
+            ).tolist()
+            periodos = self._normalize_periodos(df['PERIODO'])
+        except KeyError as e:
+            raise ValueError(f"Columna requerida no encontrada en el archivo: {str(e)}")
+
+        # Un INSERT por los semestres distintos del chunk, antes de sus filas
+        # (Estudiante_Semestre tiene FK a Semestre)
+        self._register_semestres(cursor, periodos)
 
-                    datos_estudiante = {
-                        "rut": rut_estudiante,
-                        "secciones_curriculares": int(row['SECCIONES CURRICULARES']) if row['SECCIONES CURRICULARES'] and str(row['SECCIONES CURRICULARES']).strip() != '' and str(row['SECCIONES CURRICULARES']).lower() != 'nan' else None,
-                        "secciones_online": int(row['SECCIONES ONLINE']) if row['SECCIONES ONLINE'] and str(row['SECCIONES ONLINE']).strip() != '' and str(row['SECCIONES ONLINE']).lower() != 'nan' else None,
-                        "asistencia_promedio": int(row['ASISTENCIA PROMEDIO']) if row['ASISTENCIA PROMEDIO'] and str(row['ASISTENCIA PROMEDIO']).strip() != '' and str(row['ASISTENCIA PROMEDIO']).lower() != 'nan' else None,
-                        "nombre": row['NOMBRE'],
-                        "programa_estudio": row['PROGRAMA'],
-                        "nombre_apoderado": row['TUTOR'] if row['TUTOR'] and str(row['TUTOR']).strip() else None,
-                        "terminal": True if row['ALUMNO TERMINAL'] == "SI" else False,
-                        "tiene_gratuidad": True if row['TIENE GRATUIDAD'] == "SI" else False,
-                        "solicitud_interrupcion_estudios": True if row['SOLICITUD INTERRUPCION PENDIENTE'] == "NO" else False,
-                        "solicitud_interrupcion_estudio_pendiente": True if row['SOLICITUD INTERRUPCION PENDIENTE'] == "SI" else False,
-                        "interrupcion_estudio_pendiente": True if row['INTERRUPCION ESTUDIO ANTERIOR'] == "SI" else False,
-                        "beca_stem": True if row['BECA STEM'] == "SI" else False,
-                        "tipo_alumno": row['TIPO ALUMNO SIES'],
-                        "estado_matricula": row['ESTADO MATRICULA'],
-                        "promedio_media_matematica": None,
-                        "promedio_media_lenguaje": None,
-                        "promedio_media_ingles": None,
-                        "ultima_asistencia": convert_date(row['ULTIMA ASISTENCIA']),
-                    }
-                    
-                    datos_estudiante_semestre = {
-                        "rut_estudiante": rut_estudiante,
-                        "periodo_semestre": periodo,
-                        "asignaturas_PE": safe_int(row['ASIGNATURAS PE']) or None,
-                        "asignaturas_reprobadas_cuatro_veces": safe_int(row['ASIGNATURAS REPROBADAS CUARTA']) or None,
-                        "asignaturas_reprobadas_tres_veces": safe_int(row['ASIGNATURAS REPROBADAS TERCERA']) or None,
-                        "solicitud_reingreso": True if row['SOLICITUD REINTEGRO'] == "SI" else False,
-                    }
+        total = len(df)
+        filas = zip(
+            ruts,
+            periodos,
+            self._table_rows("Estudiante", columnas["estudiante"], total),
+            self._table_rows("Estudiante_Semestre", columnas["estudiante_semestre"], total),
+        )
 
-                    if self._estudiante_exists(cursor, rut_estudiante):
-                        self._update_estudiante(cursor, rut_estudiante, datos_estudiante)
-                    else:
-                        self._insert_estudiante(cursor, rut_estudiante, datos_estudiante)
+        for index, (rut_estudiante, periodo, estudiante, estudiante_semestre) in zip(df.index, filas):
+            if progress_callback:
+                progress_callback(index + 1)
 
-                    if self._estudiante_semestre_exists(cursor, rut_estudiante, periodo):
-                        self._update_estudiante_semestre(cursor, rut_estudiante, periodo, datos_estudiante_semestre)
-                    else:
-                        self._insert_estudiante_semestre(cursor, rut_estudiante, periodo, datos_estudiante_semestre)
-                
-                except (ValueError, KeyError, TypeError) as e:
-                    fila_num = index + 6  # +6 porque skiprows=5
-                    raise ValueError(f"Error en fila {fila_num} (índice {index}): {str(e)}\nDatos de la fila: {dict(row)}")
-        
-        finally:
-            cursor.close()
+            self._queue_upsert_values(cursor, "Estudiante", (rut_estudiante,), estudiante)
+            self._queue_upsert_values(cursor, "Estudiante_Semestre", (rut_estudiante, periodo), estudiante_semestre)
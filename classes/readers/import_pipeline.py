@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from mysql.connector import Error
+from factories.readers_factory import ReadersFactory
+from classes.readers.import_report import ImportReport
+
+logger = logging.getLogger(__name__)
+
+# Reintentos cuando MySQL aborta una escritura concurrente por deadlock (errno 1213)
+DEADLOCK_RETRIES = 3
+
+
+class ImportCancelled(Exception):
+    """El usuario canceló la carga"""
+
+
+def _stage_file(file_type: str, file_path: str):
+    """Lee y transforma un archivo dentro de un proceso del pool (sin conexión a BD)"""
+    reader = ReadersFactory.create_reader(file_type, file_path, None)
+    reader.stage()
+    return reader
+
+
+def _es_error_critico(error: Exception) -> bool:
+    error_str = str(error)
+    return "ERROR CRÍTICO" in error_str or "doesn't exist" in error_str
+
+
+class ImportPipeline:
+    """
+    Carga varios archivos en dos etapas:
+      1. Lectura y transformación en paralelo (ProcessPoolExecutor).
+      2. Escritura en MySQL con varios hilos, cada uno con su conexión del pool.
+
+    Los archivos se escriben en el orden en que fueron seleccionados: uno
+    solo empieza a escribir cuando terminaron los anteriores con los que
+    comparte alguna clave, por lo que el resultado es el mismo que cargarlos
+    uno por uno. Los readers con EXCLUSIVE_WRITE se escriben solos, sobre la
+    conexión principal.
+    """
+
+    def __init__(self, file_type: str, files, db_connection, max_workers: int = None, cancel_event=None):
+        self.file_type = file_type
+        self.files = list(files)
+        self.db_connection = db_connection
+        self.max_workers = max_workers or max(1, min(len(self.files), os.cpu_count() or 1))
+        # La conexión principal se reserva para la GUI y los readers exclusivos
+        self.max_writers = max(1, getattr(db_connection, 'pool_size', 2) - 1)
+        self.cancel_event = cancel_event
+        # Métricas combinadas de los archivos escritos
+        self.report = ImportReport(file_type)
+        self._done = 0
+        self._done_lock = threading.Lock()
+
+    def run(self, before_write=None, after_write=None, on_progress=None) -> list:
+        """
+        Procesa los archivos y retorna [(file_path, error)] en el orden de
+        selección; error es None si el archivo se cargó. Un error crítico
+        detiene la carga y los archivos restantes no se reportan.
+
+        before_write(reader): se ejecuta antes de escribir cada archivo.
+        after_write(reader): se ejecuta tras confirmar cada archivo.
+        on_progress(archivos_terminados): se llama desde cualquier hilo.
+        """
+        results = {}
+        running = {}
+        stop = False
+
+        def file_done():
+            if on_progress:
+                with self._done_lock:
+                    self._done += 1
+                    done = self._done
+                on_progress(done)
+
+        def collect(futures):
+            nonlocal stop
+            for future in futures:
+                file_path, _ = running.pop(future)
+                error = future.exception()
+                results[file_path] = error
+                if error is not None and _es_error_critico(error):
+                    stop = True
+
+        parsers = ProcessPoolExecutor(max_workers=self.max_workers)
+        writers = ThreadPoolExecutor(max_workers=self.max_writers)
+        try:
+            staged = [parsers.submit(_stage_file, self.file_type, path) for path in self.files]
+
+            for file_path, future in zip(self.files, staged):
+                if self._cancelled():
+                    future.cancel()
+                    results[file_path] = ImportCancelled("Carga cancelada por el usuario")
+                    file_done()
+                    continue
+
+                try:
+                    reader = future.result()
+                except Exception as e:
+                    results[file_path] = e
+                    file_done()
+                    continue
+
+                # Esperar las escrituras anteriores que comparten claves con este archivo
+                keys = None if reader.EXCLUSIVE_WRITE else reader.staged_keys()
+                blockers = [
+                    f for f, (_, other) in running.items()
+                    if keys is None or other is None or not keys.isdisjoint(other)
+                ]
+                wait(blockers)
+                collect([f for f in list(running) if f.done()])
+
+                if stop:
+                    break
+                if self._cancelled():
+                    results[file_path] = ImportCancelled("Carga cancelada por el usuario")
+                    file_done()
+                    continue
+
+                write = writers.submit(self._write, reader, after_write, before_write)
+                write.add_done_callback(lambda _: file_done())
+                running[write] = (file_path, keys)
+
+            wait(list(running))
+            collect(list(running))
+        finally:
+            parsers.shutdown(wait=True, cancel_futures=True)
+            writers.shutdown(wait=True)
+
+        return [(path, results[path]) for path in self.files if path in results]
+
+    def _cancelled(self) -> bool:
+        return bool(self.cancel_event and self.cancel_event.is_set())
+
+    def _write(self, reader, after_write=None, before_write=None):
+        reader.db_connection = self.db_connection
+        name = os.path.basename(reader.file_path)
+        if before_write:
+            before_write(reader)
+
+        if reader.EXCLUSIVE_WRITE:
+            # Misma conexión y commit/rollback que la carga secuencial
+            cursor = self.db_connection.cursor()
+            try:
+                reader.write_staged(cursor)
+                with reader.report.stage("commit"):
+                    self.db_connection.commit()
+            except Exception:
+                try:
+                    self.db_connection.rollback()
+                except:
+                    pass
+                raise
+            finally:
+                cursor.close()
+        else:
+            for intento in range(1, DEADLOCK_RETRIES + 1):
+                try:
+                    with self.db_connection.transaction() as connection:
+                        cursor = connection.cursor()
+                        try:
+                            reader.write_staged(cursor)
+                        finally:
+                            cursor.close()
+                        with reader.report.stage("commit"):
+                            connection.commit()
+                    break
+                except Error as e:
+                    # Error 1213 es "Deadlock found"; la transacción ya se deshizo
+                    if e.errno != 1213 or intento == DEADLOCK_RETRIES:
+                        raise
+                    logger.warning("→ Deadlock al escribir %s, reintentando (%d/%d)", name, intento, DEADLOCK_RETRIES)
+
+        logger.info("✓ %s cargado", name)
+        reader.log_summary()
+        with self._done_lock:
+            self.report.merge(reader.report)
+        if after_write:
+            after_write(reader)
@@ -0,0 +1,112 @@
+import json
+import time
+from contextlib import contextmanager
+
+
+class ImportReport:
+    """
+    Métricas de una carga: tiempo por etapa, consultas por tipo de sentencia,
+    filas procesadas y filas por segundo.
+
+    Las etapas se miden con tiempo propio: si una etapa se abre dentro de otra
+    (p. ej. 'escritura' durante 'transformacion', por el auto-flush de los
+    lotes), su duración se descuenta de la etapa externa. Así la suma de las
+    etapas no cuenta dos veces el mismo tiempo.
+
+    Cada reader tiene su propio reporte; la GUI los combina con merge().
+    """
+
+    def __init__(self, nombre: str = None, files: int = 0):
+        self.nombre = nombre
+        # {etapa: segundos}
+        self.stages = {}
+        # {tipo de sentencia: {'count': n, 'seconds': s, 'max_seconds': s}}
+        self.queries = {}
+        self.rows = 0
+        self.files = files
+        self.seconds = None
+        self._started = time.perf_counter()
+        # Etapas abiertas: [nombre, inicio, segundos de etapas internas]
+        self._stack = []
+
+    @contextmanager
+    def stage(self, name: str):
+        inicio = time.perf_counter()
+        self._stack.append([name, inicio, 0.0])
+        try:
+            yield
+        finally:
+            _, _, internas = self._stack.pop()
+            duracion = time.perf_counter() - inicio
+            self.stages[name] = self.stages.get(name, 0.0) + duracion - internas
+            if self._stack:
+                self._stack[-1][2] += duracion
+
+    @contextmanager
+    def query(self, kind: str):
+        """Cuenta y cronometra una sentencia (ej: 'INSERT Estudiante')"""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record_query(kind, 1, time.perf_counter() - inicio)
+
+    def _record_query(self, kind: str, count: int, seconds: float, max_seconds: float = None):
+        stats = self.queries.setdefault(kind, {"count": 0, "seconds": 0.0, "max_seconds": 0.0})
+        stats["count"] += count
+        stats["seconds"] += seconds
+        stats["max_seconds"] = max(stats["max_seconds"], seconds if max_seconds is None else max_seconds)
+
+    def merge(self, other: "ImportReport"):
+        """Suma las métricas de otro reporte (ej: el de cada archivo)"""
+        for name, seconds in other.stages.items():
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+        for kind, stats in other.queries.items():
+            self._record_query(kind, stats["count"], stats["seconds"], stats["max_seconds"])
+        self.rows += other.rows
+        self.files += other.files
+
+    def finish(self):
+        """Fija la duración total (desde la creación del reporte)"""
+        self.seconds = time.perf_counter() - self._started
+        return self
+
+    @property
+    def rows_per_second(self) -> float:
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self._started
+        return self.rows / seconds if seconds > 0 else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "nombre": self.nombre,
+            "archivos": self.files,
+            "filas": self.rows,
+            "segundos": round(self.seconds, 4) if self.seconds is not None else None,
+            "filas_por_segundo": round(self.rows_per_second, 1),
+            "etapas": {name: round(seconds, 4) for name, seconds in self.stages.items()},
+            "consultas": {
+                kind: {
+                    "count": stats["count"],
+                    "seconds": round(stats["seconds"], 4),
+                    "avg_ms": round(stats["seconds"] * 1000 / stats["count"], 2) if stats["count"] else 0.0,
+                    "max_ms": round(stats["max_seconds"] * 1000, 2),
+                }
+                for kind, stats in sorted(self.queries.items())
+            },
+        }
+
+    def dump_json(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, indent=2)
+
+    def summary_lines(self) -> list:
+        """Resumen legible para la consola y la GUI"""
+        seconds = self.seconds if self.seconds is not None else time.perf_counter() - self._started
+        lines = [f"Filas: {self.rows} en {seconds:.2f}s ({self.rows_per_second:.0f} filas/s)"]
+        for name, stage_seconds in sorted(self.stages.items(), key=lambda item: -item[1]):
+            lines.append(f"  {name}: {stage_seconds:.2f}s")
+        total_queries = sum(stats["count"] for stats in self.queries.values())
+        if total_queries:
+            query_seconds = sum(stats["seconds"] for stats in self.queries.values())
+            lines.append(f"Consultas: {total_queries} ({query_seconds:.2f}s)")
+        return lines
@@ -3,8 +3,8 @@ from classes.readers.pdf_reader.pdf_reader import PDFReader
 
 
 class CertificadoDeConcentracionReader(PDFReader):
-    def __init__(self, file_path: str, db_connection):
-        super().__init__(file_path, db_connection)
+    def __init__(self, file_path: str, db_connection, text: str = None, content_hash: str = None):
+        super().__init__(file_path, db_connection, text, content_hash)
 
         self.nombre_estudiante = ""
         self.rut_estudiante = ""
@@ -27,7 +27,7 @@ class CertificadoDeConcentracionReader(PDFReader):
             ],
         }
 
-    def _process_and_upsert(self, progress_callback=None):
+    def _parse_certificate(self) -> dict:
         text = self.extract_text()
         lines = [line.strip() for line in text.splitlines() if line.strip()]
 
@@ -96,18 +96,7 @@ class CertificadoDeConcentracionReader(PDFReader):
             "promedio_media_lenguaje": promedio_leng,
             "promedio_media_ingles": promedio_ing,
         }
-
-        cursor = self.db_connection.cursor()
-        try:
-            if self._estudiante_exists(cursor, self.rut_estudiante):
-                self._update_estudiante(cursor, self.rut_estudiante, datos_estudiante)
-            else:
-                self._insert_estudiante(cursor, self.rut_estudiante, datos_estudiante)
-
-            if progress_callback:
-                progress_callback(1)
-        finally:
-            cursor.close()
+        return datos_estudiante
 
     def _categorizar_asignatura(self, asignatura: str):
         if not asignatura:
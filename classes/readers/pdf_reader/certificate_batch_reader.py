@@ -0,0 +1,71 @@
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from classes.readers.reader import Reader
+from factories.readers_factory import ReadersFactory
+
+logger = logging.getLogger(__name__)
+
+
+def _parse_certificate_file(file_path: str) -> dict:
+    """Extrae (una vez) y parsea un certificado dentro de un proceso del pool"""
+    reader = ReadersFactory.create_reader('certificado_pdf', file_path, None)
+    return reader._read_certificate()
+
+
+class CertificateBatchReader(Reader):
+    """
+    Carga una carpeta de certificados PDF. La extracción de texto (lo más
+    lento, pdfminer) corre en un ProcessPoolExecutor y los datos de todos
+    los estudiantes se escriben juntos en un upsert masivo de Estudiante.
+    Los certificados que no se pueden leer quedan en errores_por_archivo
+    y no impiden cargar el resto.
+    """
+
+    def __init__(self, file_paths, db_connection, max_workers: int = None):
+        super().__init__(None, db_connection)
+        self.file_paths = list(file_paths)
+        self.max_workers = max_workers or max(1, min(len(self.file_paths), os.cpu_count() or 1))
+        # {ruta: excepción} de los certificados que no se pudieron leer
+        self.errores_por_archivo = {}
+        self.report.files = len(self.file_paths)
+
+    def get_total_rows(self) -> int:
+        """Un estudiante por certificado"""
+        return len(self.file_paths)
+
+    def _process_and_upsert(self, progress_callback=None):
+        cursor = self.db_connection.cursor()
+        try:
+            self._queue_certificates(cursor, progress_callback)
+            self._flush_batches(cursor)
+        finally:
+            cursor.close()
+
+    def _stage_rows(self):
+        self._queue_certificates(None)
+
+    def _queue_certificates(self, cursor, progress_callback=None):
+        """Extrae y parsea los certificados en el pool y encola sus estudiantes"""
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            futures = [executor.submit(_parse_certificate_file, path) for path in self.file_paths]
+
+            # Se recorren en el orden de selección: si dos certificados son del
+            # mismo RUT, el último seleccionado prevalece (igual que uno por uno)
+            for procesados, (file_path, future) in enumerate(zip(self.file_paths, futures), 1):
+                try:
+                    # Espera a la extracción y el parseo en el pool
+                    with self.report.stage("lectura"):
+                        datos_estudiante = future.result()
+                except Exception as e:
+                    self.errores_por_archivo[file_path] = e
+                    logger.error("✗ %s: %s", os.path.basename(file_path), e)
+                else:
+                    self.report.rows += 1
+                    self._upsert_estudiante(cursor, datos_estudiante["rut"], datos_estudiante)
+
+                if progress_callback:
+                    progress_callback(procesados)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
@@ -1,17 +1,36 @@
+from abc import abstractmethod
 from pdfminer.high_level import extract_text
 from classes.readers.reader import Reader
+from utils.pdf_cache import PDFCache, get_pdf_cache
 
 
 class PDFReader(Reader):
-    def __init__(self, file_path, db_connection):
+    def __init__(self, file_path, db_connection, text: str = None, content_hash: str = None):
         super().__init__(file_path, db_connection)
+        # Texto ya extraído (p. ej. por la factory al detectar el tipo de certificado)
+        self._text = text
+        # Hash del contenido del PDF, clave de la caché en disco
+        self._content_hash = content_hash
 
     def get_total_rows(self) -> int:
         """Retorna 1 porque cada PDF contiene un estudiante"""
         return 1
 
+    def _get_content_hash(self) -> str:
+        if self._content_hash is None:
+            self._content_hash = PDFCache.file_hash(self.file_path)
+        return self._content_hash
+
     def extract_text(self) -> str:
-        return extract_text(self.file_path)
+        if self._text is None:
+            cache = get_pdf_cache()
+            digest = self._get_content_hash()
+            self._text = cache.get_text(digest)
+            if self._text is None:
+                with self.report.stage("lectura"):
+                    self._text = extract_text(self.file_path)
+                cache.put(digest, text=self._text)
+        return self._text
 
     def _identify_certificate_type(self, text: str) -> str:
         text_upper = text.upper()
@@ -26,5 +45,38 @@ class PDFReader(Reader):
             return rut
         return rut.replace(".", "").strip()
 
+    @abstractmethod
+    def _parse_certificate(self) -> dict:
+        """Retorna los datos del estudiante (incluye 'rut') leídos del certificado"""
+        pass
+
+    def _read_certificate(self) -> dict:
+        """Como _parse_certificate, pero usa la caché si el mismo PDF ya se procesó"""
+        cache = get_pdf_cache()
+        digest = self._get_content_hash()
+        reader_name = type(self).__name__
+
+        with self.report.stage("transformacion"):
+            datos_estudiante = cache.get_parsed(digest, reader_name)
+            if datos_estudiante is None:
+                datos_estudiante = self._parse_certificate()
+                cache.put(digest, reader_name=reader_name, parsed=datos_estudiante)
+        self.report.rows += 1
+        return datos_estudiante
+
     def _process_and_upsert(self, progress_callback=None):
-        raise NotImplementedError("Debe implementar _process_and_upsert en el reader específico")
\ No newline at end of file
+        datos_estudiante = self._read_certificate()
+
+        cursor = self.db_connection.cursor()
+        try:
+            self._upsert_estudiante(cursor, datos_estudiante["rut"], datos_estudiante)
+            self._flush_batches(cursor)
+
+            if progress_callback:
+                progress_callback(1)
+        finally:
+            cursor.close()
+
+    def _stage_rows(self):
+        datos_estudiante = self._read_certificate()
+        self._upsert_estudiante(None, datos_estudiante["rut"], datos_estudiante)
\ No newline at end of file
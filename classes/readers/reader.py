@@ -1,13 +1,100 @@
 from abc import ABC, abstractmethod
+import logging
+import os
 import pandas as pd
 from mysql.connector import Error
-import re
+from classes.readers.import_report import ImportReport
+from utils.periodo import normalize_periodo, periodo_key
+from utils.schema_catalog import schema_catalog, table_key
+
+logger = logging.getLogger(__name__)
+
+# Filas por sentencia INSERT multi-fila (acota el tamaño del paquete enviado a MySQL)
+BULK_BATCH_SIZE = 500
+
+# Tablas del upsert masivo: (columnas clave, columnas de datos).
+# El orden del diccionario es el orden de escritura, respetando las FK.
+UPSERT_TABLES = {
+    "Estudiante": (
+        ("rut",),
+        (
+            "nombre", "programa_estudio", "nombre_apoderado", "terminal",
+            "tiene_gratuidad", "solicitud_interrupcion_estudios",
+            "solicitud_interrupcion_estudio_pendiente", "interrupcion_estudio_pendiente",
+            "beca_stem", "tipo_alumno", "estado_matricula", "secciones_curriculares",
+            "secciones_online", "asistencia_promedio", "promedio_media_matematica",
+            "promedio_media_lenguaje", "promedio_media_ingles", "ultima_asistencia", "deuda",
+        ),
+    ),
+    "Asignatura": (
+        ("codigo_asignatura",),
+        (
+            "nombre", "programa", "area", "COD_mencion", "mencion", "plan",
+            "modalidad", "nivel", "prerequisito_semestre_siguiente", "ultimo_nivel",
+        ),
+    ),
+    "Asignatura_semestre": (
+        ("codigo_asignatura", "periodo_semestre"),
+        (
+            "secciones", "alumnos", "alumnos_en_riesgo", "alumnos_ayudantia",
+            "porcentaje_reprobacion_N1", "porcentaje_reprobacion_N2",
+            "porcentaje_reprobacion_N3", "promedio_nota_uno", "promedio_nota_dos",
+            "promedio_nota_tres", "ayudantia_virtual", "ayudantia_sede",
+        ),
+    ),
+    "Estudiante_Semestre": (
+        ("rut_estudiante", "periodo_semestre"),
+        (
+            "asignaturas_PE", "asignaturas_reprobadas_cuatro_veces",
+            "asignaturas_reprobadas_tres_veces", "solicitud_reingreso",
+        ),
+    ),
+    "Estudiante_Asignatura": (
+        ("rut_estudiante", "codigo_asignatura", "periodo_semestre"),
+        ("nombre_docente", "notas_parciales", "porcentaje_asistencia", "riesgo"),
+    ),
+    "Reporte_financiero_estudiante": (
+        ("rut_estudiante",),
+        (
+            "cantidad_cuotas_pendientes_matriculas", "cantidad_cuotas_pendientes_colegiaturas",
+            "deuda_matriculas", "deuda_colegiaturas", "otras_deudas", "deuda_total",
+            "monto_compromiso_matricula", "monto_compromiso_colegiaturas",
+        ),
+    ),
+}
+
 
 class Reader(ABC):
+
+    # Diferencia entre el índice del DataFrame y la fila del archivo (para mensajes de error)
+    FILA_OFFSET = 1
+
+    # True si la escritura afecta filas fuera de las claves del archivo
+    # (no puede correr en paralelo con otras cargas)
+    EXCLUSIVE_WRITE = False
     
     def __init__(self, file_path: str, db_connection):
         self.file_path = file_path
         self.db_connection = db_connection
+        # Lotes pendientes por tabla: {tabla: {claves: [valores]}}
+        self._batches = {}
+        # Tiempos por etapa, consultas y filas de la carga de este archivo
+        self.report = ImportReport(os.path.basename(file_path) if file_path else type(self).__name__, files=1)
+        # En modo staging se lee y transforma sin tocar la BD (ver stage())
+        self._staging = False
+        self._semestres_pendientes = {}
+        # {periodo normalizado: periodo_key}
+        self._periodo_keys = {}
+        # Semestres registrados por este reader (si la conexión no lleva la cuenta)
+        self._semestres_registrados = set()
+        # Resumen de la carga: {tabla: {'filas': enviadas, 'afectadas': filas afectadas según MySQL}}
+        self.resumen_tablas = {}
+        # {tabla: columnas en minúsculas} del catálogo del esquema (se lee al escribir)
+        self._schema = None
+        # {tabla: [columnas de cada índice único]} del mismo catálogo
+        self._unique_keys = {}
+        # Tablas cuyas columnas ya se verificaron contra el esquema
+        self._tablas_verificadas = set()
     
     @abstractmethod
     def _process_and_upsert(self):
@@ -18,483 +105,352 @@ class Reader(ABC):
         """Retorna el número total de filas/registros a procesar"""
         pass
 
-    def _normalize_periodo(self, periodo_str: str) -> str:
+    # --- STAGING (lectura separada de la escritura) ---
+
+    def stage(self):
         """
-        Normaliza el formato del período a: YYYY-primavera o YYYY-otoño
-        Convierte desde:
-        - "PRIMAVERA 2025" → "2025-primavera"
-        - "OTOÑO 2025" → "2025-otoño"
-        - "2025 Primavera" → "2025-primavera"
-        - "2025 Otoño" → "2025-otoño"
-        - "2025-primavera" → "2025-primavera" (ya normalizado)
-        - "2025-otoño" → "2025-otoño" (ya normalizado)
+        Lee y transforma el archivo completo sin usar la base de datos.
+        Las filas quedan en los lotes en memoria hasta llamar a write_staged().
+        Puede ejecutarse en otro proceso (el reader se crea con db_connection=None).
         """
-        periodo_str = str(periodo_str).strip()
-        
-        # Si ya está en formato normalizado, retornar directamente
-        if re.match(r'\d{4}-(primavera|otoño)', periodo_str.lower()):
-            return periodo_str.lower()
-        
-        periodo_upper = periodo_str.upper()
-        
-        # Patrón 1: "PALABRA YYYY" (ej: "PRIMAVERA 2025", "OTOÑO 2025")
-        match = re.match(r'(PRIMAVERA|OTOÑO)\s+(\d{4})', periodo_upper)
-        if match:
-            estacion = match.group(1).lower()
-            año = match.group(2)
-            return f"{año}-{estacion}"
-        
-        # Patrón 2: "YYYY PALABRA" (ej: "2025 Primavera", "2025 Otoño")
-        match = re.match(r'(\d{4})\s+(PRIMAVERA|OTOÑO)', periodo_upper)
-        if match:
-            año = match.group(1)
-            estacion = match.group(2).lower()
-            return f"{año}-{estacion}"
-        
-        # Si no coincide ningún patrón, retornar como está
-        return periodo_str.lower()
-
-    def _estudiante_exists(self, cursor, rut):
-        try:
-            cursor = self.db_connection.cursor()
-            query = "SELECT COUNT(*) FROM Estudiante WHERE rut = %s"
-            cursor.execute(query, (rut,))
-            result = cursor.fetchone()[0] > 0
-            cursor.close()
-            return result
-        except Error as e:
-            # Error 1146 es "Table doesn't exist"
-            if e.errno == 1146:
-                raise Exception(f"ERROR CRÍTICO: Tabla no existe. {str(e)}")
-            print(f"✗ Error al verificar estudiante: {str(e)}")
-            raise
-        
-    def _asignatura_exists(self, codigo):
-        try:
-            cursor = self.db_connection.cursor()
-            query = "SELECT COUNT(*) FROM Asignatura WHERE codigo_asignatura = %s"
-            cursor.execute(query, (codigo,))
-            result = cursor.fetchone()[0] > 0
-            cursor.close()
-            return result
-        except Error as e:
-            # Error 1146 es "Table doesn't exist"
-            if e.errno == 1146:
-                raise Exception(f"ERROR CRÍTICO: Tabla no existe. {str(e)}")
-            print(f"✗ Error al verificar asignatura: {str(e)}")
-            raise
-        
-    def _asignatura_semestre_exists(self, cursor, codigo, periodo):
+        self._staging = True
         try:
-            query = "SELECT COUNT(*) FROM Asignatura_semestre WHERE codigo_asignatura = %s AND periodo_semestre = %s"
-            cursor.execute(query, (codigo, periodo))
-            result = cursor.fetchone()[0] > 0
-            return result
-        except Error as e:
-            # Error 1146 es "Table doesn't exist"
-            if e.errno == 1146:
-                raise Exception(f"ERROR CRÍTICO: Tabla no existe. {str(e)}")
-            print(f"✗ Error al verificar asignatura_semestre: {str(e)}")
-            raise
-    
-    def _estudiante_semestre_exists(self, cursor, rut, periodo):
+            self._stage_rows()
+        finally:
+            self._staging = False
+
+    @abstractmethod
+    def _stage_rows(self):
+        """Lee y transforma las filas encolándolas en los lotes, sin usar la BD (ver stage())"""
+        pass
+
+    def staged_keys(self) -> set:
+        """Claves (tabla, clave) que escribirá write_staged()"""
+        keys = {("Semestre", (periodo,)) for periodo in self._semestres_pendientes}
+        for table, pending in self._batches.items():
+            keys.update((table, key) for key in pending)
+        return keys
+
+    def write_staged(self, cursor):
+        """
+        Escribe en la BD lo preparado por stage(). No consume lo preparado,
+        así que se puede reintentar si la transacción se deshace.
+        """
+        # El resumen de un intento anterior corresponde a una transacción deshecha
+        self.resumen_tablas = {}
+        self._register_semestres(cursor, self._semestres_pendientes)
+
+        staged = self._batches
+        self._batches = dict(staged)
         try:
-            query = "SELECT COUNT(*) FROM Estudiante_Semestre WHERE rut_estudiante = %s AND periodo_semestre = %s"
-            cursor.execute(query, (rut, periodo))
-            result = cursor.fetchone()[0] > 0
-            return result
-        except Error as e:
-            # Error 1146 es "Table doesn't exist"
-            if e.errno == 1146:
-                raise Exception(f"ERROR CRÍTICO: Tabla no existe. {str(e)}")
-            print(f"✗ Error al verificar estudiante_semestre: {str(e)}")
-            raise
-        
-    def _estudiante_asignatura_exists(self, cursor, rut, codigo, periodo):
+            self._flush_batches(cursor)
+        finally:
+            self._batches = staged
+        with self.report.stage("post_proceso"):
+            self._after_upsert(cursor)
+
+    def _after_upsert(self, cursor):
+        """Se ejecuta una vez escritas todas las filas"""
+        pass
+
+    def _normalize_periodo(self, periodo_str: str) -> str:
+        """Normaliza un período a YYYY-primavera / YYYY-otoño (ver utils.periodo)"""
+        periodo, key = normalize_periodo(periodo_str)
+        self._periodo_keys[periodo] = key
+        return periodo
+
+    def _normalize_periodos(self, series: pd.Series) -> list:
+        """
+        Normaliza una columna de períodos evaluando solo sus valores distintos.
+        Las claves numéricas quedan en self._periodo_keys.
+        """
+        codes, uniques = pd.factorize(series)
+        normalizados = [self._normalize_periodo(valor) for valor in uniques]
+        if (codes == -1).any():
+            # Celdas vacías (código -1, el último elemento): ver PERIODO_VACIO
+            normalizados.append(self._normalize_periodo(None))
+        return [normalizados[code] for code in codes]
+
+    # --- TRANSFORMACIÓN COLUMNAR ---
+
+    def _column_values(self, series: pd.Series) -> list:
+        """Convierte una columna a lista de valores Python, con None en lugar de NaN"""
+        return series.astype(object).where(series.notna(), None).tolist()
+
+    def _numeric_column(self, series: pd.Series, strict: bool = True) -> pd.Series:
+        """
+        Convierte una columna a numérico. Los vacíos quedan como NaN.
+        Con strict=True, un valor no numérico lanza ValueError indicando la fila.
+        """
+        raw = series.astype(str).str.strip()
+        present = series.notna() & raw.ne('')
+        numeric = pd.to_numeric(raw.where(present), errors='coerce')
+
+        if strict:
+            invalid = present & numeric.isna()
+            if invalid.any():
+                index = invalid.idxmax()
+                raise ValueError(
+                    f"Error en fila {index + self.FILA_OFFSET} (índice {index}): "
+                    f"valor no numérico '{series[index]}' en columna '{series.name}'"
+                )
+        return numeric
+
+    def _int_column(self, series: pd.Series, falsy=None, strict: bool = True) -> pd.Series:
+        """Convierte una columna a enteros; vacíos y ceros retornan `falsy`"""
+        numeric = self._numeric_column(series, strict).fillna(0).astype('int64')
+        return numeric.astype(object).where(numeric != 0, falsy)
+
+    def _float_column(self, series: pd.Series, falsy=None) -> pd.Series:
+        """Convierte una columna a decimales; vacíos y ceros retornan `falsy`"""
+        numeric = self._numeric_column(series)
+        return numeric.astype(object).where(numeric.notna() & (numeric != 0), falsy)
+
+    def _currency_column(self, series: pd.Series) -> pd.Series:
+        """Convierte montos como '$1,234' a enteros; los vacíos quedan en 0"""
+        cleaned = series.astype(str).str.replace('$', '', regex=False).str.replace(',', '', regex=False)
+        cleaned = cleaned.where(series.notna())
+        cleaned.name = series.name
+        return self._numeric_column(cleaned).fillna(0).astype('int64')
+
+    def _flag_column(self, series: pd.Series, *true_values) -> pd.Series:
+        """Retorna True donde la columna coincide exactamente con alguno de los valores"""
+        return series.isin(true_values)
+
+    def _date_column(self, series: pd.Series, formato: str = '%d-%m-%Y') -> pd.Series:
+        """Convierte fechas al formato YYYY-MM-DD; las inválidas quedan en None"""
+        fechas = pd.to_datetime(series.astype(str).str.strip(), format=formato, errors='coerce')
+        return fechas.dt.strftime('%Y-%m-%d').astype(object).where(fechas.notna(), None)
+
+    def _table_rows(self, table, columnas: dict, total: int):
+        """
+        Arma las filas (tuplas) de una tabla a partir de columnas ya transformadas,
+        en el orden de UPSERT_TABLES. Las columnas ausentes quedan en None y los
+        valores escalares se repiten en todas las filas.
+        """
+        _, data_columns = UPSERT_TABLES[table]
+        valores = []
+        for column in data_columns:
+            columna = columnas.get(column)
+            if isinstance(columna, pd.Series):
+                valores.append(self._column_values(columna))
+            else:
+                valores.append([columna] * total)
+        return zip(*valores)
+
+    # --- UPSERT MASIVO ---
+
+    def _upsert_estudiante(self, cursor, rut, datos):
+        """Encola un estudiante para el upsert masivo"""
+        self._queue_upsert(cursor, "Estudiante", (rut,), datos)
+
+    def _queue_upsert(self, cursor, table, keys: tuple, datos: dict):
+        """Encola una fila expresada como diccionario {columna: valor}"""
+        _, data_columns = UPSERT_TABLES[table]
+        self._queue_upsert_values(cursor, table, keys, [datos.get(column) for column in data_columns])
+
+    def _queue_upsert_values(self, cursor, table, keys: tuple, values):
+        """
+        Agrega una fila (valores en el orden de UPSERT_TABLES) al lote de la tabla.
+        Si la clave ya está en el lote, combina ambas filas: solo los campos
+        no None sobrescriben.
+        """
+        pending = self._batches.setdefault(table, {})
+        if keys in pending:
+            merged = pending[keys]
+            for i, value in enumerate(values):
+                if value is not None:
+                    merged[i] = value
+        else:
+            pending[keys] = list(values)
+
+        if len(pending) >= BULK_BATCH_SIZE and not self._staging:
+            self._flush_batches(cursor)
+
+    def _flush_batches(self, cursor):
+        """Escribe todos los lotes pendientes respetando el orden de las FK"""
+        for table in UPSERT_TABLES:
+            pending = self._batches.pop(table, None)
+            if not pending:
+                continue
+            if len(pending) <= BULK_BATCH_SIZE:
+                self._bulk_upsert(cursor, table, pending)
+                continue
+            # Lotes preparados con stage() pueden superar el tamaño de un INSERT
+            items = list(pending.items())
+            for start in range(0, len(items), BULK_BATCH_SIZE):
+                self._bulk_upsert(cursor, table, dict(items[start:start + BULK_BATCH_SIZE]))
+
+    def _bulk_upsert(self, cursor, table, pending: dict):
+        """
+        Ejecuta un INSERT multi-fila con ON DUPLICATE KEY UPDATE.
+        Las filas existentes solo se actualizan en los campos no None (las que
+        no traen ningún campo quedan sin cambios). No se consulta antes qué
+        claves existen: el resumen usa las filas afectadas que informa MySQL.
+        """
+        key_columns, data_columns = UPSERT_TABLES[table]
+        self._check_table(cursor, table, key_columns + data_columns, key_columns)
+        rows = list(pending.items())
+
+        columns = key_columns + data_columns
+        row_placeholder = f"({', '.join(['%s'] * len(columns))})"
+        updates = ", ".join(f"{column} = COALESCE(VALUES({column}), {column})" for column in data_columns)
+
+        query = f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES {', '.join([row_placeholder] * len(rows))}
+            ON DUPLICATE KEY UPDATE {updates}
+        """
+        params = []
+        for keys, values in rows:
+            params.extend(keys)
+            params.extend(values)
+
         try:
-            query = "SELECT COUNT(*) FROM Estudiante_Asignatura WHERE rut_estudiante = %s AND codigo_asignatura = %s AND periodo_semestre = %s"
-            cursor.execute(query, (rut, codigo, periodo))
-            result = cursor.fetchone()[0] > 0
-            return result
+            with self.report.stage("escritura"), self.report.query(f"INSERT {table}"):
+                cursor.execute(query, params)
+            self._count_rows(table, len(rows), cursor.rowcount)
+            logger.debug("✓ %s: %d fila(s) enviada(s), %d afectada(s)", table, len(rows), cursor.rowcount)
         except Error as e:
             # Error 1146 es "Table doesn't exist"
             if e.errno == 1146:
                 raise Exception(f"ERROR CRÍTICO: Tabla no existe. {str(e)}")
-            print(f"✗ Error al verificar estudiante_asignatura: {str(e)}")
+            logger.error("✗ Error en upsert masivo de %s: %s", table, e)
             raise
-    
-    # --- ESTUDIANTE ---
-    
-    def _insert_estudiante(self, cursor, rut, datos):
-        """Inserta un nuevo estudiante"""
-        try:
-            query = """
-                INSERT INTO Estudiante (
-                    rut, nombre, programa_estudio, nombre_apoderado, terminal,
-                    tiene_gratuidad, solicitud_interrupcion_estudios, 
-                    solicitud_interrupcion_estudio_pendiente, interrupcion_estudio_pendiente,
-                    beca_stem, tipo_alumno, estado_matricula, secciones_curriculares,
-                    secciones_online, asistencia_promedio, promedio_media_matematica,
-                    promedio_media_lenguaje, promedio_media_ingles, ultima_asistencia, deuda
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                rut,
-                datos.get('nombre'),
-                datos.get('programa_estudio'),
-                datos.get('nombre_apoderado'),
-                datos.get('terminal'),
-                datos.get('tiene_gratuidad'),
-                datos.get('solicitud_interrupcion_estudios'),
-                datos.get('solicitud_interrupcion_estudio_pendiente'),
-                datos.get('interrupcion_estudio_pendiente'),
-                datos.get('beca_stem'),
-                datos.get('tipo_alumno'),
-                datos.get('estado_matricula'),
-                datos.get('secciones_curriculares'),
-                datos.get('secciones_online'),
-                datos.get('asistencia_promedio'),
-                datos.get('promedio_media_matematica'),
-                datos.get('promedio_media_lenguaje'),
-                datos.get('promedio_media_ingles'),
-                datos.get('ultima_asistencia'),
-                datos.get('deuda')
+
+    # --- ESQUEMA ---
+
+    def _schema_columns(self, cursor) -> dict:
+        """
+        {tabla: set(columnas)} (ambas en minúsculas) según el catálogo compartido
+        (utils.schema_catalog); vacío si no se pudo leer
+        """
+        if self._schema is None:
+            try:
+                tables = schema_catalog.get(self.db_connection, cursor) or {}
+            except Exception as e:
+                logger.debug("→ Catálogo del esquema no disponible: %s", e)
+                tables = {}
+            self._schema = {
+                table: {column.lower() for column in columns}
+                for table, columns in tables.items()
+            }
+            self._unique_keys = {
+                table: list(schema_catalog.unique_keys(columns).values())
+                for table, columns in tables.items()
+            }
+        return self._schema
+
+    def _check_table(self, cursor, table: str, columns, key_columns=()) -> None:
+        """
+        Verifica una vez por tabla que la tabla y las columnas a escribir
+        existan, para fallar antes del primer lote y no a mitad de la carga.
+        Con key_columns, verifica además que algún índice único (o la PRIMARY)
+        quede cubierto por esas columnas: sin él, ON DUPLICATE KEY UPDATE no
+        encuentra la fila existente y cada carga agrega filas duplicadas.
+        """
+        if table in self._tablas_verificadas:
+            return
+        schema = self._schema_columns(cursor)
+        if schema:
+            known = schema.get(table_key(table))
+            if known is None:
+                raise Exception(f"ERROR CRÍTICO: Tabla no existe. {table}")
+            faltantes = [column for column in columns if column.lower() not in known]
+            if faltantes:
+                raise Exception(f"ERROR CRÍTICO: Faltan columnas en {table}: {', '.join(faltantes)}")
+            claves = {column.lower() for column in key_columns}
+            if claves and not any(indice <= claves for indice in self._unique_keys.get(table_key(table), [])):
+                raise Exception(
+                    f"ERROR CRÍTICO: {table} no tiene una clave única sobre ({', '.join(key_columns)}); "
+                    "la carga duplicaría filas. Aplique las migraciones de database/migrations"
+                )
+        self._tablas_verificadas.add(table)
+
+    def _count_rows(self, table: str, filas: int, afectadas: int):
+        """
+        Acumula el resultado de un INSERT ... ON DUPLICATE KEY UPDATE. MySQL
+        cuenta 1 fila afectada por cada fila creada, 2 por cada actualizada y
+        0 por cada una sin cambios; en un INSERT multi-fila solo informa el total
+        """
+        conteo = self.resumen_tablas.setdefault(table, {"filas": 0, "afectadas": 0})
+        conteo["filas"] += filas
+        conteo["afectadas"] += max(afectadas, 0)
+
+    def log_summary(self):
+        """Registra (INFO) el resumen de filas por tabla de la carga terminada"""
+        nombre = os.path.basename(self.file_path) if self.file_path else type(self).__name__
+        for table, conteo in self.resumen_tablas.items():
+            logger.info(
+                "✓ %s: %d fila(s) cargada(s), %d afectada(s) (1 por creada, 2 por actualizada)",
+                table, conteo["filas"], conteo["afectadas"],
+                extra={"archivo": nombre, "tabla": table, **conteo},
             )
-            cursor.execute(query, values)
-            print(f"✓ Estudiante {rut} creado")
-        except Error as e:
-            print(f"✗ Error al insertar estudiante {rut}: {str(e)}")
-            raise
-    
-    def _update_estudiante(self, cursor, rut, datos):
-        """Actualiza un estudiante existente (solo campos no None)"""
-        try:
-            campos = []
-            valores = []
-            for key, value in datos.items():
-                if value is not None:
-                    campos.append(f"{key} = %s")
-                    valores.append(value)
-            
-            if not campos:
-                print(f"→ No hay datos para actualizar en estudiante {rut}")
-                return
-            
-            valores.append(rut)
-            query = f"""
-                UPDATE Estudiante SET
-                    {', '.join(campos)}
-                WHERE rut = %s
-            """
-            cursor.execute(query, valores)
-            print(f"✓ Estudiante {rut} actualizado")
-        except Error as e:
-            print(f"✗ Error al actualizar estudiante {rut}: {str(e)}")
-            raise
-    
+
     # --- SEMESTRE ---
     
-    def _insert_semestre(self, cursor, periodo):
-        """Inserta un nuevo semestre solo si no existe"""
-        try:
-            query = "INSERT IGNORE INTO Semestre (periodo) VALUES (%s)"
-            cursor.execute(query, (periodo,))
+    def _register_semestres(self, cursor, periodos):
+        """
+        Registra los semestres distintos de periodos en un solo INSERT
+        multi-fila, omitiendo los que esta conexión ya sabe que existen.
+        """
+        distintos = list(dict.fromkeys(periodos))
+        if self._staging:
+            self._semestres_pendientes.update(dict.fromkeys(distintos))
+            return
         
-            if cursor.rowcount > 0:
-                print(f"✓ Semestre {periodo} creado")
-            else:
-                print(f"→ Semestre {periodo} ya existe")
-            
-        except Error as e:
-            print(f"✗ Error al insertar semestre: {str(e)}")
-            raise
-    
-    # --- ASIGNATURA ---
-    
-    def _insert_asignatura(self, cursor, codigo, datos):
-        """Inserta una nueva asignatura"""
-        try:
-            query = """
-                INSERT INTO Asignatura (
-                    codigo_asignatura, nombre, programa, area, COD_mencion, 
-                    mencion, plan, modalidad, nivel, prerequisito_semestre_siguiente, ultimo_nivel
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                codigo,
-                datos.get('nombre'),
-                datos.get('programa'),
-                datos.get('area'),
-                datos.get('COD_mencion'),
-                datos.get('mencion'),
-                datos.get('plan'),
-                datos.get('modalidad'),
-                datos.get('nivel'),
-                datos.get('prerequisito_semestre_siguiente'),
-                datos.get('ultimo_nivel')
-            )
-            cursor.execute(query, values)
-            print(f"✓ Asignatura {codigo} creada")
-        except Error as e:
-            print(f"✗ Error al insertar asignatura {codigo}: {str(e)}")
-            raise
-    
-    def _update_asignatura(self, cursor, codigo, datos):
-        """Actualiza una asignatura existente (solo campos no None)"""
-        try:
-            campos = []
-            valores = []
-            for key, value in datos.items():
-                if value is not None:
-                    campos.append(f"{key} = %s")
-                    valores.append(value)
-            
-            if not campos:
-                print(f"→ No hay datos para actualizar en asignatura {codigo}")
-                return
-            
-            valores.append(codigo)
-            query = f"""
-                UPDATE Asignatura SET
-                    {', '.join(campos)}
-                WHERE codigo_asignatura = %s
-            """
-            cursor.execute(query, valores)
-            print(f"✓ Asignatura {codigo} actualizada")
-        except Error as e:
-            print(f"✗ Error al actualizar asignatura {codigo}: {str(e)}")
-            raise
-    
-    # --- ASIGNATURA_SEMESTRE ---
-    
-    def _insert_asignatura_semestre(self, cursor, codigo, periodo, datos):
-        """Inserta asignatura en semestre"""
-        try:
-            query = """
-                INSERT IGNORE INTO Asignatura_semestre (
-                    codigo_asignatura, periodo_semestre, secciones, alumnos, alumnos_en_riesgo,
-                    alumnos_ayudantia, porcentaje_reprobacion_N1, porcentaje_reprobacion_N2,
-                    porcentaje_reprobacion_N3, promedio_nota_uno, promedio_nota_dos,
-                    promedio_nota_tres, ayudantia_virtual, ayudantia_sede
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                codigo,
-                periodo,
-                datos.get('secciones'),
-                datos.get('alumnos'),
-                datos.get('alumnos_en_riesgo'),
-                datos.get('alumnos_ayudantia'),
-                datos.get('porcentaje_reprobacion_N1'),
-                datos.get('porcentaje_reprobacion_N2'),
-                datos.get('porcentaje_reprobacion_N3'),
-                datos.get('promedio_nota_uno'),
-                datos.get('promedio_nota_dos'),
-                datos.get('promedio_nota_tres'),
-                datos.get('ayudantia_virtual'),
-                datos.get('ayudantia_sede')
-            )
-            cursor.execute(query, values)
-            if cursor.rowcount > 0:
-                print(f"✓ Asignatura_semestre {codigo}-{periodo} creada")
-            else:
-                print(f"→ Asignatura_semestre {codigo}-{periodo} ya existe")
-        except Error as e:
-            print(f"✗ Error al insertar asignatura_semestre {codigo}-{periodo}: {str(e)}")
-            raise
-    
-    def _update_asignatura_semestre(self, cursor, codigo, periodo, datos):
-        """Actualiza asignatura en semestre (solo campos no None)"""
-        try:
-            campos = []
-            valores = []
-            for key, value in datos.items():
-                if value is not None:
-                    campos.append(f"{key} = %s")
-                    valores.append(value)
-            
-            if not campos:
-                print(f"→ No hay datos para actualizar en asignatura_semestre {codigo}-{periodo}")
-                return
-            
-            valores.extend([codigo, periodo])
-            query = f"""
-                UPDATE Asignatura_semestre SET
-                    {', '.join(campos)}
-                WHERE codigo_asignatura = %s AND periodo_semestre = %s
-            """
-            cursor.execute(query, valores)
-            print(f"✓ Asignatura_Semestre {codigo}-{periodo} actualizada")
-        except Error as e:
-            print(f"✗ Error al actualizar asignatura_semestre {codigo}-{periodo}: {str(e)}")
-            raise
-    
-    # --- ESTUDIANTE_SEMESTRE ---
-    
-    def _insert_estudiante_semestre(self, cursor, rut, periodo, datos):
-        """Inserta estudiante en semestre"""
-        try:
-            query = """
-                INSERT IGNORE INTO Estudiante_Semestre (
-                    rut_estudiante, periodo_semestre, asignaturas_PE,
-                    asignaturas_reprobadas_cuatro_veces, asignaturas_reprobadas_tres_veces,
-                    solicitud_reingreso
-                ) VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                rut,
-                periodo,
-                datos.get('asignaturas_PE'),
-                datos.get('asignaturas_reprobadas_cuatro_veces'),
-                datos.get('asignaturas_reprobadas_tres_veces'),
-                datos.get('solicitud_reingreso')
+        conocidos = self._known_semestres()
+        nuevos = [periodo for periodo in distintos if periodo not in conocidos]
+        if not nuevos:
+            return
+        
+        if "periodo_key" in self._schema_columns(cursor).get(table_key("Semestre"), {"periodo_key"}):
+            # periodo_key se completa también en semestres creados antes de la columna
+            query = (
+                f"INSERT INTO Semestre (periodo, periodo_key) VALUES {', '.join(['(%s, %s)'] * len(nuevos))} "
+                "ON DUPLICATE KEY UPDATE periodo_key = VALUES(periodo_key)"
             )
-            cursor.execute(query, values)
-            if cursor.rowcount > 0:
-                print(f"✓ Estudiante_semestre {rut}-{periodo} creado")
-            else:
-                print(f"→ Estudiante_semestre {rut}-{periodo} ya existe")
-        except Error as e:
-            print(f"✗ Error al insertar estudiante_semestre {rut}-{periodo}: {str(e)}")
-            raise
-    
-    def _update_estudiante_semestre(self, cursor, rut, periodo, datos):
-        """Actualiza estudiante en semestre"""
-        try:
-            campos = []
-            valores = []
-            for key, value in datos.items():
-                if key in ("rut_estudiante", "periodo_semestre"):
-                    continue
-                if value is not None:
-                    campos.append(f"{key} = %s")
-                    valores.append(value)
-
-            if not campos:
-                print(f"→ No hay datos para actualizar en estudiante_semestre {rut}-{periodo}")
-                return
-
-            valores.extend([rut, periodo])
-            query = f"""
-                UPDATE Estudiante_Semestre SET
-                    {', '.join(campos)}
-                WHERE rut_estudiante = %s AND periodo_semestre = %s
-            """
-            cursor.execute(query, valores)
-            print(f"✓ Estudiante_semestre {rut}-{periodo} actualizado")
-        except Error as e:
-            print(f"✗ Error al actualizar estudiante_semestre {rut}-{periodo}: {str(e)}")
-            raise
-    
-    # --- ESTUDIANTE_ASIGNATURA ---
-    
-    def _insert_estudiante_asignatura(self, cursor, rut, codigo, periodo, datos):
-        """Inserta estudiante en asignatura"""
-        try:
-            query = """
-                INSERT IGNORE INTO Estudiante_Asignatura (
-                    rut_estudiante, codigo_asignatura, periodo_semestre,
-                    nombre_docente, notas_parciales, porcentaje_asistencia, riesgo
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                rut,
-                codigo,
-                periodo,
-                datos.get('nombre_docente'),
-                datos.get('notas_parciales'),
-                datos.get('porcentaje_asistencia'),
-                datos.get('riesgo')
+            params = []
+            for periodo in nuevos:
+                params.extend((periodo, self._periodo_keys.get(periodo) or periodo_key(periodo)))
+        else:
+            # Sin la migración 001 (database/migrations) no existe periodo_key
+            query = (
+                f"INSERT INTO Semestre (periodo) VALUES {', '.join(['(%s)'] * len(nuevos))} "
+                "ON DUPLICATE KEY UPDATE periodo = periodo"
             )
-            cursor.execute(query, values)
-            if cursor.rowcount > 0:
-                print(f"✓ Estudiante_asignatura {rut}-{codigo}-{periodo} creada")
-            else:
-                print(f"→ Estudiante_asignatura {rut}-{codigo}-{periodo} ya existe")
-        except Error as e:
-            print(f"✗ Error al insertar estudiante_asignatura {rut}-{codigo}-{periodo}: {str(e)}")
-            raise
-    
-    def _update_estudiante_asignatura(self, cursor, rut, codigo, periodo, datos):
-        """Actualiza estudiante en asignatura"""
+            params = list(nuevos)
+        
         try:
-            campos = []
-            valores = []
-            for key, value in datos.items():
-                if key in ("rut_estudiante", "codigo_asignatura", "periodo_semestre"):
-                    continue
-                if value is not None:
-                    campos.append(f"{key} = %s")
-                    valores.append(value)
-
-            if not campos:
-                print(f"→ No hay datos para actualizar en estudiante_asignatura {rut}-{codigo}-{periodo}")
-                return
-
-            valores.extend([rut, codigo, periodo])
-            query = f"""
-                UPDATE Estudiante_Asignatura SET
-                    {', '.join(campos)}
-                WHERE rut_estudiante = %s AND codigo_asignatura = %s AND periodo_semestre = %s
-            """
-            cursor.execute(query, valores)
-            print(f"✓ Estudiante_asignatura {rut}-{codigo}-{periodo} actualizada")
+            with self.report.stage("escritura"), self.report.query("INSERT Semestre"):
+                cursor.execute(query, params)
+            self._remember_semestres(nuevos)
+            logger.debug("✓ Semestre(s) registrado(s): %s", ", ".join(nuevos))
         except Error as e:
-            print(f"✗ Error al actualizar estudiante_asignatura {rut}-{codigo}-{periodo}: {str(e)}")
+            # Error 1146 es "Table doesn't exist"
+            if e.errno == 1146:
+                raise Exception(f"ERROR CRÍTICO: Tabla no existe. {str(e)}")
+            logger.error("✗ Error al registrar semestres: %s", e)
             raise
-    
-    # --- REPORTE_FINANCIERO ---
 
-    def _insert_reporte_financiero(self, cursor, rut, datos):
-        """Inserta reporte financiero"""
-        try:
-            query = """
-                INSERT INTO Reporte_financiero_estudiante (
-                    rut_estudiante, cantidad_cuotas_pendientes_matriculas,
-                    cantidad_cuotas_pendientes_colegiaturas, deuda_matriculas,
-                    deuda_colegiaturas, otras_deudas, deuda_total,
-                    monto_compromiso_matricula, monto_compromiso_colegiaturas
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            values = (
-                rut,
-                datos.get('cantidad_cuotas_pendientes_matriculas'),
-                datos.get('cantidad_cuotas_pendientes_colegiaturas'),
-                datos.get('deuda_matriculas'),
-                datos.get('deuda_colegiaturas'),
-                datos.get('otras_deudas'),
-                datos.get('deuda_total'),
-                datos.get('monto_compromiso_matricula'),
-                datos.get('monto_compromiso_colegiaturas')
-            )
-            cursor.execute(query, values)
-            print(f"✓ Reporte financiero para {rut} creado")
-        except Error as e:
-            print(f"✗ Error al insertar reporte financiero {rut}: {str(e)}")
-            raise
-    
-    def _update_reporte_financiero(self, cursor, rut, datos):
-        """Actualiza reporte financiero (solo campos no None)"""
-        try:
-            campos = []
-            valores = []
-            for key, value in datos.items():
-                if value is not None:
-                    campos.append(f"{key} = %s")
-                    valores.append(value)
-            
-            if not campos:
-                print(f"→ No hay datos para actualizar en reporte financiero {rut}")
-                return
-            
-            valores.append(rut)
-            query = f"""
-                UPDATE Reporte_financiero_estudiante SET
-                    {', '.join(campos)}
-                WHERE rut_estudiante = %s
-            """
-            cursor.execute(query, valores)
-            print(f"✓ Reporte financiero para {rut} actualizado")
-        except Error as e:
-            print(f"✗ Error al actualizar reporte financiero {rut}: {str(e)}")
-            raise
\ No newline at end of file
+    def _known_semestres(self) -> set:
+        """
+        Semestres que ya existen según la conexión (ver
+        DatabaseConnection.known_semestres); sin ella, los de este reader
+        """
+        known_semestres = getattr(self.db_connection, 'known_semestres', None)
+        if known_semestres is None:
+            return self._semestres_registrados
+        return known_semestres()
+
+    def _remember_semestres(self, periodos) -> None:
+        """
+        Anota semestres recién insertados. La conexión los da por conocidos
+        solo después del commit de la transacción (ver
+        DatabaseConnection.add_pending_semestres)
+        """
+        add_pending = getattr(self.db_connection, 'add_pending_semestres', None)
+        if add_pending is None:
+            self._semestres_registrados.update(periodos)
+        else:
+            add_pending(periodos)
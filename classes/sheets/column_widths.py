@@ -0,0 +1,94 @@
+from openpyxl.utils import get_column_letter
+
+
+class ColumnWidthTracker:
+    """
+    Envoltorio de una hoja de openpyxl que registra el largo máximo de cada
+    columna a medida que se escriben los valores, y fija los anchos una sola
+    vez con apply() (sin volver a recorrer la hoja). Usado con `with`,
+    apply() se llama al salir del bloque.
+
+    Con sample_rows solo se miden las primeras filas (hojas muy grandes).
+    En hojas write_only los anchos deben definirse antes de la primera fila:
+    append() retiene las primeras sample_rows filas, fija los anchos con ellas
+    y desde ahí escribe directo. Si la hoja tiene menos filas, quedan
+    retenidas hasta apply(): por eso conviene usarlo con `with`.
+    """
+
+    # Filas de muestra por defecto en hojas write_only
+    WRITE_ONLY_SAMPLE_ROWS = 500
+
+    def __init__(self, worksheet, sample_rows: int = None, min_width: int = 12, max_width: int = 40, padding: int = 2):
+        self.worksheet = worksheet
+        self.write_only = not hasattr(worksheet, "cell")
+        if sample_rows is None and self.write_only:
+            sample_rows = self.WRITE_ONLY_SAMPLE_ROWS
+        self.sample_rows = sample_rows
+        self.min_width = min_width
+        self.max_width = max_width
+        self.padding = padding
+        # {columna (1..n): largo máximo}
+        self.widths = {}
+        # Filas agregadas con append() y las retenidas hasta fijar los anchos
+        self._appended = 0
+        self._pending = []
+        self._applied = False
+
+    def __enter__(self) -> "ColumnWidthTracker":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        # Con error la hoja queda incompleta igual: no se escriben las filas retenidas
+        if exc_type is None:
+            self.apply()
+        return False
+
+    def cell(self, row: int, column: int, value=None, font=None, fill=None, **styles):
+        """Escribe una celda (como worksheet.cell) y registra su largo"""
+        cell = self.worksheet.cell(row=row, column=column, value=value)
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        for name, style in styles.items():
+            setattr(cell, name, style)
+        self.track(row, column, value)
+        return cell
+
+    def append(self, values) -> None:
+        """Agrega una fila (como worksheet.append); acepta valores o celdas"""
+        values = list(values)
+        self._appended += 1
+        if self.sample_rows is None or self._appended <= self.sample_rows:
+            for column, value in enumerate(values, 1):
+                self.track(self._appended, column, getattr(value, "value", value))
+
+        if not self.write_only or self._applied:
+            self.worksheet.append(values)
+            return
+        self._pending.append(values)
+        if self._appended >= self.sample_rows:
+            self.apply()
+
+    def track(self, row: int, column: int, value) -> None:
+        """Registra el largo de un valor escrito por fuera del envoltorio"""
+        if value is None or (self.sample_rows is not None and row > self.sample_rows):
+            return
+        length = len(str(value))
+        if length > self.widths.get(column, 0):
+            self.widths[column] = length
+
+    def apply(self) -> None:
+        """Fija los anchos registrados (y escribe las filas retenidas de una hoja write_only)"""
+        if self._applied:
+            return
+        for column, length in self.widths.items():
+            width = min(max(length + self.padding, self.min_width), self.max_width)
+            self.worksheet.column_dimensions[get_column_letter(column)].width = width
+
+        if self.write_only:
+            # Los anchos ya no se pueden cambiar una vez escrita la primera fila
+            self._applied = True
+            for values in self._pending:
+                self.worksheet.append(values)
+            self._pending = []
@@ -1,11 +1,20 @@
 from classes.sheets.sheet import Sheet
 from openpyxl.styles import Font, PatternFill, Alignment
-from utils.dynamic_query_builder import build_query_for_custom_sheet
+from classes.export.custom_sheet_planner import CustomSheetPlanner
 
 class CustomSheet(Sheet):
-    def __init__(self, config: dict):
-        self.name = config.get("name")
-        self.tables = config.get("tables")
+
+    # Las tablas personalizadas pueden tener muchas filas: el ancho se mide con una muestra
+    WIDTH_SAMPLE_ROWS = 2000
+
+    def __init__(self, sheet):
+        """
+        Args:
+            sheet: definición compilada (ver utils.custom_sheet_registry)
+        """
+        self.sheet = sheet
+        self.name = sheet.name
+        self.tables = sheet.tables
 
     def add_sheet(self, wb, student_data: dict, db_connection=None) -> None:
         """
@@ -18,67 +27,51 @@ class CustomSheet(Sheet):
         """
         ws = wb.create_sheet(self.name)
         
-        # Título
-        ws["A1"] = f"Hoja Personalizada: {self.name}"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:F1")
-        
-        row = 3
-        
-        # Iterar sobre cada tabla configurada
-        for table_config in self.tables:
-            table_name = table_config.get("table")
-            columns = table_config.get("columns", [])
-            
-            if not columns:
-                continue
-            
-            # Título de la tabla
-            ws[f"A{row}"] = f"Tabla: {table_name.replace('_', ' ').title()}"
-            ws[f"A{row}"].font = Font(bold=True, size=11)
-            row += 1
-            
+        with self.width_tracker(ws) as out:
+
+            # Título
+            out.cell(1, 1, f"Hoja Personalizada: {self.name}", font=Font(size=14, bold=True))
+            ws.merge_cells("A1:F1")
+
+            row = 3
+
+            # Filas por (tabla, columnas): precargadas por el exportador, o desde la BD
+            custom_rows = student_data.get("custom_rows")
+            if custom_rows is None and db_connection:
+                rut = student_data['student'].get('rut')
+                custom_rows = CustomSheetPlanner([self.sheet]).fetch(db_connection, [rut]).get(rut, {})
+
             # Headers con colores
             header_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
             header_font = Font(bold=True, color="FFFFFF")
-            
-            for col_idx, column in enumerate(columns, 1):
-                column_name = column.replace("_", " ").title()
-                cell = ws.cell(row=row, column=col_idx, value=column_name)
-                cell.fill = header_fill
-                cell.font = header_font
-            
-            row += 1
-            
-            # Obtener datos de la BD
-            try:
-                if db_connection:
-                    rut = student_data['student'].get('rut')
-                    cursor = db_connection.cursor(dictionary=True)
-                    
-                    try:
-                        # Construir y ejecutar query
-                        query, params = build_query_for_custom_sheet(rut, table_name, columns)
-                        cursor.execute(query, params)
-                        data = cursor.fetchall()
-                        
-                        # Insertar filas de datos
-                        for data_row in data:
-                            for col_idx, column in enumerate(columns, 1):
-                                value = data_row.get(column, "N/A")
-                                value_edited = str(value).replace("_", " ").title()
-                                ws.cell(row=row, column=col_idx, value=value_edited)
-                            row += 1
-                    
-                    finally:
-                        cursor.close()
-            
-            except Exception as e:
-                # Si hay error, mostrar mensaje en la celda
-                ws[f"A{row}"] = f"Error: {str(e)}"
+
+            # Iterar sobre cada tabla configurada
+            for table in self.tables:
+                # Título de la tabla
+                out.cell(row, 1, table.title, font=Font(bold=True, size=11))
                 row += 1
-            
-            row += 2  # Espacio entre tablas
-        
-        # Ajustar ancho de columnas según contenido y encabezados
-        self.auto_adjust_column_widths(ws)
\ No newline at end of file
+
+                for col_idx, column_name in enumerate(table.headers, 1):
+                    out.cell(row, col_idx, column_name, font=header_font, fill=header_fill)
+
+                row += 1
+
+                # Filas con los valores ya formateados (ver CustomSheetPlanner)
+                try:
+                    data = (custom_rows or {}).get(table.key, [])
+
+                    if isinstance(data, Exception):
+                        raise data
+
+                    # Insertar filas de datos
+                    for data_row in data:
+                        for col_idx, value in enumerate(data_row, 1):
+                            out.cell(row, col_idx, value)
+                        row += 1
+
+                except Exception as e:
+                    # Si hay error, mostrar mensaje en la celda
+                    out.cell(row, 1, f"Error: {str(e)}")
+                    row += 1
+
+                row += 2  # Espacio entre tablas
\ No newline at end of file
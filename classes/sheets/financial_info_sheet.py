@@ -9,27 +9,23 @@ class FinancialInfoSheet(Sheet):
         ws = wb.create_sheet("Información Financiera")
 
         #Titutlo
-        ws["A1"] = "Información Financiera del Estudiante"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:D1")
+        with self.width_tracker(ws) as out:
+            out.cell(1, 1, "Información Financiera del Estudiante", font=Font(size=14, bold=True))
+            ws.merge_cells("A1:D1")
 
-        row = 3
+            row = 3
 
-        fields = [
-            ('Cuotas Pendientes Matrículas', 'cantidad_cuotas_pendientes_matriculas'),
-            ('Cuotas Pendientes Colegiaturas', 'cantidad_cuotas_pendientes_colegiaturas'),
-            ('Deuda Matrículas', 'deuda_matriculas'),
-            ('Deuda Colegiaturas', 'deuda_colegiaturas'),
-            ('Otras Deudas', 'otras_deudas'),
-            ('Deuda Total', 'deuda_total'),
-        ]
+            fields = [
+                ('Cuotas Pendientes Matrículas', 'cantidad_cuotas_pendientes_matriculas'),
+                ('Cuotas Pendientes Colegiaturas', 'cantidad_cuotas_pendientes_colegiaturas'),
+                ('Deuda Matrículas', 'deuda_matriculas'),
+                ('Deuda Colegiaturas', 'deuda_colegiaturas'),
+                ('Otras Deudas', 'otras_deudas'),
+                ('Deuda Total', 'deuda_total'),
+            ]
 
-        for label, key in fields:
-            ws[f'A{row}'] = label
-            ws[f'A{row}'].font = Font(bold=True)
-            ws[f'B{row}'] = financial_info.get(key, 'N/A')
-            row += 1
-        
-        # Ajustar ancho de columnas
-        self.auto_adjust_column_widths(ws)
+            for label, key in fields:
+                out.cell(row, 1, label, font=Font(bold=True))
+                out.cell(row, 2, financial_info.get(key, 'N/A'))
+                row += 1
         self.export_dir = "exports"
\ No newline at end of file
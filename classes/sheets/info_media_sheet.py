@@ -8,25 +8,22 @@ class InfoMediaSheet(Sheet):
         student = student_data['student']
         ws = wb.create_sheet("Información Media")
         #Titulo
-        ws["A1"] = "Notas Media Estudiante"
-        ws["A1"].font = Font(size=14, bold=True)
-        ws.merge_cells("A1:D1")
+        with self.width_tracker(ws) as out:
+            out.cell(1, 1, "Notas Media Estudiante", font=Font(size=14, bold=True))
+            ws.merge_cells("A1:D1")
 
-        row = 3
+            row = 3
 
-        # Datos del estudiante
-        fields = [
-            ('RUT', 'rut'),
-            ('Nombre', 'nombre'),
-            ('Promedio Matematica Media', 'promedio_media_matematica'),
-            ('Promedio Lenguaje Media', 'promedio_media_lenguaje'),
-            ('Promedio Inglés Media', 'promedio_media_ingles')
-        ]
+            # Datos del estudiante
+            fields = [
+                ('RUT', 'rut'),
+                ('Nombre', 'nombre'),
+                ('Promedio Matematica Media', 'promedio_media_matematica'),
+                ('Promedio Lenguaje Media', 'promedio_media_lenguaje'),
+                ('Promedio Inglés Media', 'promedio_media_ingles')
+            ]
 
-        for label, key, in fields:
-            ws[f'A{row}'] = label
-            ws[f'A{row}'].font = Font(bold=True)
-            ws[f'B{row}'] = student.get(key, 'N/A')
-            row += 1
-
-        self.auto_adjust_column_widths(ws)
\ No newline at end of file
+            for label, key, in fields:
+                out.cell(row, 1, label, font=Font(bold=True))
+                out.cell(row, 2, student.get(key, 'N/A'))
+                row += 1
\ No newline at end of file
@@ -1,23 +1,19 @@
 from abc import ABC, abstractmethod
-from openpyxl.utils import get_column_letter
+from classes.sheets.column_widths import ColumnWidthTracker
 
 class Sheet(ABC):
 
+    # Filas que se miden para el ancho de columnas (None = todas)
+    WIDTH_SAMPLE_ROWS = None
+
     @abstractmethod
     def add_sheet(self, workbook, data: dict):
         pass
 
-    def auto_adjust_column_widths(self, worksheet, min_width: int = 12, max_width: int = 40, padding: int = 2) -> None:
-        """Ajusta el ancho de columnas según el contenido y encabezados."""
-        column_widths = {}
-
-        for row in worksheet.iter_rows():
-            for cell in row:
-                if cell.value is None:
-                    continue
-                value_length = len(str(cell.value))
-                column_widths[cell.column] = max(column_widths.get(cell.column, 0), value_length)
-
-        for col_idx, max_len in column_widths.items():
-            adjusted_width = min(max(max_len + padding, min_width), max_width)
-            worksheet.column_dimensions[get_column_letter(col_idx)].width = adjusted_width
\ No newline at end of file
+    def width_tracker(self, worksheet) -> ColumnWidthTracker:
+        """
+        Envoltorio para escribir la hoja: registra el ancho de cada columna
+        según contenido y encabezados, y los fija al salir del bloque with
+        (en hojas write_only, además escribe las filas retenidas).
+        """
+        return ColumnWidthTracker(worksheet, sample_rows=self.WIDTH_SAMPLE_ROWS)
@@ -1,7 +1,11 @@
 import mysql.connector
-from mysql.connector import Error
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+from contextlib import contextmanager
 import os
 import sys
+import threading
+import time
 from dotenv import load_dotenv
 
 # Cargar .env desde el directorio del ejecutable (importante para PyInstaller)
@@ -19,17 +23,48 @@ class DatabaseConnection:
     """
     Conexión a MySQL local (para cliente desktop).
     Soporta cursor() para compatibilidad con Exporter y Readers.
+
+    Internamente mantiene un pool de conexiones: `connection` es la conexión
+    principal (compartida por la GUI) y `acquire()` / `transaction()` entregan
+    conexiones independientes del pool para trabajo concurrente.
     """
+
+    # Segundos entre verificaciones de salud de la conexión principal
+    HEALTH_CHECK_INTERVAL = 30
     
     def __init__(self, host: str = None, user: str = None, 
-                 password: str = None, database: str = None, port: int = None):
+                 password: str = None, database: str = None, port: int = None,
+                 pool_size: int = None):
         self.host = host or os.getenv('DB_HOST', 'localhost')
         self.user = user or os.getenv('DB_USER', 'root')
         self.password = password or os.getenv('DB_PASSWORD', '')
         self.database = database or os.getenv('DB_NAME', 'inacap_db')
         self.port = port or int(os.getenv('DB_PORT', 3306))
+        self.pool_size = pool_size or int(os.getenv('DB_POOL_SIZE', 5))
+        self.pool_timeout = int(os.getenv('DB_POOL_TIMEOUT', 30))
+        self.pool = None
         self.connection = None
+        self._last_health_check = 0.0
+        # Semestres confirmados (con commit) en BD: los readers no vuelven a
+        # registrarlos. Los insertados en una transacción abierta quedan
+        # pendientes en el hilo que la ejecuta hasta su commit, y se descartan
+        # en el rollback (ver known_semestres / add_pending_semestres).
+        self._known_semestres = set()
+        self._semestres_lock = threading.Lock()
+        self._local = threading.local()
     
+    def _connection_config(self) -> dict:
+        return {
+            "host": self.host,
+            "user": self.user,
+            "password": self.password,
+            "database": self.database,
+            "port": self.port,
+            "charset": "utf8mb4",
+            "collation": "utf8mb4_unicode_ci",
+            "use_unicode": True,
+        }
+
     def connect(self) -> bool:
         try:
             print(f"[DB] Intentando conectar...")
@@ -37,21 +72,20 @@ class DatabaseConnection:
             print(f"[DB] User: {self.user}")
             print(f"[DB] Database: {self.database}")
             print(f"[DB] Port: {self.port}")
+            print(f"[DB] Pool: {self.pool_size} conexiones")
             
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                charset="utf8mb4",
-                collation="utf8mb4_unicode_ci",
-                use_unicode=True
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name="inacap_pool",
+                pool_size=self.pool_size,
+                pool_reset_session=True,
+                **self._connection_config()
             )
+            self.connection = self.pool.get_connection()
             try:
                 self.connection.set_charset_collation("utf8mb4", "utf8mb4_unicode_ci")
             except Error:
                 pass
+            self._last_health_check = time.monotonic()
             print(f"✓ Conectado a: {self.user}@{self.host}:{self.port}/{self.database}")
             return True
         except Error as e:
@@ -60,9 +94,112 @@ class DatabaseConnection:
             print(f"   Mensaje: {e.msg}")
             print(f"   Detalles: {str(e)}")
             return False
+
+    def ensure_connected(self, force: bool = False) -> bool:
+        """
+        Verifica la conexión principal (como máximo cada HEALTH_CHECK_INTERVAL
+        segundos) y la reconecta si se perdió.
+        """
+        if not self.connection:
+            return False
+        now = time.monotonic()
+        if not force and now - self._last_health_check < self.HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            if not self.connection.is_connected():
+                print("→ Conexión perdida, reconectando...")
+                self.connection.reconnect(attempts=3, delay=1)
+                print("✓ Reconectado a la base de datos")
+            self._last_health_check = now
+            return True
+        except Error as e:
+            print(f"✗ No se pudo reconectar: {str(e)}")
+            return False
+
+    def _get_pooled_connection(self):
+        """Obtiene una conexión del pool, esperando hasta pool_timeout si está agotado"""
+        if not self.pool:
+            raise Error("No hay conexión activa a la base de datos")
+        deadline = time.monotonic() + self.pool_timeout
+        while True:
+            try:
+                connection = self.pool.get_connection()
+                break
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.1)
+        # Verificación de salud: reconecta si la conexión del pool se cortó
+        connection.ping(reconnect=True, attempts=3, delay=1)
+        return connection
+
+    @contextmanager
+    def acquire(self):
+        """Entrega una conexión del pool y la devuelve al salir del bloque"""
+        connection = self._get_pooled_connection()
+        try:
+            yield connection
+        finally:
+            connection.close()
+
+    @contextmanager
+    def transaction(self):
+        """Conexión del pool con commit al salir del bloque o rollback si hay error"""
+        with self.acquire() as connection:
+            # Pendientes de una transacción anterior de este hilo que no pasó por commit()
+            self._finish_semestres(committed=False)
+            try:
+                yield connection
+                connection.commit()
+            except Exception:
+                try:
+                    connection.rollback()
+                finally:
+                    self._finish_semestres(committed=False)
+                raise
+            self._finish_semestres(committed=True)
+
+    def commit(self):
+        """Confirma la transacción de la conexión principal"""
+        self.connection.commit()
+        self._finish_semestres(committed=True)
+
+    def rollback(self):
+        """Deshace la transacción de la conexión principal"""
+        try:
+            self.connection.rollback()
+        finally:
+            self._finish_semestres(committed=False)
+
+    # --- SEMESTRES CONOCIDOS ---
+
+    def known_semestres(self) -> set:
+        """Semestres confirmados en BD más los pendientes de la transacción de este hilo"""
+        with self._semestres_lock:
+            conocidos = set(self._known_semestres)
+        return conocidos | self._pending_semestres()
+
+    def add_pending_semestres(self, periodos) -> None:
+        """Semestres insertados en la transacción abierta de este hilo"""
+        self._pending_semestres().update(periodos)
+
+    def _pending_semestres(self) -> set:
+        pendientes = getattr(self._local, "semestres", None)
+        if pendientes is None:
+            pendientes = self._local.semestres = set()
+        return pendientes
+
+    def _finish_semestres(self, committed: bool) -> None:
+        """Al terminar la transacción del hilo: confirma (commit) o descarta sus semestres pendientes"""
+        pendientes = self._pending_semestres()
+        if committed and pendientes:
+            with self._semestres_lock:
+                self._known_semestres.update(pendientes)
+        pendientes.clear()
     
     def cursor(self, **kwargs):
         if self.connection:
+            self.ensure_connected()
             return self.connection.cursor(**kwargs)
         else:
             raise Error("No hay conexión activa a la base de datos")
@@ -70,7 +207,9 @@ class DatabaseConnection:
     def disconnect(self) -> bool:
         try:
             if self.connection and self.connection.is_connected():
+                # En una conexión del pool, close() la devuelve al pool
                 self.connection.close()
+                self.connection = None
                 print("✓ Desconectado de base de datos")
                 return True
         except Error as e:
@@ -78,7 +217,7 @@ class DatabaseConnection:
         return False
     
     def get_connection(self):
-        if self.connection and self.connection.is_connected():
+        if self.connection and self.ensure_connected(force=True):
             return self.connection
         else:
             print("✗ No hay conexión activa con la base de datos")
@@ -0,0 +1,13 @@
+-- Clave entera ordenable del período (año * 2 + estación: otoño = 0, primavera = 1).
+-- Los readers la escriben al registrar cada Semestre; los exportadores filtran
+-- rangos con BETWEEN y ordenan por ella en vez de comparar los textos.
+
+ALTER TABLE Semestre
+    ADD COLUMN periodo_key SMALLINT UNSIGNED NULL AFTER periodo,
+    ADD INDEX idx_semestre_periodo_key (periodo_key);
+
+-- Completar los semestres ya existentes ('YYYY-otoño' / 'YYYY-primavera')
+UPDATE Semestre
+SET periodo_key = CAST(SUBSTRING_INDEX(periodo, '-', 1) AS UNSIGNED) * 2
+                  + (SUBSTRING_INDEX(periodo, '-', -1) = 'primavera')
+WHERE periodo REGEXP '^[0-9]{4}-(otoño|primavera)$';
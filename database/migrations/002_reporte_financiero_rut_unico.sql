@@ -0,0 +1,15 @@
+-- Clave única de Reporte_financiero_estudiante por estudiante.
+-- Los readers escriben el reporte con INSERT ... ON DUPLICATE KEY UPDATE sobre
+-- rut_estudiante; sin esta clave cada carga agrega otra fila por estudiante y
+-- los exportadores suman o repiten las duplicadas. Los readers no cargan el
+-- reporte financiero hasta aplicar esta migración.
+
+-- Eliminar duplicados existentes, conservando la fila más reciente (mayor id)
+DELETE antigua
+FROM Reporte_financiero_estudiante antigua
+INNER JOIN Reporte_financiero_estudiante reciente
+    ON reciente.rut_estudiante = antigua.rut_estudiante
+    AND reciente.id > antigua.id;
+
+ALTER TABLE Reporte_financiero_estudiante
+    ADD UNIQUE KEY uk_reporte_financiero_rut_estudiante (rut_estudiante);
@@ -6,13 +6,14 @@ from classes.readers.pdf_reader.pdf_reader import PDFReader
 from classes.readers.pdf_reader.certificado_anual_reader import CertificadoAnualReader
 from classes.readers.pdf_reader.certificado_de_concentracion_reader import CertificadoDeConcentracionReader
 from pdfminer.high_level import extract_text
+from utils.pdf_cache import PDFCache, get_pdf_cache
 
 
 class ReadersFactory:
     """Factory para crear instancias de readers según el tipo de archivo"""
     
     @staticmethod
-    def create_reader(file_type: str, file_path: str, db_connection):
+    def create_reader(file_type: str, file_path: str, db_connection, streaming: bool = False):
         # Para PDFs, detectar automáticamente el tipo
         if file_type == 'certificado_pdf':
             return ReadersFactory._create_pdf_reader(file_path, db_connection)
@@ -29,20 +30,26 @@ class ReadersFactory:
             raise ValueError(f"Tipo de archivo no válido: {file_type}")
         
         reader_class = readers[file_type]
-        return reader_class(file_path, db_connection)
+        return reader_class(file_path, db_connection, streaming=streaming)
     
     @staticmethod
     def _create_pdf_reader(file_path: str, db_connection):
         try:
-            # Extraer texto del PDF
-            texto = extract_text(file_path)
+            # Extraer texto del PDF (una sola vez: el reader lo reutiliza)
+            # salvo que el mismo contenido ya esté en la caché
+            cache = get_pdf_cache()
+            digest = PDFCache.file_hash(file_path)
+            texto = cache.get_text(digest)
+            if texto is None:
+                texto = extract_text(file_path)
+                cache.put(digest, text=texto)
             texto_upper = texto.upper()
             
             # Identificar tipo de certificado
             if "ANUAL" in texto_upper:
-                return CertificadoAnualReader(file_path, db_connection)
+                return CertificadoAnualReader(file_path, db_connection, text=texto, content_hash=digest)
             elif "CONCENTRACION" in texto_upper or "CONCENTRACIÓN" in texto_upper:
-                return CertificadoDeConcentracionReader(file_path, db_connection)
+                return CertificadoDeConcentracionReader(file_path, db_connection, text=texto, content_hash=digest)
             else:
                 raise ValueError(f"Tipo de certificado PDF no reconocido en: {file_path}")
         except Exception as e:
@@ -3,7 +3,7 @@ from classes.sheets.general_info_sheet import GeneralInfoSheet
 from classes.sheets.academic_info_sheet import AcademicInfoSheet
 from classes.sheets.financial_info_sheet import FinancialInfoSheet
 from classes.sheets.info_media_sheet import InfoMediaSheet
-from utils.custom_sheet_manager import load_custom_sheet_config
+from utils.custom_sheet_registry import custom_sheet_registry
 
 class SheetsFactory():
     
@@ -18,9 +18,9 @@ class SheetsFactory():
 
         for sheet_name, is_selected in custom_sheet_selection.items():
             if is_selected:
-                config = load_custom_sheet_config(sheet_name)
-                # Crear CustomSheet y guardar referencia a db_connection
-                custom_sheet = CustomSheet(config)
+                # Definición compilada (se relee solo si cambió el JSON)
+                custom_sheet = CustomSheet(custom_sheet_registry.get(sheet_name, db_connection))
+                # Guardar referencia a db_connection
                 custom_sheet.db_connection = db_connection
                 sheets[sheet_name] = custom_sheet
 
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import messagebox
 from classes.export.exporter import Exporter
+from classes.export.bulk_exporter import BulkExporter
 from frontend.custom_sheet_creator_gui import CustomSheetCreatorGUI
 from frontend.custom_sheet_deleter_gui import CustomSheetDeleterGUI
 from frontend.user_selects_output import select_output_directory
@@ -8,6 +9,7 @@ from frontend.buttons import create_back_button, create_exit_button
 from utils.custom_sheet_manager import list_custom_sheets
 from pathlib import Path
 import subprocess
+import re
 
 class FileExporterGUI:
 
@@ -55,6 +57,32 @@ class FileExporterGUI:
         rut_entry.pack(side=tk.LEFT, padx=10)
         rut_entry.focus()  # Poner el foco en el Entry
 
+        # Exportación masiva: varios RUTs separados por coma, o filtros
+        bulk_frame = tk.LabelFrame(
+            self.root,
+            text="Exportación masiva (varios RUTs separados por coma, o filtros)",
+            font=("Arial", 10),
+            padx=20,
+            pady=5
+        )
+        bulk_frame.pack(padx=20, pady=5)
+
+        tk.Label(bulk_frame, text="Programa:", font=("Arial", 10)).grid(row=0, column=0, sticky=tk.W)
+        self.programa_entry = tk.Entry(bulk_frame, font=("Arial", 10), width=22)
+        self.programa_entry.grid(row=0, column=1, padx=5)
+
+        tk.Label(bulk_frame, text="Periodo:", font=("Arial", 10)).grid(row=0, column=2, sticky=tk.W)
+        self.periodo_entry = tk.Entry(bulk_frame, font=("Arial", 10), width=14)
+        self.periodo_entry.grid(row=0, column=3, padx=5)
+
+        self.export_as_zip = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            bulk_frame,
+            text="Comprimir en un .zip",
+            variable=self.export_as_zip,
+            font=("Arial", 10)
+        ).grid(row=1, column=0, columnspan=4, sticky=tk.W)
+
         sheets_frame = tk.LabelFrame(
             self.root,
             text="Selecciona hojas para incluir en el Excel",
@@ -170,6 +198,14 @@ class FileExporterGUI:
         if custom_sheet_selection is None:
             custom_sheet_selection = {}
         
+        ruts = [r for r in re.split(r"[,;\s]+", rut) if r]
+        programa = self.programa_entry.get().strip() if hasattr(self, 'programa_entry') else ""
+        periodo = self.periodo_entry.get().strip() if hasattr(self, 'periodo_entry') else ""
+        
+        if len(ruts) > 1 or programa or periodo:
+            self.export_students_bulk(ruts, programa, periodo, sheets_selection, custom_sheet_selection)
+            return
+        
         if not rut:
             messagebox.showwarning("Advertencia", "Por favor, ingresa un RUT")
             return
@@ -204,6 +240,42 @@ class FileExporterGUI:
         except Exception as e:
             messagebox.showerror("Error", f"✗ Error al exportar: {str(e)}")
 
+    def export_students_bulk(self, ruts, programa, periodo, sheets_selection, custom_sheet_selection) -> None:
+        """Exporta un Excel por estudiante para varios RUTs o para un programa/periodo"""
+        try:
+            output_dir = select_output_directory(
+                title="Selecciona la carpeta donde guardar los archivos Excel"
+            )
+            
+            if not output_dir:
+                return  # Usuario canceló
+            
+            exporter = BulkExporter(self.db_connection, sheets_selection, custom_sheet_selection)
+            
+            result = exporter.export_students(
+                output_dir,
+                ruts=ruts,
+                programa_estudio=programa or None,
+                periodo=periodo or None,
+                as_zip=self.export_as_zip.get()
+            )
+            
+            message = (
+                f"Estudiantes exportados: {result['exported']}\n"
+                f"Tiempo: {result['seconds']:.1f} s ({result['students_per_second']:.1f} estudiantes/s)"
+            )
+            if result['not_found']:
+                message += f"\n\nRUTs no encontrados: {', '.join(result['not_found'])}"
+            messagebox.showinfo("Exportación Exitosa", message)
+            
+            location = result['files'][0] if self.export_as_zip.get() else str(output_dir)
+            self.show_export_success(f"{result['exported']} estudiantes", location)
+            
+        except ValueError as e:
+            messagebox.showerror("Error", f"✗ {str(e)}")
+        except Exception as e:
+            messagebox.showerror("Error", f"✗ Error al exportar: {str(e)}")
+
     def show_export_success(self, rut: str, file_path: str) -> None:
         
         for widget in self.root.winfo_children():
@@ -1,15 +1,26 @@
 import os
+import queue
 import subprocess
 import threading
+import time
 import tkinter as tk
 from aws.s3_uploader import S3Uploader
 from aws.job_monitor import JobMonitor
 from tkinter import filedialog, messagebox
 from factories.readers_factory import ReadersFactory
+from classes.readers.import_pipeline import ImportPipeline, ImportCancelled
+from classes.readers.import_report import ImportReport
+from classes.readers.pdf_reader.certificate_batch_reader import CertificateBatchReader
 from frontend.progress_window import ProgressWindow
 from frontend.buttons import create_back_button, create_exit_button, create_upload_button
 from mysql.connector import Error
 
+# Archivos desde este tamaño se cargan en modo streaming (commit por chunk)
+STREAMING_MIN_BYTES = 50 * 1024 * 1024
+
+# Cada cuántos milisegundos la GUI revisa la cola de progreso (~30 fps)
+PROGRESS_FRAME_MS = 33
+
 
 class FileLoaderGUI:
     """GUI para cargar archivos a la base de datos"""
@@ -118,52 +129,17 @@ class FileLoaderGUI:
         if self.main_menu:
             self.main_menu.create_menu()
     
-    def reset_debt_for_missing_students(self, reader):
-        """Resetea la deuda a 0 para estudiantes que NO estén en el reporte de morosidad"""
-        try:
-            # Obtener lista de RUTs del archivo cargado
-            ruts_in_report = set()
-            if hasattr(reader, 'df'):
-                # Para CSV readers
-                if 'rut' in reader.df.columns:
-                    ruts_in_report = set(reader.df['rut'].dropna().unique())
-                elif 'RUT' in reader.df.columns:
-                    ruts_in_report = set(reader.df['RUT'].dropna().unique())
-            
-            if ruts_in_report:
-                cursor = self.db_connection.cursor()
-                
-                # Crear lista de placeholders para SQL
-                placeholders = ','.join(['%s'] * len(ruts_in_report))
-                
-                # Actualizar deuda a 0 para estudiantes NO en el reporte
-                query = f"""
-                    UPDATE Reporte_financiero_estudiante 
-                    SET deuda_total = 0,
-                        deuda_matriculas = 0,
-                        deuda_colegiaturas = 0,
-                        otras_deudas = 0,
-                        cantidad_cuotas_pendientes_matriculas = 0,
-                        cantidad_cuotas_pendientes_colegiaturas = 0
-                    WHERE rut_estudiante NOT IN ({placeholders})
-                """
-                
-                cursor.execute(query, tuple(ruts_in_report))
-                self.db_connection.connection.commit()
-                
-                affected_rows = cursor.rowcount
-                print(f"✓ Deuda reseteada a 0 para {affected_rows} estudiante(s) no en el reporte")
-                
-                cursor.close()
-        
-        except Exception as e:
-            print(f"✗ Error al resetear deudas: {str(e)}")
-            try:
-                self.db_connection.connection.rollback()
-            except:
-                pass
+    def _close_debt_batch(self, reader, ruts_lote, lote_completo):
+        """
+        Marca el último reporte de morosidad del lote para que resetee, dentro
+        de su transacción, la deuda de los estudiantes que no aparecen en
+        ninguno de los archivos (ruts_lote: RUTs de los archivos ya cargados)
+        """
+        if lote_completo:
+            reader.ruts_del_lote = set(ruts_lote)
+        else:
+            print("→ No se resetean deudas: algún reporte de morosidad del lote no se cargó")
 
-    
     def select_files(self, file_type):
         """Abre explorador de archivos para seleccionar archivos"""
         file_info = self.file_types[file_type]
@@ -180,50 +156,147 @@ class FileLoaderGUI:
             messagebox.showwarning("Cancelado", "No se seleccionaron archivos")
     
     def process_files(self, file_type, files):
-        """Procesa los archivos seleccionados"""
+        """Procesa los archivos seleccionados en un hilo de trabajo"""
         if not files:
             return
         
+        events = queue.Queue()
+        cancel_event = threading.Event()
+        self._progress_window = None
+        # Métricas de toda la carga (se combinan las de cada archivo)
+        report = ImportReport(file_type)
+        
+        threading.Thread(
+            target=self._import_files,
+            args=(file_type, files, events, cancel_event, report),
+            daemon=True
+        ).start()
+        
+        self.root.after(PROGRESS_FRAME_MS, self._drain_events, events, cancel_event)
+    
+    def _drain_events(self, events, cancel_event):
+        """Aplica en la GUI los eventos que publica el hilo de carga (una vez por frame)"""
+        pending_row = None
+        
+        while True:
+            try:
+                event, *data = events.get_nowait()
+            except queue.Empty:
+                break
+            
+            if event == "progress":
+                # Solo interesa el último valor recibido en este frame
+                pending_row = data[0]
+                continue
+            
+            if pending_row is not None and self._progress_window:
+                self._progress_window.update(pending_row)
+            pending_row = None
+            
+            if event == "start":
+                total, filename, unit = data
+                self._progress_window = ProgressWindow(
+                    self.root, total, filename, on_cancel=cancel_event.set, unit=unit
+                )
+            elif event == "end":
+                if self._progress_window:
+                    self._progress_window.close()
+                    self._progress_window = None
+            elif event == "done":
+                self.show_result_summary(*data)
+                return
+        
+        if pending_row is not None and self._progress_window:
+            self._progress_window.update(pending_row)
+        
+        self.root.after(PROGRESS_FRAME_MS, self._drain_events, events, cancel_event)
+    
+    def _use_pipeline(self, files) -> bool:
+        """Varios archivos que caben en memoria se leen en paralelo con ImportPipeline"""
+        if len(files) < 2:
+            return False
+        try:
+            return all(os.path.getsize(file_path) < STREAMING_MIN_BYTES for file_path in files)
+        except OSError:
+            return False
+    
+    def _import_files(self, file_type, files, events, cancel_event, report):
+        """Carga los archivos (se ejecuta fuera del hilo de Tk; solo publica eventos)"""
+        if file_type == "certificado_pdf" and len(files) > 1:
+            self._import_certificates(files, events, cancel_event, report)
+            return
+        
+        if self._use_pipeline(files):
+            self._import_files_pipeline(file_type, files, events, cancel_event, report)
+            return
+        
         total_files = len(files)
         success_count = 0
         error_messages = []
+        # RUTs de los reportes de morosidad ya cargados en este lote
+        ruts_lote = set()
         
         for idx, file_path in enumerate(files, 1):
-            progress_window = None
+            if cancel_event.is_set():
+                error_messages.append(f"{os.path.basename(file_path)}: carga cancelada por el usuario")
+                continue
+            
             try:
                 # Crear reader usando la factory
-                reader = ReadersFactory.create_reader(file_type, file_path, self.db_connection)
+                streaming = os.path.getsize(file_path) >= STREAMING_MIN_BYTES
+                reader = ReadersFactory.create_reader(file_type, file_path, self.db_connection, streaming=streaming)
+                
+                # El último reporte de morosidad resetea la deuda del resto
+                if file_type == "reporte_morosidad" and idx == total_files:
+                    self._close_debt_batch(reader, ruts_lote, success_count == total_files - 1)
                 
                 # Obtener total de filas usando el método polimórfico
                 total_rows = reader.get_total_rows()
                 
-                # Crear ventana de progreso
-                progress_window = ProgressWindow(self.root, total_rows, os.path.basename(file_path))
+                # Pedir a la GUI que cree la ventana de progreso
+                events.put(("start", total_rows, os.path.basename(file_path), "filas procesadas"))
+                
+                # Publicar el progreso en ~500 pasos para no saturar la cola
+                step = max(1, total_rows // 500)
                 
-                # Callback para actualizar progreso
                 def update_progress(current_row):
-                    progress_window.update(current_row)
+                    if cancel_event.is_set():
+                        raise ImportCancelled("Carga cancelada por el usuario")
+                    if current_row % step == 0 or current_row >= total_rows:
+                        events.put(("progress", current_row))
                 
                 # Ejecutar UPSERT con progreso
                 reader._process_and_upsert(progress_callback=update_progress)
                 
                 # Confirmar cambios
-                self.db_connection.connection.commit()
+                with reader.report.stage("commit"):
+                    self.db_connection.commit()
+                reader.log_summary()
+                report.merge(reader.report)
                 
-                # Si es reporte de morosidad, resetear deuda del resto
                 if file_type == "reporte_morosidad":
-                    self.reset_debt_for_missing_students(reader)
+                    ruts_lote.update(reader.ruts_en_reporte)
                 
                 success_count += 1
                 print(f"✓ Archivo {idx}/{total_files} cargado exitosamente")
             
+            except ImportCancelled as e:
+                error_msg = f"{os.path.basename(file_path)}: {str(e)}"
+                error_messages.append(error_msg)
+                print(f"✗ {error_msg}")
+                # Deshacer lo que no alcanzó a confirmarse
+                try:
+                    self.db_connection.rollback()
+                except:
+                    pass
+            
             except FileNotFoundError:
                 error_msg = f"Archivo no encontrado: {os.path.basename(file_path)}"
                 error_messages.append(error_msg)
                 print(f"✗ {error_msg}")
                 # Deshacer cambios si hay error
                 try:
-                    self.db_connection.connection.rollback()
+                    self.db_connection.rollback()
                 except:
                     pass
                 
@@ -236,7 +309,7 @@ class FileLoaderGUI:
                     print(f"✗ {error_msg}")
                     # Deshacer cambios
                     try:
-                        self.db_connection.connection.rollback()
+                        self.db_connection.rollback()
                     except:
                         pass
                     # Interrumpir el procesamiento
@@ -246,7 +319,7 @@ class FileLoaderGUI:
                     error_messages.append(error_msg)
                     print(f"✗ {error_msg}")
                     try:
-                        self.db_connection.connection.rollback()
+                        self.db_connection.rollback()
                     except:
                         pass
                 
@@ -256,19 +329,124 @@ class FileLoaderGUI:
                 print(f"✗ {error_msg}")
                 # Deshacer cambios
                 try:
-                    self.db_connection.connection.rollback()
+                    self.db_connection.rollback()
                 except:
                     pass
                 
             finally:
                 # Cerrar ventana de progreso
-                if progress_window:
-                    progress_window.close()
+                events.put(("end",))
         
         # Mostrar resumen
-        self.show_result_summary(success_count, total_files, error_messages)
+        events.put(("done", success_count, total_files, error_messages, self._finish_report(report)))
     
-    def show_result_summary(self, success_count, total_files, error_messages):
+    def _import_certificates(self, files, events, cancel_event, report):
+        """Carga varios certificados PDF en paralelo con un único upsert de estudiantes"""
+        total_files = len(files)
+        success_count = 0
+        error_messages = []
+        
+        reader = CertificateBatchReader(files, self.db_connection)
+        events.put(("start", total_files, f"{total_files} certificados", "certificados procesados"))
+        
+        def update_progress(current):
+            if cancel_event.is_set():
+                raise ImportCancelled("Carga cancelada por el usuario")
+            events.put(("progress", current))
+        
+        try:
+            reader._process_and_upsert(progress_callback=update_progress)
+            with reader.report.stage("commit"):
+                self.db_connection.commit()
+            reader.log_summary()
+            reader.report.files = total_files - len(reader.errores_por_archivo)
+            report.merge(reader.report)
+            
+            success_count = total_files - len(reader.errores_por_archivo)
+            for file_path, error in reader.errores_por_archivo.items():
+                error_messages.append(f"{os.path.basename(file_path)}: {str(error)}")
+            print(f"✓ {success_count}/{total_files} certificados cargados exitosamente")
+        
+        except Exception as e:
+            error_msg = f"Certificados: {str(e)}"
+            error_messages.append(error_msg)
+            print(f"✗ {error_msg}")
+            # Deshacer cambios
+            try:
+                self.db_connection.rollback()
+            except:
+                pass
+        
+        finally:
+            events.put(("end",))
+        
+        events.put(("done", success_count, total_files, error_messages, self._finish_report(report)))
+    
+    def _import_files_pipeline(self, file_type, files, events, cancel_event, report):
+        """Carga varios archivos con lectura en paralelo y escritura sobre el pool"""
+        total_files = len(files)
+        events.put(("start", total_files, f"{total_files} archivos", "archivos procesados"))
+        
+        pipeline = ImportPipeline(file_type, files, self.db_connection, cancel_event=cancel_event)
+        before_write = after_write = None
+        
+        if file_type == "reporte_morosidad":
+            # Los readers exclusivos se escriben de a uno y en orden de selección
+            ruts_lote = set()
+            cargados = []
+            
+            def before_write(reader):
+                if reader.file_path == files[-1]:
+                    self._close_debt_batch(reader, ruts_lote, len(cargados) == total_files - 1)
+            
+            def after_write(reader):
+                ruts_lote.update(reader.ruts_en_reporte)
+                cargados.append(reader.file_path)
+        
+        try:
+            results = pipeline.run(
+                before_write=before_write,
+                after_write=after_write,
+                on_progress=lambda done: events.put(("progress", done))
+            )
+        finally:
+            events.put(("end",))
+        report.merge(pipeline.report)
+        
+        success_count = 0
+        error_messages = []
+        for file_path, error in results:
+            if error is None:
+                success_count += 1
+                continue
+            if isinstance(error, FileNotFoundError):
+                error_msg = f"Archivo no encontrado: {os.path.basename(file_path)}"
+            else:
+                error_msg = f"{os.path.basename(file_path)}: {str(error)}"
+            error_messages.append(error_msg)
+            print(f"✗ {error_msg}")
+        
+        print(f"✓ {success_count}/{total_files} archivos cargados exitosamente")
+        events.put(("done", success_count, total_files, error_messages, self._finish_report(report)))
+    
+    def _finish_report(self, report):
+        """Cierra las métricas de la carga, las muestra en consola y opcionalmente las guarda en JSON"""
+        report.finish()
+        for line in report.summary_lines():
+            print(line)
+        
+        report_dir = os.getenv('IMPORT_REPORT_DIR')
+        if report_dir:
+            try:
+                os.makedirs(report_dir, exist_ok=True)
+                path = os.path.join(report_dir, f"importacion_{time.strftime('%Y%m%d_%H%M%S')}_{report.nombre}.json")
+                report.dump_json(path)
+                print(f"✓ Métricas de la carga guardadas en {path}")
+            except OSError as e:
+                print(f"✗ No se pudieron guardar las métricas de la carga: {str(e)}")
+        return report
+    
+    def show_result_summary(self, success_count, total_files, error_messages, report=None):
         """Muestra resumen de resultados en la ventana principal"""
         # Limpiar la ventana principal
         for widget in self.root.winfo_children():
@@ -296,7 +474,18 @@ class FileLoaderGUI:
             pady=10
         )
         info_label.pack()
-        
+
+        # Métricas de rendimiento de la carga
+        if report is not None and report.rows:
+            metrics_label = tk.Label(
+                self.root,
+                text="\n".join(report.summary_lines()),
+                font=("Courier", 9),
+                justify=tk.LEFT,
+                fg="gray30"
+            )
+            metrics_label.pack(pady=5)
+
         # Area de texto para errores
         if error_messages:
             errors_label = tk.Label(
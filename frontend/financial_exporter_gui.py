@@ -16,7 +16,7 @@ class FinancialExporterGUI:
         self.root = root
         self.db_connection = db_connection
         self.main_menu = main_menu
-        self.exporter = FinancialDataExporter(db_connection)
+        self.exporter = FinancialDataExporter(db_connection, streaming=True)
 
     def show_financial_export(self):
         """
@@ -60,6 +60,39 @@ class FinancialExporterGUI:
         )
         info_label.pack(pady=20)
 
+        # Filtros (opcionales)
+        filters_frame = tk.LabelFrame(
+            main_frame,
+            text="Filtros (opcionales)",
+            font=("Arial", 10),
+            padx=20,
+            pady=5
+        )
+        filters_frame.pack(pady=5)
+
+        tk.Label(filters_frame, text="Programa:", font=("Arial", 10)).grid(row=0, column=0, sticky=tk.W)
+        self.programa_entry = tk.Entry(filters_frame, font=("Arial", 10), width=30)
+        self.programa_entry.grid(row=0, column=1, padx=5, pady=2)
+
+        tk.Label(filters_frame, text="Deuda mínima ($):", font=("Arial", 10)).grid(row=1, column=0, sticky=tk.W)
+        self.deuda_minima_entry = tk.Entry(filters_frame, font=("Arial", 10), width=14)
+        self.deuda_minima_entry.grid(row=1, column=1, padx=5, pady=2, sticky=tk.W)
+
+        tk.Label(filters_frame, text="Solo los N con más deuda:", font=("Arial", 10)).grid(row=2, column=0, sticky=tk.W)
+        self.top_n_entry = tk.Entry(filters_frame, font=("Arial", 10), width=8)
+        self.top_n_entry.grid(row=2, column=1, padx=5, pady=2, sticky=tk.W)
+
+        # La sede solo se ofrece si la base de datos la registra
+        self.sede_entry = None
+        try:
+            has_sede = self.exporter.has_sede_column()
+        except Exception:
+            has_sede = False
+        if has_sede:
+            tk.Label(filters_frame, text="Sede:", font=("Arial", 10)).grid(row=3, column=0, sticky=tk.W)
+            self.sede_entry = tk.Entry(filters_frame, font=("Arial", 10), width=30)
+            self.sede_entry.grid(row=3, column=1, padx=5, pady=2)
+
         # Botón exportar
         export_button = tk.Button(
             main_frame,
@@ -96,9 +129,15 @@ class FinancialExporterGUI:
         if not output_dir:
             return  # Usuario canceló
 
+        try:
+            filtros = self._get_filters()
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+
         try:
             # Exportar
-            file_path = self.exporter.export_financial_data(Path(output_dir))
+            file_path = self.exporter.export_financial_data(Path(output_dir), **filtros)
 
             # Mostrar mensaje de éxito
             result = messagebox.askyesno(
@@ -118,3 +157,27 @@ class FinancialExporterGUI:
                 "Error",
                 f"Ocurrió un error al exportar los datos:\n{str(e)}"
             )
+
+    def _get_filters(self) -> dict:
+        """
+        Lee los filtros del formulario (vacío = sin filtro).
+
+        Raises:
+            ValueError: si la deuda mínima o la cantidad no son números válidos
+        """
+        programa = self.programa_entry.get().strip()
+        sede = self.sede_entry.get().strip() if self.sede_entry else ""
+        deuda_minima = self.deuda_minima_entry.get().strip().replace("$", "").replace(".", "").replace(",", "")
+        top_n = self.top_n_entry.get().strip()
+
+        if deuda_minima and not deuda_minima.isdigit():
+            raise ValueError("La deuda mínima debe ser un monto entero (ej: 500000)")
+        if top_n and (not top_n.isdigit() or int(top_n) == 0):
+            raise ValueError("La cantidad de estudiantes debe ser un número entero mayor que 0")
+
+        return {
+            "sede": sede or None,
+            "programa": programa or None,
+            "deuda_minima": int(deuda_minima) if deuda_minima else None,
+            "top_n": int(top_n) if top_n else None,
+        }
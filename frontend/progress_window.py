@@ -6,7 +6,7 @@ import time
 class ProgressWindow:
     """Ventana de progreso para mostrar el avance de la carga"""
     
-    def __init__(self, parent, total_rows, filename):
+    def __init__(self, parent, total_rows, filename, on_cancel=None, unit="filas procesadas"):
         self.window = tk.Toplevel(parent)
         self.window.title("Procesando archivo...")
         self.window.geometry("500x200")
@@ -16,6 +16,8 @@ class ProgressWindow:
         
         self.total_rows = total_rows
         self.current_row = 0
+        self.on_cancel = on_cancel
+        self.unit = unit
         self.start_time = time.time()
         
         # Nombre del archivo
@@ -37,7 +39,7 @@ class ProgressWindow:
         # Texto de progreso
         self.progress_label = tk.Label(
             self.window,
-            text=f"0 / {total_rows} filas procesadas",
+            text=f"0 / {total_rows} {unit}",
             font=("Arial", 10)
         )
         self.progress_label.pack(pady=5)
@@ -58,6 +60,22 @@ class ProgressWindow:
             font=("Arial", 12, "bold")
         )
         self.percent_label.pack(pady=10)
+        
+        # Botón cancelar (solo si hay quien atienda la cancelación)
+        self.cancel_button = None
+        if on_cancel:
+            self.window.geometry("500x240")
+            self.cancel_button = tk.Button(
+                self.window,
+                text="Cancelar",
+                font=("Arial", 10),
+                bg="#f44336",
+                fg="white",
+                width=12,
+                command=self.cancel
+            )
+            self.cancel_button.pack(pady=5)
+            self.window.protocol("WM_DELETE_WINDOW", self.cancel)
     
     def update(self, current_row):
         """Actualiza el progreso"""
@@ -66,7 +84,7 @@ class ProgressWindow:
         
         # Actualizar texto
         percent = (current_row / self.total_rows) * 100 if self.total_rows > 0 else 0
-        self.progress_label.config(text=f"{current_row} / {self.total_rows} filas procesadas")
+        self.progress_label.config(text=f"{current_row} / {self.total_rows} {self.unit}")
         self.percent_label.config(text=f"{percent:.1f}%")
         
         # Calcular tiempo estimado
@@ -84,8 +102,13 @@ class ProgressWindow:
                 time_text = f"Tiempo estimado restante: {minutes}m {seconds}s"
             
             self.time_label.config(text=time_text)
-        
-        self.window.update()
+    
+    def cancel(self):
+        """Solicita cancelar la carga en curso"""
+        if self.cancel_button:
+            self.cancel_button.config(state=tk.DISABLED, text="Cancelando...")
+        if self.on_cancel:
+            self.on_cancel()
     
     def close(self):
         """Cierra la ventana"""
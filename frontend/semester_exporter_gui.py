@@ -16,7 +16,7 @@ class SemesterExporterGUI:
         self.root = root
         self.db_connection = db_connection
         self.main_menu = main_menu
-        self.exporter = SemesterRangeExporter(db_connection)
+        self.exporter = SemesterRangeExporter(db_connection, streaming=True)
         
     def show_semester_selector(self):
         """
@@ -150,21 +150,11 @@ class SemesterExporterGUI:
         """
         Obtiene la lista de semestres disponibles en la base de datos.
         """
-        cursor = self.db_connection.cursor(dictionary=True)
-        
         try:
-            query = """
-                SELECT DISTINCT periodo 
-                FROM Semestre
-                ORDER BY periodo
-            """
-            cursor.execute(query)
-            return [row['periodo'] for row in cursor.fetchall()]
+            return [periodo for periodo, _ in self.exporter.get_available_semestres()]
         except Exception as e:
             print(f"Error obteniendo semestres: {e}")
             return []
-        finally:
-            cursor.close()
 
     def _handle_export(self):
         """
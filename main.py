@@ -9,11 +9,14 @@ import os
 import config_loader
 import signal
 import sys
+import multiprocessing
+from utils.log_config import configure_logging
 
 from frontend.main_menu_gui import MainMenu
 
 # Cargar configuración desde .env.encrypted
 config_loader.load_config()
+configure_logging()
 
 def cleanup(db_connection, root):
     """Cierra conexión y limpia recursos"""
@@ -28,6 +31,9 @@ def cleanup(db_connection, root):
         sys.exit(0)
 
 if __name__ == "__main__":
+    # Necesario para el ProcessPoolExecutor de la carga en el ejecutable de PyInstaller
+    multiprocessing.freeze_support()
+
     # Crear conexión a la base de datos
     try:
         print(f"[MAIN] Python ejecutándose desde: {sys.executable}")
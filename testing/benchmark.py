@@ -0,0 +1,426 @@
+"""
+benchmark.py - Benchmarks de readers y exportadores con los archivos de data/
+==============================================================================
+
+Mide rendimiento (filas/s) y memoria máxima (tracemalloc) de cada reader de
+ReadersFactory sobre los CSV de data/ y sobre copias sintéticas escaladas
+(x10, x100: las filas se repiten con RUT / código de asignatura distintos,
+así cada copia agrega claves nuevas). Con --mysql también mide Exporter,
+SemesterRangeExporter y FinancialDataExporter sobre los datos cargados.
+
+Backends:
+- Por defecto, una base de datos en memoria (InMemoryDatabase) que aplica los
+  upserts sobre diccionarios: mide el costo del lado Python (lectura,
+  transformación y armado de sentencias), sin red ni MySQL. Los exportadores
+  necesitan MySQL y se omiten.
+- --mysql: usa DatabaseConnection con las variables de .env. ESCRIBE en la
+  base de datos: usar una base de pruebas (BENCH_DB_NAME reemplaza a DB_NAME).
+
+Ejecutar con:
+    python -m testing.benchmark
+    python -m testing.benchmark --scales 1 10 100 --output bench.json
+    python -m testing.benchmark --baseline bench.json      # falla si hay regresiones
+    python -m testing.benchmark --mysql --scales 1 10
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import os
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+# Agregar el directorio padre al path para importar módulos del proyecto
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from classes.readers.reader import UPSERT_TABLES
+from factories.readers_factory import ReadersFactory
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+# (tipo de reader, archivo, columna que se altera en cada copia escalada)
+SAMPLES = [
+    ("seguimiento_alumnos", "Seguimiento de Alumnos.csv", "Rut Alumno"),
+    ("situacion_academica", "Situación Académica.csv", "RUT"),
+    ("asignaturas_criticas", "Asignaturas Críticas.csv", "CODIGO ASIGNATURA"),
+    ("reporte_morosidad", "REPORTE MOROSIDAD ALUMNOS ENERO 2026(Sheet1).csv", "Rut Alumno"),
+]
+
+# Tolerancia por defecto al comparar con una línea base (20%)
+DEFAULT_TOLERANCE = 0.20
+
+
+# --- BASE DE DATOS EN MEMORIA ---
+
+class _InMemoryCursor:
+    _INSERT = re.compile(r"INSERT INTO (\w+) \(([^)]*)\)")
+
+    def __init__(self, db):
+        self.db = db
+        self.rowcount = 0
+        self._rows = []
+
+    def execute(self, query, params=None):
+        self.db.queries += 1
+        self._rows = []
+        self.rowcount = 0
+        params = list(params or ())
+
+        insert = self._INSERT.search(query)
+        if insert and "ON DUPLICATE KEY UPDATE" in query:
+            table = insert.group(1)
+            columns = [column.strip() for column in insert.group(2).split(",")]
+            n_keys = len(UPSERT_TABLES[table][0]) if table in UPSERT_TABLES else 1
+            rows = self.db.tables.setdefault(table, {})
+            for start in range(0, len(params), len(columns)):
+                values = params[start:start + len(columns)]
+                key = tuple(values[:n_keys])
+                # Filas afectadas como MySQL: 1 por creada, 2 por actualizada, 0 sin cambios
+                if key not in rows:
+                    rows[key] = list(values[n_keys:])
+                    self.rowcount += 1
+                    continue
+                current = rows[key]
+                merged = [old if value is None else value for value, old in zip(values[n_keys:], current)]
+                if merged != current:
+                    rows[key] = merged
+                    self.rowcount += 2
+
+    def fetchall(self):
+        return self._rows
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def close(self):
+        pass
+
+
+class _InMemoryConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self, **kwargs):
+        return _InMemoryCursor(self.db)
+
+    def commit(self):
+        self.db.commits += 1
+
+    def rollback(self):
+        pass
+
+
+class InMemoryDatabase:
+    """
+    Sustituto en proceso de DatabaseConnection para los benchmarks de readers:
+    aplica los INSERT ... ON DUPLICATE KEY UPDATE sobre diccionarios e informa
+    las filas afectadas como MySQL. El resto de las sentencias no hace nada.
+    """
+
+    pool_size = 1
+
+    def __init__(self):
+        self.tables = {}
+        self.queries = 0
+        self.commits = 0
+        self._known_semestres = set()
+        self._pending_semestres = set()
+        self.connection = _InMemoryConnection(self)
+
+    def cursor(self, **kwargs):
+        return self.connection.cursor(**kwargs)
+
+    def known_semestres(self) -> set:
+        return self._known_semestres | self._pending_semestres
+
+    def add_pending_semestres(self, periodos) -> None:
+        self._pending_semestres.update(periodos)
+
+    def commit(self):
+        self.connection.commit()
+        self._known_semestres |= self._pending_semestres
+        self._pending_semestres = set()
+
+    def rollback(self):
+        self._pending_semestres = set()
+
+    @contextlib.contextmanager
+    def transaction(self):
+        yield self.connection
+        self.commit()
+
+
+# --- DATOS ESCALADOS ---
+
+def _scale_value(column: str, value: str, copia: int) -> str:
+    """Valor de la columna clave para la copia n (la copia 0 es el original)"""
+    if copia == 0 or not value:
+        return value
+    if column == "CODIGO ASIGNATURA":
+        return f"{value}{copia:02d}"
+    # RUT con o sin dígito verificador: se desplaza el número
+    cuerpo, guion, dv = value.partition("-")
+    if not cuerpo.isdigit():
+        return value
+    return f"{(int(cuerpo) + copia * 30_000_001) % 100_000_000}{guion}{dv}"
+
+
+def build_scaled_file(file_type: str, source: Path, key_column: str, factor: int, target_dir: Path) -> Path:
+    """Crea una copia de source con sus filas repetidas factor veces"""
+    if factor == 1:
+        return source
+
+    reader = ReadersFactory.create_reader(file_type, str(source), None)
+    target = target_dir / f"x{factor}_{source.name}"
+
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        lines = f.read().splitlines(keepends=True)
+
+    encabezado = lines[:reader.SKIPROWS + 1]
+    columnas = next(csv.reader([encabezado[-1].lstrip("﻿")], delimiter=reader.DELIMITER))
+    key_index = columnas.index(key_column)
+    filas = list(csv.reader(lines[reader.SKIPROWS + 1:], delimiter=reader.DELIMITER))
+
+    with open(target, "w", encoding="utf-8", newline="") as f:
+        f.writelines(encabezado)
+        writer = csv.writer(f, delimiter=reader.DELIMITER, lineterminator="\n")
+        for copia in range(factor):
+            for fila in filas:
+                if len(fila) > key_index:
+                    fila = list(fila)
+                    fila[key_index] = _scale_value(key_column, fila[key_index], copia)
+                writer.writerow(fila)
+    return target
+
+
+# --- MEDICIÓN ---
+
+def _measure(run, repeat: int) -> dict:
+    """
+    Ejecuta run() repeat veces y toma el mejor tiempo; luego una vez más con
+    tracemalloc para la memoria máxima (tracemalloc agrega costo y no se
+    mezcla con el tiempo).
+    """
+    best = None
+    resultado = None
+    for _ in range(repeat):
+        inicio = time.perf_counter()
+        resultado = run()
+        elapsed = time.perf_counter() - inicio
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"seconds": best, "peak_mb": peak / (1024 * 1024), "result": resultado}
+
+
+def bench_reader(file_type: str, path: Path, db_factory, repeat: int) -> dict:
+    def run():
+        db = db_factory()
+        reader = ReadersFactory.create_reader(file_type, str(path), db)
+        with contextlib.redirect_stdout(io.StringIO()):
+            reader._process_and_upsert()
+            db.commit()
+        return reader
+
+    medicion = _measure(run, repeat)
+    reader = medicion.pop("result")
+    items = reader.report.rows
+    return {
+        **medicion,
+        "items": items,
+        "unit": "filas",
+        "items_per_second": items / medicion["seconds"] if medicion["seconds"] > 0 else 0.0,
+        "queries": sum(stats["count"] for stats in reader.report.queries.values()),
+        "stages": {name: round(seconds, 4) for name, seconds in reader.report.stages.items()},
+    }
+
+
+def bench_exporters(db, output_dir: Path, repeat: int, students: int = 20) -> list:
+    """Exportadores sobre los datos ya cargados en MySQL"""
+    from classes.export.exporter import Exporter
+    from classes.export.financial_data_exporter import FinancialDataExporter
+    from classes.export.semester_range_exporter import SemesterRangeExporter
+
+    cursor = db.cursor()
+    try:
+        cursor.execute("SELECT rut FROM Estudiante ORDER BY rut LIMIT %s", (students,))
+        ruts = [row[0] for row in cursor.fetchall()]
+    finally:
+        cursor.close()
+    periodos = [periodo for periodo, _ in SemesterRangeExporter(db).get_available_semestres()]
+
+    resultados = []
+    sheet_selection = {"general": True, "academic": True, "financial": True, "notas_media": True}
+
+    def exportar_estudiantes():
+        exporter = Exporter(db, sheet_selection, {})
+        for rut in ruts:
+            exporter.export_student_by_rut(rut, output_dir)
+        return len(ruts)
+
+    casos = [("Exporter", "estudiantes", exportar_estudiantes)] if ruts else []
+    if periodos:
+        for streaming in (False, True):
+            casos.append((
+                f"SemesterRangeExporter{' (streaming)' if streaming else ''}", "semestres",
+                lambda streaming=streaming: (
+                    SemesterRangeExporter(db, streaming=streaming)
+                    .export_by_semester_range(periodos[0], periodos[-1], output_dir),
+                    len(periodos)
+                )[1]
+            ))
+    for streaming in (False, True):
+        casos.append((
+            f"FinancialDataExporter{' (streaming)' if streaming else ''}", "archivos",
+            lambda streaming=streaming: (
+                FinancialDataExporter(db, streaming=streaming).export_financial_data(output_dir), 1
+            )[1]
+        ))
+
+    for nombre, unidad, run in casos:
+        def run_quiet(run=run):
+            with contextlib.redirect_stdout(io.StringIO()):
+                return run()
+        try:
+            medicion = _measure(run_quiet, repeat)
+        except Exception as e:
+            print(f"✗ {nombre}: {str(e)}")
+            continue
+        items = medicion.pop("result")
+        resultados.append({
+            "benchmark": nombre,
+            "scale": None,
+            **medicion,
+            "items": items,
+            "unit": unidad,
+            "items_per_second": items / medicion["seconds"] if medicion["seconds"] > 0 else 0.0,
+        })
+    return resultados
+
+
+# --- COMPARACIÓN CON LÍNEA BASE ---
+
+def compare(results: list, baseline: dict, tolerance: float) -> list:
+    """Retorna las regresiones respecto a baseline (menos items/s o más memoria)"""
+    anteriores = {(r["benchmark"], r["scale"]): r for r in baseline.get("results", [])}
+    regresiones = []
+    for r in results:
+        anterior = anteriores.get((r["benchmark"], r["scale"]))
+        if not anterior:
+            continue
+        if r["items_per_second"] < anterior["items_per_second"] * (1 - tolerance):
+            regresiones.append(
+                f"{r['benchmark']} x{r['scale']}: {r['items_per_second']:.0f} {r['unit']}/s "
+                f"(antes {anterior['items_per_second']:.0f})"
+            )
+        if r["peak_mb"] > anterior["peak_mb"] * (1 + tolerance):
+            regresiones.append(
+                f"{r['benchmark']} x{r['scale']}: {r['peak_mb']:.1f} MB de memoria máxima "
+                f"(antes {anterior['peak_mb']:.1f})"
+            )
+    return regresiones
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks de readers y exportadores")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10], help="Factores de escala (1 = archivo original)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones por benchmark (se toma el mejor tiempo)")
+    parser.add_argument("--readers", nargs="+", default=None, help="Tipos de reader a medir (todos por defecto)")
+    parser.add_argument("--mysql", action="store_true", help="Usar MySQL (.env / BENCH_DB_NAME) en vez de la BD en memoria")
+    parser.add_argument("--output", help="Guardar los resultados en este JSON")
+    parser.add_argument("--baseline", help="JSON de una ejecución anterior para detectar regresiones")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE, help="Tolerancia de la comparación (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    if args.mysql:
+        try:
+            from dotenv import load_dotenv
+            load_dotenv(dotenv_path=Path(__file__).parent.parent / ".env")
+        except ImportError:
+            pass
+        from database.db_connection import DatabaseConnection
+        db = DatabaseConnection(database=os.getenv("BENCH_DB_NAME"))
+        with contextlib.redirect_stdout(io.StringIO()):
+            conectado = db.connect()
+        if not conectado:
+            print("✗ No se pudo conectar a MySQL")
+            return 2
+        db_factory = lambda: db
+        backend = f"mysql://{db.host}:{db.port}/{db.database}"
+    else:
+        db_factory = InMemoryDatabase
+        backend = "memoria"
+
+    work_dir = Path(tempfile.mkdtemp(prefix="bench_"))
+    results = []
+    try:
+        for file_type, filename, key_column in SAMPLES:
+            if args.readers and file_type not in args.readers:
+                continue
+            for scale in args.scales:
+                path = build_scaled_file(file_type, DATA_DIR / filename, key_column, scale, work_dir)
+                resultado = {"benchmark": file_type, "scale": scale,
+                             **bench_reader(file_type, path, db_factory, args.repeat)}
+                results.append(resultado)
+                print(f"✓ {file_type} x{scale}: {resultado['items']} filas, "
+                      f"{resultado['items_per_second']:.0f} filas/s, {resultado['peak_mb']:.1f} MB, "
+                      f"{resultado['queries']} consultas")
+
+        if args.mysql:
+            for resultado in bench_exporters(db, work_dir, args.repeat):
+                results.append(resultado)
+                print(f"✓ {resultado['benchmark']}: {resultado['items']} {resultado['unit']} en "
+                      f"{resultado['seconds']:.2f}s, {resultado['peak_mb']:.1f} MB")
+        else:
+            print("→ Exportadores omitidos: requieren MySQL (--mysql)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+        if args.mysql:
+            db.disconnect()
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "backend": backend,
+        "results": [{k: (round(v, 4) if isinstance(v, float) else v) for k, v in r.items()} for r in results],
+    }
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(informe, f, ensure_ascii=False, indent=2)
+        print(f"✓ Resultados guardados en {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regresiones = compare(results, json.load(f), args.tolerance)
+        if regresiones:
+            print("✗ Regresiones detectadas:")
+            for regresion in regresiones:
+                print(f"   {regresion}")
+            return 1
+        print("✓ Sin regresiones respecto a la línea base")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+Tests de las piezas del benchmark (testing/benchmark.py)
+========================================================
+
+Ejecutar con:
+    python -m pytest testing/test_benchmark.py -v
+"""
+
+from testing.benchmark import InMemoryDatabase, _scale_value, build_scaled_file, compare
+
+
+def test_base_en_memoria_informa_filas_afectadas_como_mysql():
+    db = InMemoryDatabase()
+    cursor = db.cursor()
+    query = (
+        "INSERT INTO Estudiante (rut, nombre, deuda) VALUES (%s, %s, %s), (%s, %s, %s) "
+        "ON DUPLICATE KEY UPDATE nombre = COALESCE(VALUES(nombre), nombre)"
+    )
+
+    cursor.execute(query, ["1-9", "Ana", 10, "2-7", "Luis", None])
+    assert cursor.rowcount == 2
+    # 1-9 sin cambios (None no pisa), 2-7 actualizada
+    cursor.execute(query, ["1-9", None, 10, "2-7", "Luis", 5])
+    assert cursor.rowcount == 2
+    assert db.tables["Estudiante"] == {("1-9",): ["Ana", 10], ("2-7",): ["Luis", 5]}
+
+
+def test_semestres_pendientes_solo_se_conocen_tras_el_commit():
+    db = InMemoryDatabase()
+    db.add_pending_semestres({"2025-otoño"})
+    db.rollback()
+    assert db.known_semestres() == set()
+
+    with db.transaction():
+        db.add_pending_semestres({"2025-otoño"})
+    assert db.known_semestres() == {"2025-otoño"}
+    assert db.commits == 1
+
+
+def test_copias_escaladas_no_repiten_claves(tmp_path):
+    assert _scale_value("Rut Alumno", "12345678-K", 0) == "12345678-K"
+    assert _scale_value("Rut Alumno", "12345678-K", 1) == "42345679-K"
+    assert _scale_value("CODIGO ASIGNATURA", "MAT101", 3) == "MAT10103"
+
+    fuente = tmp_path / "morosidad.csv"
+    fuente.write_text("Rut Alumno,Semestre\n11111111-1,OTOÑO 2025\n22222222-2,OTOÑO 2025\n", encoding="utf-8")
+
+    escalado = build_scaled_file("reporte_morosidad", fuente, "Rut Alumno", 3, tmp_path)
+
+    lineas = escalado.read_text(encoding="utf-8").splitlines()
+    assert lineas[0] == "Rut Alumno,Semestre"
+    ruts = [linea.split(",")[0] for linea in lineas[1:]]
+    assert len(ruts) == len(set(ruts)) == 6
+    assert build_scaled_file("reporte_morosidad", fuente, "Rut Alumno", 1, tmp_path) == fuente
+
+
+def test_compare_reporta_regresiones_fuera_de_la_tolerancia():
+    baseline = {"results": [
+        {"benchmark": "seguimiento_alumnos", "scale": 1, "items_per_second": 1000, "peak_mb": 10.0},
+    ]}
+    resultado = {"benchmark": "seguimiento_alumnos", "scale": 1, "unit": "filas", "items_per_second": 850, "peak_mb": 11.0}
+
+    assert compare([resultado], baseline, 0.20) == []
+    assert compare([dict(resultado, items_per_second=700, peak_mb=13.0)], baseline, 0.20) == [
+        "seguimiento_alumnos x1: 700 filas/s (antes 1000)",
+        "seguimiento_alumnos x1: 13.0 MB de memoria máxima (antes 10.0)",
+    ]
+    # Sin línea base para la escala no hay comparación
+    assert compare([dict(resultado, scale=10, items_per_second=1)], baseline, 0.20) == []
@@ -0,0 +1,113 @@
+"""
+Tests de la carga de varios certificados PDF (CertificateBatchReader)
+=====================================================================
+
+No requieren MySQL ni PDFs: la extracción se reemplaza por datos fijos y
+el pool de procesos por uno de hilos.
+
+Ejecutar con:
+    python -m pytest testing/test_certificate_batch_reader.py -v
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from classes.readers.import_pipeline import ImportCancelled
+from classes.readers.pdf_reader import certificate_batch_reader
+from classes.readers.pdf_reader.certificate_batch_reader import CertificateBatchReader
+from classes.readers.reader import UPSERT_TABLES
+
+CERTIFICADOS = {
+    "ana_2024.pdf": {"rut": "11111111-1", "nombre": "Ana", "programa_estudio": "Informática"},
+    "luis.pdf": {"rut": "22222222-2", "nombre": "Luis", "programa_estudio": "Mecánica"},
+    "ana_2025.pdf": {"rut": "11111111-1", "nombre": "Ana María", "programa_estudio": None},
+    "danado.pdf": ValueError("No se encontró el RUT en el certificado"),
+}
+
+
+class FakeCursor:
+    rowcount = 0
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, query, params=()):
+        self.executed.append((" ".join(query.split()), list(params)))
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.cursor_ = FakeCursor()
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_
+
+
+def _parse(file_path):
+    datos = CERTIFICADOS[file_path]
+    if isinstance(datos, Exception):
+        raise datos
+    return dict(datos)
+
+
+@pytest.fixture(autouse=True)
+def pool_local(monkeypatch):
+    monkeypatch.setattr(certificate_batch_reader, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(certificate_batch_reader, "_parse_certificate_file", _parse)
+
+
+def _reader(connection=None):
+    reader = CertificateBatchReader(list(CERTIFICADOS), connection)
+    reader._schema = {}
+    return reader
+
+
+def test_un_solo_upsert_y_los_errores_no_detienen_el_resto():
+    connection = FakeConnection()
+    reader = _reader(connection)
+    progreso = []
+
+    reader._process_and_upsert(progress_callback=progreso.append)
+
+    [(query, params)] = connection.cursor_.executed
+    assert query.startswith("INSERT INTO Estudiante ")
+    _, data_columns = UPSERT_TABLES["Estudiante"]
+    filas = {params[i]: params[i + 1:i + 1 + len(data_columns)] for i in range(0, len(params), len(data_columns) + 1)}
+    assert list(filas) == ["11111111-1", "22222222-2"]
+    # El último certificado del mismo RUT prevalece, sin pisar con vacíos
+    nombre, programa = data_columns.index("nombre"), data_columns.index("programa_estudio")
+    assert (filas["11111111-1"][nombre], filas["11111111-1"][programa]) == ("Ana María", "Informática")
+
+    assert list(reader.errores_por_archivo) == ["danado.pdf"]
+    assert progreso == [1, 2, 3, 4]
+    assert (reader.get_total_rows(), reader.report.rows, reader.report.files) == (4, 3, 4)
+
+
+def test_staging_no_usa_la_conexion():
+    reader = _reader()
+
+    reader.stage()
+
+    assert set(reader.staged_keys()) == {("Estudiante", ("11111111-1",)), ("Estudiante", ("22222222-2",))}
+    assert list(reader.errores_por_archivo) == ["danado.pdf"]
+
+
+def test_cancelar_desde_el_progreso_detiene_la_carga():
+    connection = FakeConnection()
+    reader = _reader(connection)
+
+    def cancelar(procesados):
+        if procesados == 2:
+            raise ImportCancelled("Carga cancelada por el usuario")
+
+    with pytest.raises(ImportCancelled):
+        reader._process_and_upsert(progress_callback=cancelar)
+
+    assert connection.cursor_.executed == []
@@ -0,0 +1,63 @@
+"""
+Tests del registro de anchos de columna (ColumnWidthTracker)
+============================================================
+
+Ejecutar con:
+    python -m pytest testing/test_column_widths.py -v
+"""
+
+from openpyxl import Workbook
+
+from classes.sheets.column_widths import ColumnWidthTracker
+
+
+def test_fija_anchos_segun_el_valor_mas_largo_con_limites():
+    ws = Workbook().active
+    with ColumnWidthTracker(ws, min_width=12, max_width=40) as out:
+        out.cell(1, 1, "RUT")
+        out.cell(2, 1, "Nombre bastante largo")
+        out.cell(1, 2, "x" * 100)
+
+    assert ws.column_dimensions["A"].width == len("Nombre bastante largo") + 2
+    assert ws.column_dimensions["B"].width == 40
+
+
+def test_solo_mide_las_filas_de_muestra():
+    ws = Workbook().active
+    with ColumnWidthTracker(ws, sample_rows=1, min_width=1) as out:
+        out.cell(1, 1, "corto")
+        out.cell(2, 1, "x" * 30)
+
+    assert ws.column_dimensions["A"].width == len("corto") + 2
+
+
+class WriteOnlySheet:
+    """Como una hoja write_only de openpyxl: sin cell(), con append() y anchos"""
+
+    def __init__(self):
+        self.rows = []
+        self.column_dimensions = Workbook().active.column_dimensions
+
+    def append(self, values):
+        self.rows.append(list(values))
+
+
+def test_write_only_escribe_las_filas_retenidas_al_salir_del_bloque():
+    ws = WriteOnlySheet()
+    with ColumnWidthTracker(ws, min_width=1) as out:
+        for fila in range(3):
+            out.append([f"fila {fila}", fila])
+        # Menos filas que la muestra: siguen retenidas
+        assert ws.rows == []
+
+    assert ws.rows == [["fila 0", 0], ["fila 1", 1], ["fila 2", 2]]
+    assert ws.column_dimensions["A"].width == len("fila 0") + 2
+
+
+def test_write_only_deja_de_retener_al_completar_la_muestra():
+    ws = WriteOnlySheet()
+    out = ColumnWidthTracker(ws, sample_rows=2, min_width=1)
+    for fila in range(5):
+        out.append([fila])
+
+    assert ws.rows == [[0], [1], [2], [3], [4]]
@@ -0,0 +1,88 @@
+"""
+Tests de la lectura por chunks de los readers CSV (CSVReader)
+=============================================================
+
+No requieren MySQL: la conexión se simula.
+
+Ejecutar con:
+    python -m pytest testing/test_csv_reader.py -v
+"""
+
+import pytest
+
+from classes.readers.excel_reader.csv_reader import CSVReader
+
+
+class _Reader(CSVReader):
+    """Reader que solo registra el índice de cada chunk"""
+
+    CHUNK_SIZE = 2
+
+    def __init__(self, file_path, db_connection=None, streaming=False):
+        super().__init__(file_path, db_connection, streaming)
+        self._schema = {}
+        self.indices = []
+
+    def _upsert_chunk(self, cursor, chunk, progress_callback=None):
+        self.indices.append(list(chunk.index))
+        for index in chunk.index:
+            if progress_callback:
+                progress_callback(index + 1)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+
+    def cursor(self, *args, **kwargs):
+        return self
+
+    def close(self):
+        pass
+
+    def commit(self):
+        self.commits += 1
+
+
+def _archivo(tmp_path, filas, final="\n"):
+    preambulo = [f"Reporte línea {i}" for i in range(_Reader.SKIPROWS)]
+    lineas = preambulo + ["Rut;Nombre"] + [f"{i}-9;Alumno {i}" for i in range(filas)]
+    path = tmp_path / "reporte.csv"
+    path.write_text("\n".join(lineas) + final, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("final", ["\n", ""])
+def test_total_de_filas_descuenta_preambulo_y_encabezado(tmp_path, final):
+    assert _Reader(_archivo(tmp_path, 5, final)).get_total_rows() == 5
+
+
+def test_total_de_filas_de_archivo_sin_datos(tmp_path):
+    assert _Reader(_archivo(tmp_path, 0)).get_total_rows() == 0
+
+    vacio = tmp_path / "vacio.csv"
+    vacio.write_bytes(b"")
+    assert _Reader(str(vacio)).get_total_rows() == 0
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_indice_continua_entre_chunks(tmp_path, streaming):
+    connection = FakeConnection()
+    reader = _Reader(_archivo(tmp_path, 5), connection, streaming=streaming)
+    progreso = []
+
+    reader._process_and_upsert(progress_callback=progreso.append)
+
+    assert reader.indices == [[0, 1], [2, 3], [4]]
+    assert progreso == [1, 2, 3, 4, 5] == list(range(1, reader.get_total_rows() + 1))
+    assert reader.report.rows == 5
+    # En streaming se confirma cada chunk
+    assert connection.commits == (3 if streaming else 0)
+
+
+def test_staging_lee_todos_los_chunks_sin_conexion(tmp_path):
+    reader = _Reader(_archivo(tmp_path, 5))
+
+    reader.stage()
+
+    assert reader.indices == [[0, 1], [2, 3], [4]]
@@ -0,0 +1,73 @@
+"""
+Tests del plan de datos de hojas personalizadas (CustomSheetPlanner)
+====================================================================
+
+No requieren MySQL: el cursor simula las respuestas de la base de datos.
+
+Ejecutar con:
+    python -m pytest testing/test_custom_sheet_planner.py -v
+"""
+
+from types import SimpleNamespace
+
+from classes.export.custom_sheet_planner import CustomSheetPlanner
+
+
+def _sheet(table, columns):
+    columns = tuple(columns)
+    return SimpleNamespace(tables=[
+        SimpleNamespace(table=table, columns=columns, key=(table, columns), error=None),
+    ])
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def execute(self, query, params=()):
+        self.queries.append((query, params))
+
+    def fetchall(self):
+        return list(self.rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, rows):
+        self.cursor_instance = FakeCursor(rows)
+
+    def cursor(self, *args, **kwargs):
+        return self.cursor_instance
+
+
+def test_filas_se_reparten_sin_distinguir_mayusculas_en_el_rut():
+    planner = CustomSheetPlanner([_sheet("Estudiante", ["nombre"]), _sheet("Estudiante", ["rut", "nombre"])])
+    # MySQL devuelve el RUT como está guardado aunque se consultara en minúsculas
+    connection = FakeConnection([("12345678-K", "ana_perez", "12345678-K")])
+
+    result = planner.fetch(connection, ["12345678-k"])
+
+    assert list(result) == ["12345678-k"]
+    assert result["12345678-k"][("Estudiante", ("nombre",))] == [("Ana Perez",)]
+    assert result["12345678-k"][("Estudiante", ("rut", "nombre"))] == [("12345678-K", "Ana Perez")]
+    assert len(connection.cursor_instance.queries) == 1
+
+
+def test_error_de_consulta_queda_en_cada_seleccion():
+    planner = CustomSheetPlanner([_sheet("Estudiante", ["nombre"])])
+    connection = FakeConnection([])
+
+    def falla(query, params=()):
+        raise RuntimeError("tabla bloqueada")
+
+    connection.cursor_instance.execute = falla
+
+    result = planner.fetch(connection, ["1-9", "2-7"])
+
+    for rut in ("1-9", "2-7"):
+        error = result[rut][("Estudiante", ("nombre",))]
+        assert isinstance(error, Exception)
+        assert "tabla bloqueada" in str(error)
@@ -0,0 +1,83 @@
+"""
+Tests de la caché de hojas personalizadas (CustomSheetRegistry)
+===============================================================
+
+No requieren MySQL: los JSON se crean en una carpeta temporal y el
+catálogo del esquema se simula.
+
+Ejecutar con:
+    python -m pytest testing/test_custom_sheet_registry.py -v
+"""
+
+import json
+import os
+
+import pytest
+
+from utils import custom_sheet_registry as registry_module
+from utils.custom_sheet_registry import CustomSheetRegistry
+
+
+@pytest.fixture
+def hojas(tmp_path, monkeypatch):
+    monkeypatch.setattr(registry_module, "custom_sheet_path", lambda name: str(tmp_path / f"{name}.json"))
+
+    def escribir(name, columns, mtime_ns=None):
+        path = tmp_path / f"{name}.json"
+        path.write_text(json.dumps({"name": name, "tables": [{"table": "Estudiante", "columns": columns}]}), encoding="utf-8")
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    return escribir
+
+
+def test_definicion_se_reutiliza_mientras_el_archivo_no_cambia(hojas):
+    hojas("Deudas", ["rut", "deuda"], mtime_ns=1_000_000_000)
+    registry = CustomSheetRegistry()
+
+    primera = registry.get("Deudas")
+
+    assert registry.get("Deudas") is primera
+    assert primera.tables[0].headers == ("Rut", "Deuda")
+
+
+def test_cambio_de_mtime_invalida_la_definicion(hojas):
+    hojas("Deudas", ["rut", "deuda"], mtime_ns=1_000_000_000)
+    registry = CustomSheetRegistry()
+    primera = registry.get("Deudas")
+
+    # Mismo tamaño, distinto contenido: solo cambia el mtime
+    hojas("Deudas", ["rut", "grado"], mtime_ns=2_000_000_000)
+    segunda = registry.get("Deudas")
+
+    assert segunda is not primera
+    assert segunda.tables[0].columns == ("rut", "grado")
+    assert segunda.stamp[0] == 2_000_000_000
+
+
+def test_archivo_eliminado_se_descarta_de_la_cache(hojas):
+    path = hojas("Deudas", ["rut"])
+    registry = CustomSheetRegistry()
+    registry.get("Deudas")
+
+    path.unlink()
+
+    with pytest.raises(FileNotFoundError, match="Archivo de configuración no encontrado"):
+        registry.get("Deudas")
+    assert "Deudas" not in registry._sheets
+
+
+def test_se_revalida_solo_si_cambia_el_esquema(hojas, monkeypatch):
+    hojas("Deudas", ["rut", "deuda"])
+    esquema = {"estudiante": {"rut": {}, "deuda": {}}}
+    monkeypatch.setattr(registry_module.schema_catalog, "get", lambda db: esquema)
+    registry = CustomSheetRegistry()
+
+    sheet = registry.get("Deudas", db_connection=object())
+    assert sheet.schema is esquema and sheet.tables[0].error is None
+
+    # Catálogo recargado sin la columna: la misma definición se vuelve a validar
+    esquema = {"estudiante": {"rut": {}}}
+    assert registry.get("Deudas", db_connection=object()) is sheet
+    assert "deuda" in str(sheet.tables[0].error)
@@ -0,0 +1,88 @@
+"""
+Tests de los semestres conocidos de DatabaseConnection
+======================================================
+
+No requieren MySQL: las conexiones se simulan.
+
+Ejecutar con:
+    python -m pytest testing/test_db_connection.py -v
+"""
+
+import threading
+from contextlib import contextmanager
+
+import pytest
+
+from database.db_connection import DatabaseConnection
+
+
+class FakeConnection:
+    def __init__(self):
+        self.commits = 0
+        self.rollbacks = 0
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = DatabaseConnection(host="localhost", database="inacap_test")
+    db.connection = FakeConnection()
+
+    @contextmanager
+    def acquire():
+        yield FakeConnection()
+
+    monkeypatch.setattr(db, "acquire", acquire)
+    return db
+
+
+def _en_otro_hilo(funcion):
+    resultado = {}
+    hilo = threading.Thread(target=lambda: resultado.setdefault("valor", funcion()))
+    hilo.start()
+    hilo.join()
+    return resultado.get("valor")
+
+
+class TestSemestresConocidos:
+
+    def test_pendientes_solo_visibles_en_su_hilo_hasta_el_commit(self, db):
+        db.add_pending_semestres(["2024-otoño"])
+
+        assert db.known_semestres() == {"2024-otoño"}
+        assert _en_otro_hilo(db.known_semestres) == set()
+
+        db.commit()
+        assert _en_otro_hilo(db.known_semestres) == {"2024-otoño"}
+
+    def test_rollback_descarta_los_pendientes(self, db):
+        db.add_pending_semestres(["2024-otoño"])
+        db.rollback()
+        db.commit()
+
+        assert db.known_semestres() == set()
+
+    def test_transaccion_deshecha_no_registra_semestres(self, db):
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.add_pending_semestres(["2024-primavera"])
+                raise RuntimeError("deadlock")
+
+        assert db.known_semestres() == set()
+
+        with db.transaction():
+            db.add_pending_semestres(["2024-primavera"])
+        assert _en_otro_hilo(db.known_semestres) == {"2024-primavera"}
+
+    def test_transaccion_descarta_pendientes_sin_commit_del_hilo(self, db):
+        # Un rollback hecho directo sobre la conexión no pasa por DatabaseConnection
+        db.add_pending_semestres(["2023-otoño"])
+        with db.transaction():
+            pass
+
+        assert db.known_semestres() == set()
@@ -0,0 +1,107 @@
+"""
+Tests de la obtención de datos del exportador de estudiantes (Exporter)
+=======================================================================
+
+No requieren MySQL: el cursor simula las respuestas de la base de datos.
+
+Ejecutar con:
+    python -m pytest testing/test_exporter.py -v
+"""
+
+from classes.export.exporter import Exporter
+
+
+# La BD guarda el dígito verificador en mayúsculas; la collation compara sin distinguirlas
+ESTUDIANTE = (
+    ("rut", "nombre", "_split", "rut_estudiante", "deuda_total"),
+    [("12345678-K", "Ana", None, "12345678-K", 1000)],
+)
+SEMESTRES = (
+    ("rut_estudiante", "periodo_semestre", "_split", "rut_estudiante", "codigo_asignatura", "periodo_semestre"),
+    [
+        ("12345678-K", "2024-otoño", None, "12345678-K", "MAT101", "2024-otoño"),
+        ("12345678-K", "2024-otoño", None, "12345678-K", "LEN101", "2024-otoño"),
+    ],
+)
+
+
+class FakeCursor:
+    def __init__(self):
+        self.column_names = ()
+        self._rows = []
+
+    def execute(self, query, params=()):
+        resultado = SEMESTRES if "Estudiante_Semestre" in query else ESTUDIANTE
+        self.column_names, self._rows = resultado
+
+    def fetchall(self):
+        return list(self._rows)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def cursor(self, *args, **kwargs):
+        return FakeCursor()
+
+
+def test_rut_en_minusculas_encuentra_al_estudiante():
+    exporter = Exporter(FakeConnection(), {}, {})
+
+    student_data = exporter._get_student_data(" 12345678-k")
+
+    assert student_data is not None
+    assert student_data["student"]["rut"] == "12345678-K"
+    assert student_data["financial_info"]["deuda_total"] == 1000
+    assert [len(semestre["subjects"]) for semestre in student_data["semesters"]] == [2]
+
+
+def test_bulk_no_reporta_como_no_encontrado_un_rut_en_minusculas(tmp_path, monkeypatch):
+    from classes.export import bulk_exporter
+    from classes.export.bulk_exporter import BulkExporter
+
+    monkeypatch.setattr(bulk_exporter, "ProcessPoolExecutor", _SerialExecutor)
+    monkeypatch.setattr(bulk_exporter, "_render_student", lambda args: str(args[3]))
+    exporter = BulkExporter(FakeConnection(), {}, {}, max_workers=1)
+
+    result = exporter.export_students(tmp_path, ruts=["12345678-k", "12345678-K "])
+
+    assert result["exported"] == 1
+    assert result["not_found"] == []
+    assert result["files"][0].startswith(str(tmp_path / "Estudiante_12345678-K_"))
+
+
+def test_bulk_normaliza_el_periodo_del_filtro():
+    from classes.export.bulk_exporter import BulkExporter
+
+    class FiltroCursor(FakeCursor):
+        def execute(self, query, params=()):
+            self.query, self.params = query, params
+            self.column_names, self._rows = ("rut",), [("12345678-K",)]
+
+    cursor = FiltroCursor()
+    connection = FakeConnection()
+    connection.cursor = lambda *args, **kwargs: cursor
+    exporter = BulkExporter(connection, {}, {}, max_workers=1)
+
+    assert exporter.resolve_ruts(periodo=" OTOÑO 2024 ") == ["12345678-K"]
+    assert "es.periodo_semestre = %s" in cursor.query
+    assert cursor.params == ("2024-otoño",)
+
+    # Un período en blanco no filtra
+    assert exporter.resolve_ruts(ruts=["1-9"], periodo="  ") == ["1-9"]
+
+
+class _SerialExecutor:
+    def __init__(self, max_workers=None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, funcion, iterable, chunksize=1):
+        return map(funcion, iterable)
@@ -0,0 +1,116 @@
+"""
+Tests de los filtros y del cursor del reporte financiero (FinancialDataExporter)
+================================================================================
+
+No requieren MySQL: el cursor simula las respuestas de la base de datos.
+
+Ejecutar con:
+    python -m pytest testing/test_financial_data_exporter.py -v
+"""
+
+import pytest
+
+from classes.export import financial_data_exporter
+from classes.export.financial_data_exporter import FinancialDataExporter
+
+
+class FakeCursor:
+    """Como un cursor sin buffer: close() falla si quedan filas sin leer"""
+
+    def __init__(self, rows):
+        self._rows = iter(rows)
+        self._unread = bool(rows)
+        self.closed = False
+
+    def execute(self, query, params=()):
+        self.query, self.params = query, params
+
+    def __iter__(self):
+        for row in self._rows:
+            yield row
+        self._unread = False
+
+    def fetchall(self):
+        rows = list(self._rows)
+        self._unread = False
+        return rows
+
+    def close(self):
+        if self._unread:
+            raise RuntimeError("Unread result found")
+        self.closed = True
+
+
+class FakeConnection:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.cursors = []
+
+    def cursor(self, buffered=True):
+        cursor = FakeCursor(self.rows)
+        self.cursors.append(cursor)
+        return cursor
+
+
+def _row(rut, deuda):
+    return (rut, "Nombre", "Programa", 0, 0, 0, deuda, 0, 0, 0, 0, 0, 0)
+
+
+class TestFiltros:
+
+    def test_sin_filtros_solo_estudiantes_con_deuda(self):
+        query, params = FinancialDataExporter(FakeConnection())._build_query()
+
+        assert "WHERE rfe.deuda_total > 0\n" in query
+        assert "LIMIT" not in query
+        assert params == ()
+
+    def test_filtros_se_combinan_en_orden(self, monkeypatch):
+        monkeypatch.setattr(financial_data_exporter.schema_catalog, "get",
+                            lambda db: {"estudiante": {"rut": {}, "Sede": {}}})
+        exporter = FinancialDataExporter(FakeConnection())
+
+        query, params = exporter._build_query(sede="Santiago", programa="Informática", deuda_minima=1000, top_n="10")
+
+        assert "rfe.deuda_total > 0 AND e.sede = %s AND e.programa_estudio = %s AND rfe.deuda_total >= %s" in query
+        assert "LIMIT %s" in query
+        assert params == ("Santiago", "Informática", 1000, 10)
+
+    def test_sede_requiere_la_columna(self, monkeypatch):
+        monkeypatch.setattr(financial_data_exporter.schema_catalog, "get", lambda db: {"estudiante": {"rut": {}}})
+
+        with pytest.raises(ValueError, match="Estudiante.sede"):
+            FinancialDataExporter(FakeConnection())._build_query(sede="Santiago")
+
+    def test_top_n_debe_ser_positivo(self):
+        with pytest.raises(ValueError, match="mayor que 0"):
+            FinancialDataExporter(FakeConnection())._build_query(top_n=0)
+
+    def test_sin_filas_con_top_n_reporta_los_filtros(self, tmp_path):
+        exporter = FinancialDataExporter(FakeConnection([]))
+
+        with pytest.raises(ValueError, match="cumplan los filtros"):
+            exporter.export_financial_data(tmp_path, top_n=5)
+        with pytest.raises(ValueError, match="registrados"):
+            exporter.export_financial_data(tmp_path)
+
+
+class TestCursorSinBuffer:
+
+    def test_error_al_escribir_no_queda_oculto_por_el_cierre(self):
+        connection = FakeConnection([_row("1-9", 100), _row("2-7", 50)])
+        exporter = FinancialDataExporter(connection, streaming=True)
+
+        with pytest.raises(ValueError, match="fila inválida"):
+            for _ in exporter._iter_financial_rows("SELECT ..."):
+                raise ValueError("fila inválida")
+
+        assert connection.cursors[0].closed
+
+    def test_exporta_todas_las_filas(self, tmp_path):
+        connection = FakeConnection([_row("1-9", 100), _row("2-7", 50)])
+
+        path = FinancialDataExporter(connection, streaming=True).export_financial_data(tmp_path)
+
+        assert path.endswith(".xlsx")
+        assert connection.cursors[0].closed
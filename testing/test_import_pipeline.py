@@ -0,0 +1,249 @@
+"""
+Tests de ImportPipeline (orden de resultados, claves preparadas y reintento por deadlock)
+========================================================================================
+
+No requieren MySQL: las conexiones y cursores se simulan.
+
+Ejecutar con:
+    python -m pytest testing/test_import_pipeline.py -v
+"""
+
+import pickle
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import pandas as pd
+import pytest
+from mysql.connector import Error
+
+from classes.readers import import_pipeline
+from classes.readers.import_pipeline import DEADLOCK_RETRIES, ImportCancelled, ImportPipeline
+from classes.readers.import_report import ImportReport
+from classes.readers.reader import UPSERT_TABLES, Reader
+from database.db_connection import DatabaseConnection
+
+
+class _Reader(Reader):
+    """Reader que prepara dos estudiantes en un semestre, sin archivo"""
+
+    def __init__(self):
+        super().__init__("archivo.csv", None)
+        self._schema = {}
+
+    def _process_and_upsert(self):
+        pass
+
+    def _stage_rows(self):
+        periodos = self._normalize_periodos(pd.Series(["OTOÑO 2025", "OTOÑO 2025"]))
+        self._register_semestres(None, periodos)
+        _, data_columns = UPSERT_TABLES["Estudiante_Semestre"]
+        for rut, periodo in zip(["1-9", "2-7"], periodos):
+            self._queue_upsert_values(None, "Estudiante_Semestre", (rut, periodo), [1] * len(data_columns))
+
+    def get_total_rows(self) -> int:
+        return 2
+
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = -1
+
+    def execute(self, query, params=()):
+        # Cada fila del INSERT se crea (1 fila afectada)
+        self.rowcount = query.count("(%s")
+        if query.lstrip().startswith("INSERT INTO Estudiante_Semestre"):
+            self.connection.database.inserts += 1
+            if self.connection.database.deadlocks:
+                self.connection.database.deadlocks -= 1
+                raise Error(msg="Deadlock found when trying to get lock", errno=1213)
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, database):
+        self.database = database
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.database.commits.append(self.database.inserts)
+
+    def rollback(self):
+        pass
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = DatabaseConnection(host="localhost", database="inacap_test")
+    db.inserts = 0
+    # Inserts enviados al momento de cada commit
+    db.commits = []
+    db.deadlocks = 0
+
+    @contextmanager
+    def acquire():
+        yield FakeConnection(db)
+
+    monkeypatch.setattr(db, "acquire", acquire)
+    return db
+
+
+def _staged_reader():
+    reader = _Reader()
+    reader.stage()
+    return reader
+
+
+def test_claves_preparadas_sobreviven_el_paso_entre_procesos():
+    reader = _staged_reader()
+
+    copia = pickle.loads(pickle.dumps(reader))
+
+    assert copia.staged_keys() == reader.staged_keys() == {
+        ("Semestre", ("2025-otoño",)),
+        ("Estudiante_Semestre", ("1-9", "2025-otoño")),
+        ("Estudiante_Semestre", ("2-7", "2025-otoño")),
+    }
+    assert copia._periodo_keys == {"2025-otoño": 4050}
+
+
+def test_deadlock_se_reintenta_desde_lo_preparado(db):
+    db.deadlocks = DEADLOCK_RETRIES - 1
+    reader = _staged_reader()
+
+    ImportPipeline("situacion_academica", [], db)._write(reader)
+
+    assert db.inserts == DEADLOCK_RETRIES
+    # Solo se confirma el último intento
+    assert set(db.commits) == {DEADLOCK_RETRIES}
+    # El resumen corresponde solo al intento confirmado
+    assert reader.resumen_tablas["Estudiante_Semestre"] == {"filas": 2, "afectadas": 2}
+    assert db.known_semestres() == {"2025-otoño"}
+
+
+def test_deadlock_persistente_se_propaga_sin_registrar_semestres(db, monkeypatch):
+    monkeypatch.setattr(import_pipeline, "DEADLOCK_RETRIES", 2)
+    db.deadlocks = 5
+
+    with pytest.raises(Error) as error:
+        ImportPipeline("situacion_academica", [], db)._write(_staged_reader())
+
+    assert error.value.errno == 1213
+    assert db.inserts == 2
+    assert db.commits == []
+    assert db.known_semestres() == set()
+
+
+class _ExclusiveReader:
+    """Reader ya preparado que se escribe solo; falla al escribir si `error`"""
+
+    EXCLUSIVE_WRITE = True
+
+    def __init__(self, file_path, log, error=None):
+        self.file_path = file_path
+        self.db_connection = None
+        self.report = ImportReport(file_path, files=1)
+        self.log = log
+        self.error = error
+
+    def write_staged(self, cursor):
+        self.log.append(("write", self.file_path))
+        if self.error:
+            raise self.error
+
+    def log_summary(self):
+        pass
+
+
+class _MainConnection:
+    def __init__(self, log):
+        self.log = log
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log.append(("commit",))
+
+    def rollback(self):
+        self.log.append(("rollback",))
+
+
+@pytest.fixture
+def pipeline_local(monkeypatch):
+    """Lectura en hilos (sin procesos) con los readers que arma `preparar`"""
+    log = []
+    lecturas = {}
+
+    def stage_file(file_type, file_path):
+        resultado = lecturas[file_path]
+        if isinstance(resultado, Exception):
+            raise resultado
+        return resultado
+
+    monkeypatch.setattr(import_pipeline, "ProcessPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(import_pipeline, "_stage_file", stage_file)
+
+    def preparar(**archivos):
+        for path, error in archivos.items():
+            if isinstance(error, ValueError):
+                lecturas[path] = error
+            else:
+                lecturas[path] = _ExclusiveReader(path, log, error)
+        return ImportPipeline("reporte_morosidad", list(archivos), _MainConnection(log))
+
+    return preparar, log
+
+
+def test_resultados_en_orden_de_seleccion(pipeline_local):
+    preparar, log = pipeline_local
+    pipeline = preparar(a=None, b=ValueError("columna faltante"), c=None)
+    avances = []
+
+    results = pipeline.run(
+        before_write=lambda reader: log.append(("antes", reader.file_path)),
+        after_write=lambda reader: log.append(("despues", reader.file_path)),
+        on_progress=avances.append,
+    )
+
+    assert [(path, type(error).__name__ if error else None) for path, error in results] == [
+        ("a", None), ("b", "ValueError"), ("c", None),
+    ]
+    assert sorted(avances) == [1, 2, 3]
+    # Los readers exclusivos se escriben de a uno, en orden y con su commit
+    assert log == [
+        ("antes", "a"), ("write", "a"), ("commit",), ("despues", "a"),
+        ("antes", "c"), ("write", "c"), ("commit",), ("despues", "c"),
+    ]
+    assert pipeline.report.files == 2
+
+
+def test_error_critico_detiene_la_carga(pipeline_local):
+    preparar, log = pipeline_local
+    pipeline = preparar(a=Exception("ERROR CRÍTICO: Tabla no existe. Estudiante"), b=None)
+
+    results = pipeline.run()
+
+    [(path, error)] = results
+    assert path == "a" and "ERROR CRÍTICO" in str(error)
+    assert log == [("write", "a"), ("rollback",)]
+
+
+def test_cancelar_no_escribe_los_archivos_pendientes(pipeline_local):
+    preparar, log = pipeline_local
+    pipeline = preparar(a=None, b=None)
+    pipeline.cancel_event = threading.Event()
+    pipeline.cancel_event.set()
+
+    results = pipeline.run()
+
+    assert [type(error) for _, error in results] == [ImportCancelled, ImportCancelled]
+    assert log == []
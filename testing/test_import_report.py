@@ -0,0 +1,88 @@
+"""
+Tests de las métricas de importación (ImportReport)
+===================================================
+
+El reloj se reemplaza por uno controlado por el test.
+
+Ejecutar con:
+    python -m pytest testing/test_import_report.py -v
+"""
+
+import json
+
+import pytest
+
+from classes.readers import import_report
+from classes.readers.import_report import ImportReport
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def perf_counter(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(import_report, "time", clock)
+    return clock
+
+
+def test_etapas_internas_se_descuentan_de_la_externa(clock):
+    report = ImportReport("archivo.csv", files=1)
+
+    with report.stage("transformacion"):
+        clock.advance(1.0)
+        # Auto-flush del lote dentro de la transformación
+        with report.stage("escritura"):
+            clock.advance(2.0)
+            with report.stage("verificacion"):
+                clock.advance(0.5)
+        clock.advance(1.0)
+    with report.stage("escritura"):
+        clock.advance(3.0)
+
+    assert report.stages == {"transformacion": 2.0, "escritura": 5.0, "verificacion": 0.5}
+    # La suma de las etapas es el tiempo transcurrido, sin contar dos veces
+    assert sum(report.stages.values()) == clock.now - 100.0
+
+
+def test_etapa_con_error_igual_se_mide(clock):
+    report = ImportReport()
+
+    with pytest.raises(ValueError):
+        with report.stage("lectura"):
+            clock.advance(1.5)
+            raise ValueError("fila inválida")
+
+    assert report.stages == {"lectura": 1.5}
+    assert report._stack == []
+
+
+def test_merge_y_resumen(clock, tmp_path):
+    total = ImportReport("situacion_academica")
+    for segundos in (0.25, 0.75):
+        parcial = ImportReport("archivo.csv", files=1)
+        with parcial.stage("escritura"), parcial.query("INSERT Estudiante"):
+            clock.advance(segundos)
+        parcial.rows = 100
+        total.merge(parcial)
+    clock.advance(1.0)
+    total.finish()
+
+    assert (total.files, total.rows, total.seconds) == (2, 200, 2.0)
+    assert total.stages == {"escritura": 1.0}
+    assert total.queries["INSERT Estudiante"] == {"count": 2, "seconds": 1.0, "max_seconds": 0.75}
+    assert total.summary_lines() == ["Filas: 200 en 2.00s (100 filas/s)", "  escritura: 1.00s", "Consultas: 2 (1.00s)"]
+
+    path = tmp_path / "reporte.json"
+    total.dump_json(str(path))
+    datos = json.loads(path.read_text(encoding="utf-8"))
+    assert datos["filas_por_segundo"] == 100.0
+    assert datos["consultas"]["INSERT Estudiante"] == {"count": 2, "seconds": 1.0, "avg_ms": 500.0, "max_ms": 750.0}
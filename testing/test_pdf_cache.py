@@ -0,0 +1,54 @@
+"""
+Tests de la caché en disco de certificados PDF (PDFCache)
+=========================================================
+
+Ejecutar con:
+    python -m pytest testing/test_pdf_cache.py -v
+"""
+
+import os
+
+from utils.pdf_cache import PDFCache
+
+
+def _entries(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(".json"))
+
+
+def test_elimina_las_entradas_menos_usadas_al_superar_el_maximo(tmp_path):
+    cache = PDFCache(directory=str(tmp_path), max_bytes=10_000)
+    cache.put("a", text="x" * 4000)
+    cache.put("b", text="x" * 4000)
+    # Leer "a" la marca como usada recientemente
+    os.utime(tmp_path / "b.json", (1, 1))
+    assert cache.get_text("a") is not None
+
+    cache.put("c", text="x" * 4000)
+
+    assert _entries(tmp_path) == ["a.json", "c.json"]
+    assert cache._total_bytes == sum(os.path.getsize(tmp_path / name) for name in _entries(tmp_path))
+
+
+def test_no_recorre_la_carpeta_mientras_no_supere_el_maximo(tmp_path, monkeypatch):
+    cache = PDFCache(directory=str(tmp_path), max_bytes=1_000_000)
+    cache.put("a", text="primero")
+
+    recorridos = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, "scandir", lambda path: recorridos.append(path) or scandir(path))
+    cache.put("b", text="segundo")
+    cache.put("a", reader_name="certificado", parsed={"rut": "1-9"})
+
+    assert recorridos == []
+    assert cache.get_parsed("a", "certificado") == {"rut": "1-9"}
+    assert cache._total_bytes == sum(os.path.getsize(tmp_path / name) for name in _entries(tmp_path))
+
+
+def test_error_al_escribir_se_registra_y_no_interrumpe(tmp_path, caplog):
+    archivo = tmp_path / "no_es_carpeta"
+    archivo.write_text("")
+    cache = PDFCache(directory=str(archivo), max_bytes=1000)
+
+    cache.put("a", text="texto")
+
+    assert "No se pudo guardar en caché de PDFs" in caplog.text
@@ -0,0 +1,40 @@
+"""
+Tests de la normalización de períodos (utils.periodo)
+=====================================================
+
+Ejecutar con:
+    python -m pytest testing/test_periodo.py -v
+"""
+
+import pytest
+
+from utils.periodo import PERIODO_VACIO, _normalize_periodo, normalize_periodo, periodo_key
+
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("PRIMAVERA 2025", "2025-primavera"),
+    ("OTOÑO 2025", "2025-otoño"),
+    ("2025 Primavera", "2025-primavera"),
+    (" 2025 Otoño ", "2025-otoño"),
+    ("2025-primavera", "2025-primavera"),
+    ("Verano 2025", "verano 2025"),
+])
+def test_normaliza_formatos_conocidos(valor, esperado):
+    assert normalize_periodo(valor)[0] == esperado
+
+
+def test_periodo_key_ordena_por_año_y_estacion():
+    assert periodo_key("2025-otoño") == 4050
+    assert periodo_key("2025-primavera") == 4051
+    assert periodo_key("2024-primavera") < periodo_key("2025-otoño")
+    assert periodo_key("verano 2025") is None
+    assert normalize_periodo("PRIMAVERA 2025") == ("2025-primavera", 4051)
+
+
+def test_celdas_vacias_comparten_una_entrada_de_la_cache():
+    _normalize_periodo.cache_clear()
+    for _ in range(100):
+        assert normalize_periodo(float("nan")) == (PERIODO_VACIO, None)
+    assert normalize_periodo(None) == (PERIODO_VACIO, None)
+
+    assert _normalize_periodo.cache_info().currsize == 1
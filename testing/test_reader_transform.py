@@ -0,0 +1,98 @@
+"""
+Tests de la transformación por columnas de los readers
+======================================================
+
+No requieren MySQL ni archivos: se transforman DataFrames construidos en el test.
+
+Ejecutar con:
+    python -m pytest testing/test_reader_transform.py -v
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from classes.readers.excel_reader.seguimiento_de_alumnos_reader import SeguimientoDeAlumnosReader
+from classes.readers.reader import Reader
+
+
+class _Reader(Reader):
+    """Reader mínimo para probar las conversiones de columnas"""
+
+    FILA_OFFSET = 7
+
+    def __init__(self):
+        super().__init__(None, None)
+
+    def _process_and_upsert(self):
+        pass
+
+    def _stage_rows(self):
+        pass
+
+    def get_total_rows(self) -> int:
+        return 0
+
+
+@pytest.fixture
+def reader():
+    return _Reader()
+
+
+def test_currency_column_quita_simbolos_y_deja_vacios_en_cero(reader):
+    columna = pd.Series(["$1,234", "$0", np.nan, "", 500, " $2,000,000 "], name="Total Saldo")
+
+    assert reader._currency_column(columna).tolist() == [1234, 0, 0, 0, 500, 2000000]
+
+
+def test_currency_column_invalido_indica_la_fila(reader):
+    columna = pd.Series(["$10", "$1.234,5x"], name="Deuda Matriculas")
+
+    with pytest.raises(ValueError, match="fila 8 .*en columna 'Deuda Matriculas'"):
+        reader._currency_column(columna)
+
+
+def test_int_column_ceros_y_vacios_retornan_falsy(reader):
+    columna = pd.Series(["3", 0, "0", np.nan, "", " 12 "], name="SECCIONES")
+
+    assert reader._int_column(columna).tolist() == [3, None, None, None, None, 12]
+    assert reader._int_column(columna, falsy=0).tolist() == [3, 0, 0, 0, 0, 12]
+
+
+def test_int_column_no_estricto_ignora_valores_no_numericos(reader):
+    columna = pd.Series(["2", "N/A", "1"], name="ASIGNATURAS PE")
+
+    assert reader._int_column(columna, strict=False).tolist() == [2, None, 1]
+    with pytest.raises(ValueError, match="fila 8"):
+        reader._int_column(columna)
+
+
+def test_date_column_convierte_y_deja_invalidas_en_none(reader):
+    columna = pd.Series(["05-03-2024", " 31-12-2023 ", "31-02-2024", "", np.nan, "2024/03/05"])
+
+    assert reader._date_column(columna).tolist() == ["2024-03-05", "2023-12-31", None, None, None, None]
+
+
+def test_tipo_alumno_nuevo_o_viejo():
+    reader = SeguimientoDeAlumnosReader("seguimiento.csv", None)
+    df = pd.DataFrame({
+        "Nombre Alumno": ["Ana", "Luis", "Eva", "Sol"],
+        "Solicitud Interrupción de Estudios": ["Si", "No", np.nan, "si"],
+        "Alumno Nuevo Inacap": ["Nuevo", "NUEVO ", "Antiguo", np.nan],
+        "Asignatura": ["Cálculo"] * 4,
+        "Área": ["Ciencias"] * 4,
+        "Nombre Docente": ["Pérez"] * 4,
+        "Notas Parciales": ["5,0(Z)", "", np.nan, "4,0"],
+        "% Asistencia": ["80", "0", "", "95"],
+        "Riesgo": ["RI", "", np.nan, "ri"],
+    })
+
+    columnas = reader._transform(df)
+
+    estudiante = columnas["estudiante"]
+    assert estudiante["tipo_alumno"].tolist() == ["NUEVO", "VIEJO", "VIEJO", "VIEJO"]
+    assert estudiante["solicitud_interrupcion_estudios"].tolist() == [True, False, False, False]
+    asignatura = columnas["estudiante_asignatura"]
+    assert reader._column_values(asignatura["notas_parciales"]) == ["5,0", None, None, "4,0"]
+    assert asignatura["porcentaje_asistencia"].tolist() == [80, None, None, 95]
+    assert asignatura["riesgo"].tolist() == [True, False, False, False]
@@ -0,0 +1,174 @@
+"""
+Tests del upsert masivo de los readers y de su resumen de filas
+===============================================================
+
+No requieren MySQL: el cursor simula las respuestas de la base de datos.
+
+Ejecutar con:
+    python -m pytest testing/test_reader_upsert.py -v
+"""
+
+import logging
+
+import pandas as pd
+import pytest
+from mysql.connector import Error
+
+from classes.readers.reader import UPSERT_TABLES, Reader
+
+
+class FakeCursor:
+    """Cada INSERT informa como filas afectadas el siguiente valor de `afectadas`"""
+
+    def __init__(self, afectadas=()):
+        self.afectadas = list(afectadas)
+        self.executed = []
+        self.rowcount = -1
+
+    def execute(self, query, params=()):
+        self.executed.append((" ".join(query.split()), list(params)))
+        self.rowcount = self.afectadas.pop(0) if query.lstrip().startswith("INSERT") and self.afectadas else 0
+
+    def fetchall(self):
+        return []
+
+    def inserts(self, table):
+        return [(query, params) for query, params in self.executed if query.startswith(f"INSERT INTO {table} ")]
+
+
+class _Reader(Reader):
+    """Reader mínimo: sin catálogo del esquema ni registro de semestres en la conexión"""
+
+    def __init__(self):
+        super().__init__(None, None)
+        self._schema = {}
+
+    def _process_and_upsert(self):
+        pass
+
+    def _stage_rows(self):
+        pass
+
+    def get_total_rows(self) -> int:
+        return 0
+
+
+def _estudiante(**datos):
+    _, data_columns = UPSERT_TABLES["Estudiante"]
+    return [datos.get(column) for column in data_columns]
+
+
+class TestUpsertMasivo:
+
+    def test_filas_repetidas_en_el_lote_se_combinan_sin_pisar_con_vacios(self):
+        reader = _Reader()
+        reader._queue_upsert_values(None, "Estudiante", ("1-9",), _estudiante(nombre="Ana", deuda=100))
+        reader._queue_upsert_values(None, "Estudiante", ("1-9",), _estudiante(deuda=None, tipo_alumno="Regular"))
+
+        assert reader._batches["Estudiante"][("1-9",)] == _estudiante(nombre="Ana", deuda=100, tipo_alumno="Regular")
+
+    def test_existentes_solo_actualizan_los_campos_no_nulos(self):
+        reader = _Reader()
+        cursor = FakeCursor()
+        reader._queue_upsert_values(cursor, "Estudiante", ("1-9",), _estudiante(nombre="Ana"))
+        reader._queue_upsert_values(cursor, "Estudiante", ("2-7",), _estudiante())
+
+        reader._flush_batches(cursor)
+
+        [(query, params)] = cursor.inserts("Estudiante")
+        assert "nombre = COALESCE(VALUES(nombre), nombre)" in query
+        assert "deuda = COALESCE(VALUES(deuda), deuda)" in query
+        # Una fila sin campos se envía igual: si existe, MySQL la deja sin cambios
+        assert params[0] == "1-9" and "2-7" in params
+
+    def test_no_consulta_las_claves_antes_del_insert(self):
+        reader = _Reader()
+        cursor = FakeCursor()
+        reader._queue_upsert_values(cursor, "Estudiante", ("1-9",), _estudiante(nombre="Ana"))
+        reader._flush_batches(cursor)
+        reader._queue_upsert_values(cursor, "Estudiante", ("1-9",), _estudiante(deuda=10))
+        reader._flush_batches(cursor)
+
+        assert [query.split(" (")[0] for query, _ in cursor.executed] == ["INSERT INTO Estudiante"] * 2
+
+    def test_lotes_preparados_se_dividen_y_respetan_las_fk(self, monkeypatch):
+        monkeypatch.setattr("classes.readers.reader.BULK_BATCH_SIZE", 2)
+        reader = _Reader()
+        reader._staging = True
+        _, columnas_financieras = UPSERT_TABLES["Reporte_financiero_estudiante"]
+        for rut in ("1-9", "2-7", "3-5"):
+            reader._queue_upsert_values(None, "Reporte_financiero_estudiante", (rut,), [0] * len(columnas_financieras))
+            reader._queue_upsert_values(None, "Estudiante", (rut,), _estudiante(nombre="Ana"))
+        reader._staging = False
+        cursor = FakeCursor()
+
+        reader._flush_batches(cursor)
+
+        tablas = [query.split(" (")[0].split()[-1] for query, _ in cursor.executed]
+        assert tablas == ["Estudiante", "Estudiante", "Reporte_financiero_estudiante", "Reporte_financiero_estudiante"]
+        assert [params[0] for _, params in cursor.inserts("Estudiante")] == ["1-9", "3-5"]
+        assert reader._batches == {}
+
+    def test_tabla_sin_clave_unica_es_error_critico(self):
+        reader = _Reader()
+        key_columns, data_columns = UPSERT_TABLES["Estudiante"]
+        reader._schema = {"estudiante": {column.lower() for column in key_columns + data_columns}}
+        reader._unique_keys = {"estudiante": [{"nombre"}]}
+
+        with pytest.raises(Exception, match="ERROR CRÍTICO: Estudiante no tiene una clave única sobre \\(rut\\)"):
+            reader._bulk_upsert(FakeCursor(), "Estudiante", {("1-9",): _estudiante(nombre="Ana")})
+
+    def test_tabla_inexistente_es_error_critico(self):
+        class TablaInexistente(FakeCursor):
+            def execute(self, query, params=()):
+                raise Error(msg="Table 'inacap.Estudiante' doesn't exist", errno=1146)
+
+        with pytest.raises(Exception, match="ERROR CRÍTICO: Tabla no existe"):
+            _Reader()._bulk_upsert(TablaInexistente(), "Estudiante", {("1-9",): _estudiante(nombre="Ana")})
+
+    def test_semestres_se_registran_con_su_periodo_key(self, monkeypatch):
+        reader = _Reader()
+        monkeypatch.setattr(reader, "_known_semestres", lambda: {"2024-otoño"})
+        cursor = FakeCursor()
+
+        periodos = reader._normalize_periodos(pd.Series(["PRIMAVERA 2025", "2024-otoño", None]))
+        reader._register_semestres(cursor, periodos)
+
+        assert periodos == ["2025-primavera", "2024-otoño", "nan"]
+        [(query, params)] = cursor.inserts("Semestre")
+        assert "ON DUPLICATE KEY UPDATE periodo_key = VALUES(periodo_key)" in query
+        assert params == ["2025-primavera", 4051, "nan", None]
+
+
+class TestResumenFilas:
+
+    def test_resumen_usa_las_filas_afectadas_de_cada_insert(self, monkeypatch):
+        monkeypatch.setattr("classes.readers.reader.BULK_BATCH_SIZE", 2)
+        reader = _Reader()
+        # Primer lote: una fila creada (1) y una actualizada (2); segundo: sin cambios (0)
+        cursor = FakeCursor(afectadas=[3, 0])
+        for rut in ("1-9", "2-7", "3-5"):
+            reader._queue_upsert_values(cursor, "Estudiante", (rut,), _estudiante(nombre="Ana"))
+        reader._flush_batches(cursor)
+
+        assert len(cursor.inserts("Estudiante")) == 2
+        assert reader.resumen_tablas == {"Estudiante": {"filas": 3, "afectadas": 3}}
+
+    def test_filas_afectadas_no_informadas_no_restan(self):
+        reader = _Reader()
+        cursor = FakeCursor()
+        reader._queue_upsert_values(cursor, "Estudiante", ("1-9",), _estudiante(nombre="Ana"))
+        reader._flush_batches(cursor)
+
+        assert reader.resumen_tablas["Estudiante"] == {"filas": 1, "afectadas": 0}
+
+    def test_log_summary_por_tabla(self, caplog):
+        reader = _Reader()
+        reader._count_rows("Estudiante", 3, 4)
+
+        with caplog.at_level(logging.INFO, logger="classes.readers.reader"):
+            reader.log_summary()
+
+        [record] = caplog.records
+        assert record.getMessage() == "✓ Estudiante: 3 fila(s) cargada(s), 4 afectada(s) (1 por creada, 2 por actualizada)"
+        assert (record.tabla, record.filas, record.afectadas) == ("Estudiante", 3, 4)
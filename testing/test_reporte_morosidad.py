@@ -0,0 +1,130 @@
+"""
+Tests del reseteo de deudas de un lote de reportes de morosidad
+===============================================================
+
+No requieren MySQL: la conexión y el cursor se simulan.
+
+Ejecutar con:
+    python -m pytest testing/test_reporte_morosidad.py -v
+"""
+
+import csv
+
+import pytest
+
+from classes.readers.excel_reader.reporte_morosidad_reader import ReporteMorosidadReader
+from classes.readers.import_pipeline import ImportPipeline
+
+COLUMNAS = [
+    "Rut Alumno", "Semestre", "Total Saldo", "Programa de Estudio", "Nombre Apoderado",
+    "Tiene Gratuidad", "Tipo Alumno", "Estado Matricula",
+    "Cantidad Cuotas Pendientes Matricula", "Cantidad Cuotas Pendientes Colegiaturas",
+    "Deuda Matriculas", "Deuda Colegiaturas", "Deuda Total Otras Deudas",
+    "Deuda Total (Compromisos+Colegiaturas+Otras Deudas)",
+    "Monto Compromiso Matricula", "Monto Compromisos Colegiaturas",
+]
+
+
+class FakeConnection:
+    """Registra en una sola lista las consultas y los commit, en orden"""
+
+    def __init__(self):
+        self.log = []
+
+    def cursor(self, *args, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.log.append(("COMMIT", ()))
+
+    def rollback(self):
+        self.log.append(("ROLLBACK", ()))
+
+    def updates(self):
+        return [params for query, params in self.log if query.startswith("UPDATE Reporte_financiero_estudiante")]
+
+
+class FakeCursor:
+    rowcount = 0
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def execute(self, query, params=()):
+        self.connection.log.append((" ".join(query.split()), tuple(params)))
+
+    def fetchall(self):
+        return []
+
+    def close(self):
+        pass
+
+
+def _reporte(tmp_path, nombre, ruts):
+    path = tmp_path / nombre
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNAS)
+        for rut in ruts:
+            writer.writerow([rut, "OTOÑO 2025", 1000, "Informática", "", "No", "Regular", "Matriculado",
+                             1, 2, 100, 200, 0, 300, 500, 800])
+    return str(path)
+
+
+def _staged(path):
+    reader = ReporteMorosidadReader(path, None)
+    reader.stage()
+    # Sin catálogo del esquema
+    reader._schema = {}
+    return reader
+
+
+@pytest.fixture
+def lote(tmp_path):
+    return [
+        _reporte(tmp_path, "sede_a.csv", ["11111111-1", "22222222-2"]),
+        _reporte(tmp_path, "sede_b.csv", ["33333333-3"]),
+    ]
+
+
+def test_archivo_sin_cerrar_el_lote_no_resetea_deudas(lote):
+    connection = FakeConnection()
+
+    ImportPipeline("reporte_morosidad", lote, connection)._write(_staged(lote[0]))
+
+    assert connection.updates() == []
+
+
+def test_lote_resetea_una_vez_con_los_ruts_de_todos_los_archivos(lote):
+    connection = FakeConnection()
+    pipeline = ImportPipeline("reporte_morosidad", lote, connection)
+    ruts_lote = set()
+
+    def before_write(reader):
+        if reader.file_path == lote[-1]:
+            reader.ruts_del_lote = set(ruts_lote)
+
+    def after_write(reader):
+        ruts_lote.update(reader.ruts_en_reporte)
+
+    for path in lote:
+        pipeline._write(_staged(path), after_write, before_write)
+
+    [params] = connection.updates()
+    assert params == ("11111111-1", "22222222-2", "33333333-3")
+    # El reseteo va en la transacción del último archivo, antes de su commit
+    consultas = [query for query, _ in connection.log]
+    reseteo = next(i for i, query in enumerate(consultas) if query.startswith("UPDATE"))
+    ultimo_insert = max(i for i, query in enumerate(consultas) if query.startswith("INSERT INTO Reporte_financiero"))
+    assert consultas[:reseteo].count("COMMIT") == consultas[:ultimo_insert].count("COMMIT")
+    assert "COMMIT" in consultas[reseteo:]
+
+
+def test_lote_de_un_archivo_resetea_con_sus_propios_ruts(lote):
+    connection = FakeConnection()
+    reader = _staged(lote[1])
+    reader.ruts_del_lote = set()
+
+    ImportPipeline("reporte_morosidad", lote[1:], connection)._write(reader)
+
+    assert connection.updates() == [("33333333-3",)]
@@ -0,0 +1,204 @@
+"""
+Tests del catálogo del esquema (utils.schema_catalog)
+=====================================================
+
+No requieren MySQL: el cursor simula las respuestas de INFORMATION_SCHEMA.
+
+Ejecutar con:
+    python -m pytest testing/test_schema_catalog.py -v
+"""
+
+import pytest
+
+from utils.schema_catalog import SchemaCatalog, CATALOG_QUERY, FINGERPRINT_QUERY, table_key
+from utils.dynamic_query_builder import validate_custom_sheet_selection
+from classes.readers.reader import Reader
+
+
+# Filas de CATALOG_QUERY como las entrega MySQL con lower_case_table_names=1
+CATALOG_ROWS_MINUSCULAS = [
+    ("estudiante", "rut", "varchar", "varchar(12)", "NO", "PRI", "PRIMARY", "PRIMARY"),
+    ("estudiante", "nombre", "varchar", "varchar(100)", "YES", "", None, None),
+    ("estudiante", "sede", "varchar", "varchar(50)", "YES", "", None, None),
+    ("estudiante_semestre", "rut_estudiante", "varchar", "varchar(12)", "NO", "PRI", "PRIMARY", "PRIMARY"),
+    ("estudiante_semestre", "periodo_semestre", "varchar", "varchar(10)", "NO", "PRI", "PRIMARY", "PRIMARY"),
+    ("reporte_financiero_estudiante", "id", "int", "int", "NO", "PRI", "PRIMARY", "PRIMARY"),
+    ("reporte_financiero_estudiante", "rut_estudiante", "varchar", "varchar(12)", "NO", "UNI", "uk_rut", "uk_rut"),
+    ("reporte_financiero_estudiante", "deuda_total", "int", "int", "YES", "", None, None),
+]
+
+# Reporte_financiero_estudiante sin la migración 002: rut_estudiante solo con índice no único
+SIN_CLAVE_UNICA = [
+    row if row[:2] != ("reporte_financiero_estudiante", "rut_estudiante")
+    else row[:5] + ("MUL", "idx_rut", None)
+    for row in CATALOG_ROWS_MINUSCULAS
+]
+
+
+class FakeCursor:
+    """Cursor que responde FINGERPRINT_QUERY y CATALOG_QUERY"""
+
+    def __init__(self, rows, fingerprint="1:2:3"):
+        self.rows = rows
+        self.fingerprint = fingerprint
+        self.queries = []
+        self._last = None
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+        self._last = query
+
+    def fetchone(self):
+        return (self.fingerprint,) if self._last == FINGERPRINT_QUERY else None
+
+    def fetchall(self):
+        return list(self.rows) if self._last == CATALOG_QUERY else []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    host = "localhost"
+    port = 3306
+    database = "inacap_test"
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor
+
+
+class _Reader(Reader):
+    """Reader mínimo para probar la verificación de tablas"""
+
+    def _process_and_upsert(self):
+        pass
+
+    def _stage_rows(self):
+        pass
+
+    def get_total_rows(self) -> int:
+        return 0
+
+
+@pytest.fixture
+def catalog(tmp_path):
+    return SchemaCatalog(directory=str(tmp_path), ttl=0)
+
+
+class TestSchemaCatalogMinusculas:
+    """El catálogo debe funcionar aunque MySQL entregue los nombres de tabla en minúsculas"""
+
+    def test_tablas_indexadas_en_minusculas(self, catalog):
+        tables = catalog.get(FakeConnection(FakeCursor(CATALOG_ROWS_MINUSCULAS)))
+        assert table_key("Estudiante") in tables
+        assert list(tables["estudiante"]) == ["rut", "nombre", "sede"]
+        assert tables["reporte_financiero_estudiante"]["rut_estudiante"]["indexes"] == ["uk_rut"]
+        assert SchemaCatalog.unique_keys(tables["estudiante_semestre"]) == {
+            "PRIMARY": {"rut_estudiante", "periodo_semestre"},
+        }
+
+    def test_nombres_con_mayusculas_tambien_quedan_en_minusculas(self, catalog):
+        rows = [("Estudiante",) + row[1:] for row in CATALOG_ROWS_MINUSCULAS if row[0] == "estudiante"]
+        tables = catalog.get(FakeConnection(FakeCursor(rows)))
+        assert list(tables) == ["estudiante"]
+
+    def test_validacion_de_hojas_personalizadas(self, catalog):
+        schema = catalog.get(FakeConnection(FakeCursor(CATALOG_ROWS_MINUSCULAS)))
+        validate_custom_sheet_selection("Estudiante", ["rut", "nombre"], schema)
+        validate_custom_sheet_selection("Estudiante_Semestre", ["periodo_semestre"], schema)
+        with pytest.raises(ValueError):
+            validate_custom_sheet_selection("Estudiante", ["no_existe"], schema)
+        with pytest.raises(ValueError):
+            validate_custom_sheet_selection("Profesor", ["rut"], schema)
+
+    def test_reader_verifica_tablas_sin_importar_mayusculas(self, catalog, monkeypatch):
+        cursor = FakeCursor(CATALOG_ROWS_MINUSCULAS)
+        monkeypatch.setattr("classes.readers.reader.schema_catalog", catalog)
+        reader = _Reader(None, FakeConnection(cursor))
+
+        reader._check_table(cursor, "Estudiante", ["rut", "nombre"])
+        reader._check_table(cursor, "Reporte_financiero_estudiante", ["rut_estudiante", "deuda_total"], ("rut_estudiante",))
+        # Cada tabla se verifica una vez por reader: la columna faltante se prueba en otro
+        with pytest.raises(Exception, match="ERROR CRÍTICO"):
+            _Reader(None, FakeConnection(cursor))._check_table(cursor, "Estudiante", ["rut", "columna_nueva"])
+        with pytest.raises(Exception, match="ERROR CRÍTICO"):
+            reader._check_table(cursor, "Profesor", ["rut"])
+
+    def test_upsert_requiere_clave_unica(self, catalog, monkeypatch):
+        monkeypatch.setattr("classes.readers.reader.schema_catalog", catalog)
+        cursor = FakeCursor(SIN_CLAVE_UNICA)
+        reader = _Reader(None, FakeConnection(cursor))
+
+        # La PRIMARY compuesta de Estudiante_Semestre cubre la clave del upsert
+        reader._check_table(cursor, "Estudiante_Semestre", ["rut_estudiante", "periodo_semestre"],
+                            ("rut_estudiante", "periodo_semestre"))
+        with pytest.raises(Exception, match="clave única"):
+            reader._check_table(cursor, "Reporte_financiero_estudiante", ["rut_estudiante", "deuda_total"],
+                                ("rut_estudiante",))
+
+    def test_semestre_sin_periodo_key_usa_el_insert_sin_clave(self, catalog, monkeypatch):
+        # Semestre en minúsculas y sin la columna de la migración 001
+        cursor = FakeCursor(CATALOG_ROWS_MINUSCULAS + [
+            ("semestre", "periodo", "varchar", "varchar(20)", "NO", "PRI", "PRIMARY", "PRIMARY"),
+        ])
+        monkeypatch.setattr("classes.readers.reader.schema_catalog", catalog)
+        reader = _Reader(None, FakeConnection(cursor))
+
+        reader._register_semestres(cursor, ["2024-otoño"])
+        inserts = [query for query in cursor.queries if query.startswith("INSERT INTO Semestre")]
+        assert inserts and "periodo_key" not in inserts[0]
+
+    def test_tablas_de_hojas_personalizadas_con_nombre_original(self, catalog, monkeypatch):
+        from utils import db_schema_reader
+
+        monkeypatch.setattr(db_schema_reader, "schema_catalog", catalog)
+        connection = FakeConnection(FakeCursor(CATALOG_ROWS_MINUSCULAS))
+
+        tables = db_schema_reader.get_student_tables(connection)
+        assert list(tables) == ["Estudiante", "Estudiante_Semestre", "Reporte_financiero_estudiante"]
+        assert db_schema_reader.get_table_columns(connection, "Estudiante") == ["rut", "nombre", "sede"]
+        assert db_schema_reader.get_table_columns(connection, "Reporte_financiero_estudiante") == [
+            "rut_estudiante", "deuda_total",
+        ]
+
+    def test_filtro_por_sede_disponible(self, catalog, monkeypatch):
+        from classes.export.financial_data_exporter import FinancialDataExporter
+
+        monkeypatch.setattr("classes.export.financial_data_exporter.schema_catalog", catalog)
+        exporter = FinancialDataExporter(FakeConnection(FakeCursor(CATALOG_ROWS_MINUSCULAS)))
+        assert exporter.has_sede_column()
+
+
+class TestSchemaCatalogHuella:
+    """El catálogo completo solo se vuelve a consultar si cambia la huella del esquema"""
+
+    def test_misma_huella_no_consulta_el_catalogo(self, catalog):
+        cursor = FakeCursor(CATALOG_ROWS_MINUSCULAS)
+        connection = FakeConnection(cursor)
+        catalog.get(connection)
+        catalog.get(connection)
+        assert cursor.queries.count(CATALOG_QUERY) == 1
+        assert cursor.queries.count(FINGERPRINT_QUERY) == 2
+
+    def test_huella_distinta_vuelve_a_leer(self, catalog):
+        cursor = FakeCursor(CATALOG_ROWS_MINUSCULAS)
+        connection = FakeConnection(cursor)
+        catalog.get(connection)
+        cursor.fingerprint = "1:2:4"
+        cursor.rows = CATALOG_ROWS_MINUSCULAS[:2]
+        tables = catalog.get(connection)
+        assert cursor.queries.count(CATALOG_QUERY) == 2
+        assert list(tables["estudiante"]) == ["rut", "nombre"]
+
+    def test_copia_en_disco_se_reutiliza(self, tmp_path):
+        cursor = FakeCursor(CATALOG_ROWS_MINUSCULAS)
+        SchemaCatalog(directory=str(tmp_path), ttl=0).get(FakeConnection(cursor))
+
+        # Otra instancia (nuevo inicio de la aplicación) con la misma huella
+        otro_cursor = FakeCursor(CATALOG_ROWS_MINUSCULAS)
+        tables = SchemaCatalog(directory=str(tmp_path), ttl=0).get(FakeConnection(otro_cursor))
+        assert CATALOG_QUERY not in otro_cursor.queries
+        assert "estudiante" in tables
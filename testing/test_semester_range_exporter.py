@@ -0,0 +1,221 @@
+"""
+Tests del exportador por rango de semestres (SemesterRangeExporter)
+===================================================================
+
+No requieren MySQL: el cursor simula las respuestas de la base de datos.
+
+Ejecutar con:
+    python -m pytest testing/test_semester_range_exporter.py -v
+"""
+
+import pytest
+from openpyxl import load_workbook
+
+from classes.export import semester_range_exporter
+from classes.export.semester_range_exporter import SemesterRangeExporter
+
+
+# Semestres de la BD con su periodo_key
+CLAVES = {"2024-otoño": 4048, "2024-primavera": 4049, "2025-otoño": 4050, "verano-2024": None}
+
+# Filas de RANGE_QUERY: periodo, rut, nombre, programa, ramo, notas, docente, reprobadas x2
+FILAS = {
+    "2024-otoño": [("2024-otoño", "11111111-1", "Ana", "Informática", "Cálculo", "5,0;6,1", "Pérez", 0, 0)],
+    "2025-otoño": [("2025-otoño", "11111111-1", "Ana", "Informática", "Álgebra", "7,0", "Rojas", 0, 0)],
+    # Período sin periodo_key (no reconocible)
+    "verano-2024": [("verano-2024", "22222222-2", "Luis", "Mecánica", "Física", "4,5", "Soto", 1, 0)],
+}
+
+
+class FakeCursor:
+    def __init__(self, semestres):
+        self.semestres = semestres
+        self.executed = []
+        self._result = []
+
+    def execute(self, query, params=()):
+        self.executed.append((query, params))
+        if "Estudiante_Semestre es" in query:
+            # RANGE_QUERY como MySQL: BETWEEN sobre la clave y orden por clave
+            # (NULL al final); un semestre sin estudiantes da una fila con rut NULL
+            semestres = sorted(CLAVES.items(), key=lambda item: (item[1] is None, item[1] or 0, item[0]))
+            if params:
+                semestres = [(p, k) for p, k in semestres if k is not None and params[0] <= k <= params[1]]
+            self._result = [
+                fila
+                for periodo, _ in semestres
+                for fila in FILAS.get(periodo, [(periodo,) + (None,) * 8])
+            ]
+        elif "Estudiante_Asignatura ea" in query:
+            # Máximo de notas por semestre (se usa el mínimo de 3 columnas)
+            self._result = []
+        else:
+            self._result = list(self.semestres)
+
+    def fetchall(self):
+        return list(self._result)
+
+    def __iter__(self):
+        return iter(self._result)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, cursor):
+        self._cursor = cursor
+
+    def cursor(self, *args, **kwargs):
+        return self._cursor
+
+
+class FakeCatalog:
+    """Catálogo con o sin Semestre.periodo_key (migración 001)"""
+
+    def __init__(self, migrado=True):
+        columns = {"periodo": {}, "periodo_key": {}} if migrado else {"periodo": {}}
+        self.tables = {"semestre": columns}
+
+    def get(self, db_connection, cursor=None):
+        return self.tables
+
+
+@pytest.fixture(autouse=True)
+def catalog(monkeypatch):
+    catalog = FakeCatalog()
+    monkeypatch.setattr(semester_range_exporter, "schema_catalog", catalog)
+    return catalog
+
+
+def test_semestres_ordenados_por_periodo_key_en_sql():
+    # El orden lo entrega MySQL
+    cursor = FakeCursor([("2024-primavera", 4049), ("2025-otoño", 4050), ("verano-2024", None)])
+    exporter = SemesterRangeExporter(FakeConnection(cursor))
+
+    assert exporter.get_available_semestres() == [
+        ("2024-primavera", 4049), ("2025-otoño", 4050), ("verano-2024", None),
+    ]
+    query = cursor.executed[-1][0]
+    assert "ORDER BY s.periodo_key IS NULL, s.periodo_key, s.periodo" in query
+
+
+def test_sin_migracion_la_clave_se_calcula_en_la_consulta(catalog):
+    catalog.tables = FakeCatalog(migrado=False).tables
+    cursor = FakeCursor([("2024-primavera", 4049), ("2025-otoño", 4050)])
+    exporter = SemesterRangeExporter(FakeConnection(cursor))
+
+    assert exporter.get_available_semestres() == [("2024-primavera", 4049), ("2025-otoño", 4050)]
+    query = cursor.executed[-1][0]
+    assert "periodo_key" not in query
+    assert "SUBSTRING_INDEX(s.periodo, '-', 1)" in query
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_rango_se_resuelve_en_la_consulta_de_datos(tmp_path, streaming):
+    cursor = FakeCursor([])
+    exporter = SemesterRangeExporter(FakeConnection(cursor), streaming=streaming)
+
+    # Límites en cualquier orden y formato
+    file_path = exporter.export_by_semester_range("OTOÑO 2025", "2024-otoño", tmp_path)
+
+    consultas = [q for q, _ in cursor.executed]
+    # Sin consulta previa de la lista de semestres
+    assert not any(q.startswith("SELECT s.periodo,") and "FROM Semestre s ORDER BY" in q for q in consultas)
+    query, params = next((q, p) for q, p in cursor.executed if "Estudiante_Semestre es" in q)
+    assert "WHERE s.periodo_key BETWEEN %s AND %s" in query
+    assert "ORDER BY s.periodo_key IS NULL, s.periodo_key, s.periodo, e.rut" in query
+    assert params == (4048, 4050)
+
+    wb = load_workbook(file_path)
+    assert wb.sheetnames == ["2024-otoño", "2024-primavera", "2025-otoño"]
+    assert wb["2024-primavera"]["A2"].value == "No hay estudiantes registrados en este semestre"
+    assert wb["2025-otoño"]["D2"].value == "Álgebra"
+
+
+@pytest.mark.parametrize("streaming", [False, True])
+def test_limite_no_reconocible_exporta_todos_los_semestres(tmp_path, streaming):
+    cursor = FakeCursor([])
+    exporter = SemesterRangeExporter(FakeConnection(cursor), streaming=streaming)
+
+    file_path = exporter.export_by_semester_range("no-existe", "2024-otoño", tmp_path)
+
+    query, params = next((q, p) for q, p in cursor.executed if "Estudiante_Semestre es" in q)
+    assert "WHERE TRUE" in query
+    assert params == ()
+
+    wb = load_workbook(file_path)
+    assert wb.sheetnames == ["2024-otoño", "2024-primavera", "2025-otoño", "verano-2024"]
+    assert wb["verano-2024"]["A2"].value == "22222222-2"
+
+
+def test_sin_migracion_el_rango_usa_la_clave_calculada(tmp_path, catalog):
+    catalog.tables = FakeCatalog(migrado=False).tables
+    cursor = FakeCursor([])
+
+    SemesterRangeExporter(FakeConnection(cursor)).export_by_semester_range("2024-otoño", "2025-otoño", tmp_path)
+
+    query, params = next((q, p) for q, p in cursor.executed if "Estudiante_Semestre es" in q)
+    assert "periodo_key" not in query
+    assert "END BETWEEN %s AND %s" in query
+    assert params == (4048, 4050)
+
+
+class UnbufferedConnection:
+    """
+    Conexión con cursores sin buffer: cerrar un cursor con filas sin leer
+    falla y deja el resultado pendiente, y toda consulta posterior también
+    """
+
+    def __init__(self, semestres):
+        self.semestres = semestres
+        self.unread = False
+
+    def cursor(self, *args, **kwargs):
+        return UnbufferedCursor(self)
+
+
+class UnbufferedCursor(FakeCursor):
+    def __init__(self, connection):
+        super().__init__(connection.semestres)
+        self.connection = connection
+
+    def execute(self, query, params=()):
+        if self.connection.unread:
+            raise RuntimeError("Unread result found")
+        super().execute(query, params)
+        self._rows = iter(self._result)
+        self.connection.unread = bool(self._result)
+
+    def __iter__(self):
+        for row in self._rows:
+            yield row
+        self.connection.unread = False
+
+    def fetchall(self):
+        rows = list(self._rows)
+        self.connection.unread = False
+        return rows
+
+    def close(self):
+        if self.connection.unread:
+            raise RuntimeError("Unread result found")
+
+
+def test_error_al_escribir_en_streaming_no_deja_la_conexion_inutilizable(tmp_path, monkeypatch):
+    # Un carácter de control en el docente: openpyxl lo rechaza al escribir la fila
+    filas = [
+        ("2024-otoño", "11111111-1", "Ana", "Informática", "Cálculo", "5,0", "Pé\x07rez", 0, 0),
+        ("2024-otoño", "11111111-1", "Ana", "Informática", "Física", "6,0", "Soto", 0, 0),
+    ]
+    monkeypatch.setitem(FILAS, "2024-otoño", filas)
+    connection = UnbufferedConnection([("2024-otoño", 4048)])
+    exporter = SemesterRangeExporter(connection, streaming=True)
+
+    with pytest.raises(Exception) as error:
+        exporter.export_by_semester_range("2024-otoño", "2024-otoño", tmp_path)
+
+    assert "Unread result" not in str(error.value)
+    assert type(error.value).__name__ == "IllegalCharacterError"
+    # La conexión compartida (la de la GUI) sigue sirviendo
+    assert exporter.get_available_semestres() == [("2024-otoño", 4048)]
@@ -0,0 +1,22 @@
+import os
+import sys
+
+APP_NAME = "HerramientaINACAP"
+
+
+def user_cache_dir(name: str) -> str:
+    """
+    Carpeta de caché de la aplicación para el usuario actual (fuera de la
+    carpeta de trabajo, para no dejar datos de estudiantes junto al
+    ejecutable ni en el repositorio):
+    - Windows: %LOCALAPPDATA%\\HerramientaINACAP\\<name>
+    - macOS: ~/Library/Caches/HerramientaINACAP/<name>
+    - Otros: $XDG_CACHE_HOME/HerramientaINACAP/<name> (~/.cache por defecto)
+    """
+    if sys.platform == "win32":
+        base = os.getenv("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, APP_NAME, name)
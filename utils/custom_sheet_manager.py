@@ -1,6 +1,14 @@
 import os
 import json
 
+SHEETS_DIR = "personalized_sheets"
+
+
+def custom_sheet_path(name) -> str:
+    """Ruta del JSON de una sheet personalizada"""
+    return os.path.join(SHEETS_DIR, f"{name}.json")
+
+
 def save_custom_sheet_data(name, config):
     """
     Guarda la configuración de una sheet personalizada en JSON
@@ -10,10 +18,10 @@ def save_custom_sheet_data(name, config):
         config: Dict con estructura {'name': 'Mi Sheet', 'tables': [...]}
     """
     # Crear carpeta si no existe
-    os.makedirs("personalized_sheets", exist_ok=True)
+    os.makedirs(SHEETS_DIR, exist_ok=True)
     
     # Generar nombre del archivo (nombre_sheet.json)
-    filename = f"personalized_sheets/{name}.json"
+    filename = custom_sheet_path(name)
     
     # Guardar JSON
     with open(filename, "w", encoding="utf-8") as f:
@@ -29,7 +37,7 @@ def load_custom_sheet_config(filename):
     Returns:
         dict: Configuración de la sheet
     """
-    filepath = f"personalized_sheets/{filename}.json"
+    filepath = custom_sheet_path(filename)
     
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"Archivo de configuración no encontrado: {filepath}")
@@ -46,7 +54,7 @@ def list_custom_sheets():
     Returns:
         list: ['mi_sheet', 'otra_sheet', ...]
     """
-    sheets_dir = "personalized_sheets"
+    sheets_dir = SHEETS_DIR
     
     # Crear carpeta si no existe
     os.makedirs(sheets_dir, exist_ok=True)
@@ -71,7 +79,7 @@ def delete_custom_sheet(name):
     Returns:
         bool: True si se eliminó, False si no existe
     """
-    filepath = f"personalized_sheets/{name}.json"
+    filepath = custom_sheet_path(name)
     
     if not os.path.exists(filepath):
         return False
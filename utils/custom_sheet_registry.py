@@ -0,0 +1,126 @@
+import os
+import json
+import logging
+import threading
+from utils.custom_sheet_manager import custom_sheet_path
+from utils.dynamic_query_builder import validate_custom_sheet_selection
+from utils.schema_catalog import schema_catalog
+
+logger = logging.getLogger(__name__)
+
+
+class CompiledTable:
+    """Una selección (tabla, columnas) de una hoja personalizada, lista para usar"""
+
+    def __init__(self, table: str, columns):
+        self.table = table
+        self.columns = tuple(columns)
+        # Clave con la que se guardan las filas en student_data['custom_rows']
+        self.key = (table, self.columns)
+        self.title = f"Tabla: {table.replace('_', ' ').title()}"
+        self.headers = tuple(column.replace("_", " ").title() for column in self.columns)
+        # Excepción si la selección no coincide con el esquema de la BD
+        self.error = None
+
+
+class CompiledCustomSheet:
+    """Definición de una hoja personalizada ya leída, validada y precompilada"""
+
+    def __init__(self, config: dict, stamp: tuple = None):
+        self.config = config
+        self.name = config.get("name")
+        # (mtime_ns, tamaño) del JSON al momento de cargarlo
+        self.stamp = stamp
+        self.tables = [
+            CompiledTable(table_config.get("table"), table_config.get("columns"))
+            for table_config in config.get("tables") or []
+            if table_config.get("table") and table_config.get("columns")
+        ]
+        # Esquema contra el que se validó (ver CustomSheetRegistry.get)
+        self.schema = None
+
+    def validate(self, schema: dict) -> None:
+        """Marca las selecciones cuya tabla o columnas no existen en schema (catálogo del esquema)"""
+        for table in self.tables:
+            try:
+                validate_custom_sheet_selection(table.table, table.columns, schema)
+                table.error = None
+            except ValueError as e:
+                table.error = e
+        self.schema = schema
+
+
+class CustomSheetRegistry:
+    """
+    Caché de las hojas personalizadas de personalized_sheets/.
+
+    Cada JSON se lee, valida contra el esquema de la BD y compila (títulos,
+    encabezados y selecciones) una sola vez; las exportaciones siguientes
+    reutilizan la definición mientras el archivo no cambie (mtime y tamaño).
+    El esquema viene del catálogo compartido (utils.schema_catalog): una hoja
+    se vuelve a validar solo si el catálogo cambió.
+    """
+
+    def __init__(self):
+        # {nombre: CompiledCustomSheet}
+        self._sheets = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, db_connection=None) -> CompiledCustomSheet:
+        """
+        Definición compilada de la hoja. Con db_connection, además queda
+        validada contra el esquema de la BD.
+
+        Raises:
+            FileNotFoundError: si el JSON de la hoja no existe
+        """
+        path = custom_sheet_path(name)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._sheets.pop(name, None)
+            raise FileNotFoundError(f"Archivo de configuración no encontrado: {path}")
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            sheet = self._sheets.get(name)
+        if sheet is None or sheet.stamp != stamp:
+            with open(path, "r", encoding="utf-8") as f:
+                sheet = CompiledCustomSheet(json.load(f), stamp)
+            with self._lock:
+                self._sheets[name] = sheet
+
+        if db_connection is not None:
+            schema = self._get_schema(db_connection)
+            if schema is not None and sheet.schema is not schema:
+                sheet.validate(schema)
+        return sheet
+
+    def get_selected(self, custom_sheet_selection: dict, db_connection=None) -> list:
+        """Definiciones de las hojas marcadas en custom_sheet_selection"""
+        return [
+            self.get(sheet_name, db_connection)
+            for sheet_name, is_selected in custom_sheet_selection.items() if is_selected
+        ]
+
+    def invalidate(self, name: str = None) -> None:
+        """Descarta una hoja (o todas) de la caché"""
+        with self._lock:
+            if name is None:
+                self._sheets.clear()
+            else:
+                self._sheets.pop(name, None)
+
+    def _get_schema(self, db_connection) -> dict:
+        """{tabla: {columna: ...}} del catálogo, o None si no se pudo leer"""
+        try:
+            return schema_catalog.get(db_connection)
+        except Exception as e:
+            # Sin esquema no se valida: los errores aparecen al consultar
+            logger.warning("✗ No se pudo leer el esquema para validar hojas personalizadas: %s", e)
+            return None
+
+
+# Registro compartido por la GUI y los exportadores
+custom_sheet_registry = CustomSheetRegistry()
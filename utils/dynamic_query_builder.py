@@ -1,3 +1,7 @@
+from functools import lru_cache
+from utils.schema_catalog import table_key
+
+
 def build_query_for_custom_sheet(rut: str, table: str, columns: list) -> tuple:
     """
     Construye una consulta SQL dinámica para obtener datos de una tabla específica
@@ -19,12 +23,56 @@ def build_query_for_custom_sheet(rut: str, table: str, columns: list) -> tuple:
     safe_columns = ", ".join([f"`{col}`" for col in columns])
     safe_table = f"`{table}`"
     
+    query = f"SELECT {safe_columns} FROM {safe_table} WHERE {_rut_column(table, columns)} = %s"
+    
+    return query, (rut,)
+
+
+@lru_cache(maxsize=256)
+def bulk_query_template(table: str, columns: tuple) -> str:
+    """
+    Consulta de una selección de hoja personalizada para varios estudiantes
+    a la vez, con {placeholders} en lugar de la lista de RUTs (ver
+    CustomSheetPlanner). La primera columna del resultado es el RUT (alias
+    _rut) para repartir las filas entre estudiantes. Se arma una sola vez
+    por tabla y columnas.
+    """
+    rut_column = _rut_column(table, columns)
+    safe_columns = ", ".join([f"`{col}`" for col in columns])
+    return f"SELECT `{rut_column}` AS _rut, {safe_columns} FROM `{table}` WHERE `{rut_column}` IN ({{placeholders}})"
+
+
+def validate_custom_sheet_selection(table: str, columns, schema: dict) -> None:
+    """
+    Verifica una selección de hoja personalizada contra el esquema
+    
+    Args:
+        table: Nombre de la tabla
+        columns: Columnas seleccionadas
+        schema: {tabla: columnas} (ver utils.schema_catalog)
+        
+    Raises:
+        ValueError: si la tabla, alguna columna o la columna de RUT no existe
+    """
+    known = schema.get(table_key(table))
+    if known is None:
+        raise ValueError(f"La tabla {table} no existe en la base de datos")
+    
+    # MySQL no distingue mayúsculas en los nombres de columna
+    known = {column.lower() for column in known}
+    unknown = [column for column in columns if column.lower() not in known]
+    if unknown:
+        raise ValueError(f"Columnas inexistentes en {table}: {', '.join(unknown)}")
+    
+    rut_column = _rut_column(table, columns)
+    if rut_column.lower() not in known:
+        raise ValueError(f"La tabla {table} no tiene la columna {rut_column} para filtrar por estudiante")
+
+
+def _rut_column(table: str, columns: list) -> str:
     # Detectar si es tabla bridge (contiene rut_estudiante) o tabla normal
     if "rut_estudiante" in columns or table.lower().startswith("estudiante_"):
         # Es tabla bridge - usar rut_estudiante como filtro
-        query = f"SELECT {safe_columns} FROM {safe_table} WHERE rut_estudiante = %s"
-    else:
-        # Es tabla normal - usar rut como filtro
-        query = f"SELECT {safe_columns} FROM {safe_table} WHERE rut = %s"
-    
-    return query, (rut,)
\ No newline at end of file
+        return "rut_estudiante"
+    # Es tabla normal - usar rut como filtro
+    return "rut"
\ No newline at end of file
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import logging
+from datetime import datetime
+
+DEFAULT_LOG_LEVEL = "INFO"
+
+# Atributos estándar de LogRecord (lo demás llega por extra=)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+
+class JsonLineFormatter(logging.Formatter):
+    """Un objeto JSON por línea, con los campos pasados en extra="""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def configure_logging(level: str = None, json_path: str = None) -> None:
+    """
+    Configura el logging de la aplicación:
+    - Consola con el mismo formato que los print() (solo el mensaje).
+    - LOG_LEVEL (INFO por defecto): con DEBUG se ven los mensajes por lote.
+    - LOG_JSON_FILE (opcional): además escribe cada registro como JSON.
+    Se puede llamar más de una vez; reemplaza los handlers anteriores.
+    """
+    level = (level or os.getenv("LOG_LEVEL", DEFAULT_LOG_LEVEL)).upper()
+    json_path = json_path or os.getenv("LOG_JSON_FILE")
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if getattr(handler, "_inacap", False):
+            root.removeHandler(handler)
+            handler.close()
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(logging.Formatter("%(message)s"))
+    console._inacap = True
+    root.addHandler(console)
+
+    if json_path:
+        try:
+            json_handler = logging.FileHandler(json_path, encoding="utf-8")
+        except OSError as e:
+            print(f"✗ No se pudo abrir el log JSON {json_path}: {str(e)}")
+        else:
+            json_handler.setFormatter(JsonLineFormatter())
+            json_handler._inacap = True
+            root.addHandler(json_handler)
+
+    root.setLevel(getattr(logging, level, logging.INFO))
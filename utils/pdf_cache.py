@@ -0,0 +1,153 @@
+import os
+import json
+import hashlib
+import logging
+from utils.app_dirs import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Cambiar si cambia el formato de las entradas o el parseo de los certificados
+CACHE_VERSION = 1
+
+# Las entradas contienen datos personales de los estudiantes (sin cifrar):
+# por defecto quedan en la carpeta de caché del usuario, no en la de trabajo
+DEFAULT_CACHE_DIR = user_cache_dir("pdf_cache")
+
+
+class PDFCache:
+    """
+    Caché en disco de certificados PDF, indexada por el hash SHA-256 del
+    contenido del archivo (un PDF renombrado o copiado sigue siendo un acierto).
+
+    Cada entrada es un JSON con el texto extraído por pdfminer y los datos
+    parseados por cada tipo de reader. Al superar max_bytes se eliminan las
+    entradas usadas hace más tiempo (LRU por fecha de modificación, que se
+    actualiza en cada lectura).
+
+    El tamaño total se lleva en memoria: la carpeta se recorre la primera vez
+    y cada vez que hay que eliminar entradas, no en cada escritura. Con varios
+    procesos escribiendo, cada uno suma solo lo suyo entre recorridos, por lo
+    que max_bytes puede superarse por poco hasta el siguiente.
+    """
+
+    def __init__(self, directory: str = None, max_bytes: int = None):
+        self.directory = directory or os.getenv('PDF_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes or int(os.getenv('PDF_CACHE_MAX_MB', 100)) * 1024 * 1024
+        # Bytes en la carpeta según este proceso (None: aún no se ha recorrido)
+        self._total_bytes = None
+
+    @staticmethod
+    def file_hash(file_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for bloque in iter(lambda: f.read(1 << 20), b''):
+                digest.update(bloque)
+        return digest.hexdigest()
+
+    def _entry_path(self, digest: str) -> str:
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, digest: str) -> dict:
+        """Retorna la entrada {'text': ..., 'parsed': {...}} o None si no existe"""
+        path = self._entry_path(digest)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("version") != CACHE_VERSION:
+            return None
+
+        try:
+            # Marcar como usada recientemente (para el LRU)
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def get_text(self, digest: str) -> str:
+        entry = self.get(digest)
+        return entry.get("text") if entry else None
+
+    def get_parsed(self, digest: str, reader_name: str) -> dict:
+        entry = self.get(digest)
+        return entry.get("parsed", {}).get(reader_name) if entry else None
+
+    def put(self, digest: str, text: str = None, reader_name: str = None, parsed: dict = None):
+        """Agrega el texto y/o los datos parseados a la entrada del archivo"""
+        entry = self.get(digest) or {"version": CACHE_VERSION, "text": None, "parsed": {}}
+        if text is not None:
+            entry["text"] = text
+        if reader_name and parsed is not None:
+            entry["parsed"][reader_name] = parsed
+
+        data = json.dumps(entry, ensure_ascii=False).encode("utf-8")
+        path = self._entry_path(digest)
+        try:
+            # Solo el usuario puede leer la carpeta (datos personales)
+            os.makedirs(self.directory, mode=0o700, exist_ok=True)
+            try:
+                previous_size = os.stat(path).st_size
+            except FileNotFoundError:
+                previous_size = 0
+            # Escritura atómica: otros procesos del pool pueden leer la misma entrada
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            # La caché es opcional: un error al escribir no debe detener la carga
+            logger.warning("✗ No se pudo guardar en caché de PDFs: %s", e)
+            return
+
+        if self._total_bytes is None:
+            self._evict()
+            return
+
+        self._total_bytes += len(data) - previous_size
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """
+        Recorre la carpeta, actualiza el tamaño total y elimina las entradas
+        menos usadas hasta quedar bajo max_bytes
+        """
+        try:
+            entries = []
+            total = 0
+            with os.scandir(self.directory) as it:
+                for item in it:
+                    if item.name.endswith(".json"):
+                        stat = item.stat()
+                        entries.append((stat.st_mtime, stat.st_size, item.path))
+                        total += stat.st_size
+        except OSError:
+            self._total_bytes = None
+            return
+
+        self._total_bytes = total
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
+            if total <= self.max_bytes:
+                break
+        self._total_bytes = total
+
+
+_pdf_cache = None
+
+
+def get_pdf_cache() -> PDFCache:
+    """Instancia compartida de la caché (una por proceso)"""
+    global _pdf_cache
+    if _pdf_cache is None:
+        _pdf_cache = PDFCache()
+    return _pdf_cache
@@ -0,0 +1,73 @@
+import re
+import math
+from functools import lru_cache
+
+# Orden de las estaciones dentro del año académico
+ESTACIONES = {'otoño': 0, 'primavera': 1}
+
+_PERIODO_NORMALIZADO = re.compile(r'^(\d{4})-(primavera|otoño)$')
+_PREFIJO_NORMALIZADO = re.compile(r'\d{4}-(primavera|otoño)')
+_ESTACION_AÑO = re.compile(r'(PRIMAVERA|OTOÑO)\s+(\d{4})')
+_AÑO_ESTACION = re.compile(r'(\d{4})\s+(PRIMAVERA|OTOÑO)')
+
+# Valor con que se normalizan las celdas vacías (None / NaN), igual que str(NaN)
+PERIODO_VACIO = "nan"
+
+
+def periodo_key(periodo: str):
+    """
+    Clave entera ordenable de un período normalizado: año * 2 + estación.
+    - "2025-otoño" → 4050
+    - "2025-primavera" → 4051
+    Retorna None si el período no tiene el formato YYYY-primavera / YYYY-otoño.
+    """
+    match = _PERIODO_NORMALIZADO.match(str(periodo))
+    if not match:
+        return None
+    return int(match.group(1)) * 2 + ESTACIONES[match.group(2)]
+
+
+def normalize_periodo(periodo_str) -> tuple:
+    """
+    Normaliza el formato del período a: YYYY-primavera o YYYY-otoño
+    Convierte desde:
+    - "PRIMAVERA 2025" → "2025-primavera"
+    - "OTOÑO 2025" → "2025-otoño"
+    - "2025 Primavera" → "2025-primavera"
+    - "2025 Otoño" → "2025-otoño"
+    - "2025-primavera" → "2025-primavera" (ya normalizado)
+    - "2025-otoño" → "2025-otoño" (ya normalizado)
+
+    Los archivos traen muy pocos períodos distintos, así que el resultado se
+    memoriza sin límite. Las celdas vacías se llevan antes a PERIODO_VACIO:
+    NaN no es igual a sí mismo y cada una ocuparía su propia entrada.
+
+    Returns:
+        tuple: (periodo normalizado, periodo_key o None)
+    """
+    if periodo_str is None or (isinstance(periodo_str, float) and math.isnan(periodo_str)):
+        periodo_str = PERIODO_VACIO
+    return _normalize_periodo(periodo_str)
+
+
+@lru_cache(maxsize=None)
+def _normalize_periodo(periodo_str) -> tuple:
+    periodo_str = str(periodo_str).strip()
+    periodo = periodo_str.lower()
+    
+    # Si ya está en formato normalizado, retornar directamente
+    if not _PREFIJO_NORMALIZADO.match(periodo):
+        periodo_upper = periodo_str.upper()
+        
+        # Patrón 1: "PALABRA YYYY" (ej: "PRIMAVERA 2025", "OTOÑO 2025")
+        match = _ESTACION_AÑO.match(periodo_upper)
+        if match:
+            periodo = f"{match.group(2)}-{match.group(1).lower()}"
+        else:
+            # Patrón 2: "YYYY PALABRA" (ej: "2025 Primavera", "2025 Otoño")
+            match = _AÑO_ESTACION.match(periodo_upper)
+            if match:
+                periodo = f"{match.group(1)}-{match.group(2).lower()}"
+    
+    # Si no coincide ningún patrón, queda como está (en minúsculas)
+    return periodo, periodo_key(periodo)
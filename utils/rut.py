@@ -0,0 +1,8 @@
+def rut_key(rut) -> str:
+    """
+    Clave para comparar RUTs en Python como los compara MySQL (collation sin
+    distinción de mayúsculas): "12345678-k " → "12345678-K".
+    Los diccionarios de estudiantes se indexan con esta clave, así un RUT
+    ingresado en minúsculas encuentra la fila que la BD entrega en mayúsculas.
+    """
+    return str(rut).strip().upper()
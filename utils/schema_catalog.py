@@ -0,0 +1,202 @@
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from utils.app_dirs import user_cache_dir
+
+logger = logging.getLogger(__name__)
+
+# Cambiar si cambia el formato de las entradas en disco
+CACHE_VERSION = 3
+
+DEFAULT_CACHE_DIR = user_cache_dir("schema_cache")
+
+# Tablas, columnas, tipos, claves e índices del esquema actual en una consulta
+CATALOG_QUERY = """
+    SELECT c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.COLUMN_TYPE, c.IS_NULLABLE, c.COLUMN_KEY,
+           GROUP_CONCAT(DISTINCT s.INDEX_NAME ORDER BY s.INDEX_NAME) AS indices,
+           GROUP_CONCAT(DISTINCT CASE WHEN s.NON_UNIQUE = 0 THEN s.INDEX_NAME END ORDER BY s.INDEX_NAME) AS indices_unicos
+    FROM INFORMATION_SCHEMA.COLUMNS c
+    LEFT JOIN INFORMATION_SCHEMA.STATISTICS s
+        ON s.TABLE_SCHEMA = c.TABLE_SCHEMA
+        AND s.TABLE_NAME = c.TABLE_NAME
+        AND s.COLUMN_NAME = c.COLUMN_NAME
+    WHERE c.TABLE_SCHEMA = DATABASE()
+    GROUP BY c.TABLE_NAME, c.COLUMN_NAME, c.DATA_TYPE, c.COLUMN_TYPE,
+             c.IS_NULLABLE, c.COLUMN_KEY, c.ORDINAL_POSITION
+    ORDER BY c.TABLE_NAME, c.ORDINAL_POSITION
+"""
+
+# Huella del esquema: cambia si se agrega, quita o modifica una columna o índice.
+# Retorna una sola fila, sin transferir el catálogo completo.
+FINGERPRINT_QUERY = """
+    SELECT CONCAT_WS(':',
+        (SELECT COUNT(*) FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE()),
+        (SELECT COALESCE(SUM(CRC32(CONCAT_WS('|', TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY))), 0)
+         FROM INFORMATION_SCHEMA.COLUMNS WHERE TABLE_SCHEMA = DATABASE()),
+        (SELECT COALESCE(SUM(CRC32(CONCAT_WS('|', TABLE_NAME, INDEX_NAME, COLUMN_NAME, SEQ_IN_INDEX, NON_UNIQUE))), 0)
+         FROM INFORMATION_SCHEMA.STATISTICS WHERE TABLE_SCHEMA = DATABASE())
+    )
+"""
+
+
+def table_key(table: str) -> str:
+    """
+    Clave de una tabla en el catálogo. Con lower_case_table_names=1 (el valor
+    por defecto en Windows) MySQL entrega los nombres en minúsculas, así que
+    el catálogo se indexa siempre en minúsculas y las búsquedas deben usar
+    esta función ("Estudiante" -> "estudiante").
+    """
+    return table.lower()
+
+
+class SchemaCatalog:
+    """
+    Catálogo del esquema de la BD: {tabla: {columna: {'type', 'column_type',
+    'nullable', 'key', 'indexes', 'unique_indexes'}}}, con las columnas en
+    orden de definición.
+    Las tablas se indexan en minúsculas (ver table_key).
+
+    Se obtiene con una sola consulta a INFORMATION_SCHEMA y queda en memoria y
+    en disco junto a una huella del esquema (FINGERPRINT_QUERY). Mientras la
+    huella no cambie no se vuelve a consultar el catálogo: al iniciar se
+    reutiliza la copia en disco, y en memoria la huella se verifica a lo más
+    cada `ttl` segundos.
+    """
+
+    def __init__(self, directory: str = None, ttl: int = None):
+        self.directory = directory or os.getenv('SCHEMA_CACHE_DIR', DEFAULT_CACHE_DIR)
+        self.ttl = ttl if ttl is not None else int(os.getenv('SCHEMA_CACHE_TTL', 600))
+        # {identidad de la BD: {'fingerprint', 'tables', 'checked'}}
+        self._memory = {}
+        self._lock = threading.Lock()
+
+    def get(self, db_connection, cursor=None) -> dict:
+        """
+        Catálogo de la BD de db_connection, o None si el esquema está vacío.
+        Con cursor, las consultas se hacen en ese cursor (p. ej. el de la
+        transacción de una carga) en lugar de abrir uno de db_connection.
+        """
+        identity = self._identity(db_connection)
+        with self._lock:
+            entry = self._memory.get(identity)
+        if entry and time.monotonic() - entry["checked"] < self.ttl:
+            return entry["tables"]
+
+        own_cursor = cursor is None
+        if own_cursor:
+            cursor = db_connection.cursor()
+        try:
+            cursor.execute(FINGERPRINT_QUERY)
+            row = cursor.fetchone()
+            fingerprint = row[0] if row else None
+
+            if entry and fingerprint is not None and entry["fingerprint"] == fingerprint:
+                entry["checked"] = time.monotonic()
+                return entry["tables"]
+
+            tables = self._read_disk(identity, fingerprint)
+            if tables is None:
+                cursor.execute(CATALOG_QUERY)
+                tables = self._build(cursor.fetchall())
+                if tables:
+                    self._write_disk(identity, fingerprint, tables)
+        finally:
+            if own_cursor:
+                cursor.close()
+
+        if not tables:
+            return None
+
+        with self._lock:
+            self._memory[identity] = {"fingerprint": fingerprint, "tables": tables, "checked": time.monotonic()}
+        return tables
+
+    def table_columns(self, db_connection, cursor=None) -> dict:
+        """{tabla (minúsculas): [columnas]} en orden de definición (vacío si no hay esquema)"""
+        tables = self.get(db_connection, cursor) or {}
+        return {table: list(columns) for table, columns in tables.items()}
+
+    def invalidate(self, db_connection=None) -> None:
+        """Descarta la copia en memoria (de una BD o de todas); la de disco se revalida con la huella"""
+        with self._lock:
+            if db_connection is None:
+                self._memory.clear()
+            else:
+                self._memory.pop(self._identity(db_connection), None)
+
+    @staticmethod
+    def _identity(db_connection) -> tuple:
+        return (
+            getattr(db_connection, 'host', None),
+            getattr(db_connection, 'port', None),
+            getattr(db_connection, 'database', None),
+        )
+
+    @staticmethod
+    def _build(rows) -> dict:
+        tables = {}
+        for table, column, data_type, column_type, nullable, key, indices, unicos in rows:
+            tables.setdefault(table_key(table), {})[column] = {
+                "type": data_type,
+                "column_type": column_type,
+                "nullable": nullable == "YES",
+                "key": key or None,
+                "indexes": indices.split(",") if indices else [],
+                "unique_indexes": unicos.split(",") if unicos else [],
+            }
+        return tables
+
+    @staticmethod
+    def unique_keys(columns: dict) -> dict:
+        """
+        {índice único (incluida la PRIMARY): set(columnas en minúsculas)} de
+        una tabla del catálogo (el valor de get()[tabla])
+        """
+        keys = {}
+        for column, info in columns.items():
+            for index in info.get("unique_indexes", []):
+                keys.setdefault(index, set()).add(column.lower())
+        return keys
+
+    # --- COPIA EN DISCO ---
+
+    def _disk_path(self, identity: tuple) -> str:
+        if not any(identity):
+            return None
+        digest = hashlib.sha256(repr(identity).encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _read_disk(self, identity: tuple, fingerprint: str) -> dict:
+        path = self._disk_path(identity)
+        if path is None or fingerprint is None:
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("version") != CACHE_VERSION or entry.get("fingerprint") != fingerprint:
+            return None
+        return entry.get("tables")
+
+    def _write_disk(self, identity: tuple, fingerprint: str, tables: dict) -> None:
+        path = self._disk_path(identity)
+        if path is None or fingerprint is None:
+            return
+        entry = {"version": CACHE_VERSION, "fingerprint": fingerprint, "tables": tables}
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Escritura atómica: otra instancia puede estar leyendo el archivo
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("✗ No se pudo guardar el catálogo del esquema en disco: %s", e)
+
+
+# Catálogo compartido por la GUI, las hojas personalizadas y los readers
+schema_catalog = SchemaCatalog()